@@ -0,0 +1,354 @@
+"""
+Набір бенчмарків для всіх трьох практик з відстеженням регресій.
+
+Кожен випадок запускається кілька разів (береться найкращий час), окремим запуском
+під tracemalloc вимірюється пікове виділення пам'яті. Результати порівнюються
+з базовим JSON-файлом: падіння пропускної здатності або зростання пам'яті більше
+за поріг позначаються як регресія (код виходу 1).
+
+Вхідні дані - лише локальні: випадковий текст з practice1/Middleware/random_symbols.py,
+корпус texts.json, збільшений до потрібного розміру, та збережені сторінки fixtures/html.
+
+Запуск:
+    python bench_suite.py                    - виміряти та порівняти з базовим файлом
+    python bench_suite.py --save             - зберегти результати як новий базовий файл
+    python bench_suite.py --only practice3 --scale 0.2 --threshold 0.15
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import runpy
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PRACTICE1 = os.path.join(ROOT, "practice1")
+PRACTICE2 = os.path.join(ROOT, "practice2")
+PRACTICE3 = os.path.join(ROOT, "practice3")
+for _path in (PRACTICE1, PRACTICE2, PRACTICE3):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+BASELINE_FILE = os.path.join(ROOT, ".bench", "baseline.json")
+TEXTS_FILE = os.path.join(PRACTICE1, "texts.json")
+HTML_FOLDER = os.path.join(PRACTICE1, "fixtures", "html")
+# Допустиме погіршення (частка) пропускної здатності та пікової пам'яті
+THRESHOLD = 0.15
+REPEATS = 3
+SEED = 12345
+
+# Реєстр випадків: назва -> функція підготовки
+CASES = {}
+_scripts = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def load_script(path):
+    """Виконує скрипт практики (один раз, без виводу в консоль) і повертає його глобальні імена."""
+    if path not in _scripts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _scripts[path] = runpy.run_path(path, run_name="bench_" + os.path.basename(os.path.dirname(path)))
+    return _scripts[path]
+
+
+def corpus_text(size):
+    with open(TEXTS_FILE, "r", encoding="utf-8") as f:
+        texts = json.load(f)
+    block = "\n".join(t for variants in texts.values() for t in variants.values())
+    return (block * (size // len(block) + 1))[:size]
+
+
+def mb(text):
+    return len(text.encode("utf-8")) / 2**20
+
+
+# Кожна функція підготовки отримує масштаб і повертає (функцію для виміру, обсяг, одиниця)
+
+@case("practice1.count_text")
+def bench_count_text(scale):
+    from Middleware.streaming import count_text
+    text = corpus_text(int(8_000_000 * scale))
+    return lambda: count_text(text), mb(text), "МБ"
+
+
+@case("practice1.count_text_counter")
+def bench_count_text_counter(scale):
+    from collections import Counter
+    text = corpus_text(int(2_000_000 * scale))
+    return lambda: Counter(text), mb(text), "МБ"
+
+
+@case("practice1.analyze_counter")
+def bench_analyze_counter(scale):
+    from Middleware.random_symbols import generate_random_text, ukrainian_chars
+    from Middleware.streaming import count_text, symbol_stats
+    text = generate_random_text(ukrainian_chars, int(4_000_000 * scale), seed=SEED)
+    return lambda: symbol_stats(count_text(text), len(text)), mb(text), "МБ"
+
+
+@case("practice1.extract_text")
+def bench_extract_text(scale):
+    from Middleware.html_extract import extract_text
+    pages = []
+    for path in sorted(glob.glob(os.path.join(HTML_FOLDER, "*.htm*"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    pages *= max(1, int(20 * scale))
+    return lambda: [extract_text(html) for html in pages], sum(mb(html) for html in pages), "МБ"
+
+
+@case("practice1.extract_text_bs4")
+def bench_extract_text_bs4(scale):
+    from Middleware.html_extract import extract_text
+    pages = []
+    for path in sorted(glob.glob(os.path.join(HTML_FOLDER, "*.htm*"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    pages *= max(1, int(5 * scale))
+    return lambda: [extract_text(html, "bs4") for html in pages], sum(mb(html) for html in pages), "МБ"
+
+
+@case("practice1.random_text")
+def bench_random_text(scale):
+    from Middleware.random_symbols import generate_random_text, ukrainian_chars
+    n = int(8_000_000 * scale)
+    return lambda: generate_random_text(ukrainian_chars, n, seed=SEED), n / 1e6, "млн символів"
+
+
+@case("practice1.markov_text")
+def bench_markov_text(scale):
+    from Middleware.markov import MarkovModel, load_corpus
+    model = MarkovModel.train(load_corpus(TEXTS_FILE), 3)
+    n = int(8_000_000 * scale)
+    return lambda: model.generate(n, seed=SEED), n / 1e6, "млн символів"
+
+
+@case("practice2.batch_entropies")
+def bench_batch_entropies(scale):
+    import numpy as np
+    entropy = load_script(os.path.join(PRACTICE2, "1.py"))
+    joints = np.random.default_rng(SEED).random((int(100_000 * scale), 8, 8))
+    return lambda: entropy["batch_entropies"](joints, normalize=True), len(joints) / 1e3, "тис. матриць"
+
+
+@case("practice2.joint_entropy_dense")
+def bench_joint_entropy_dense(scale):
+    import numpy as np
+    entropy = load_script(os.path.join(PRACTICE2, "1.py"))
+    size = max(16, int(2000 * scale ** 0.5))
+    joint = entropy["normalize_matrix"](np.random.default_rng(SEED).random((size, size)))
+
+    def run():
+        pA, pB = entropy["marginal_from_joint"](joint)
+        return (entropy["joint_entropy"](joint), entropy["conditional_entropy_A_given_B"](joint, pB),
+                entropy["conditional_entropy_B_given_A"](joint, pA))
+    return run, joint.size / 1e6, "млн елементів"
+
+
+@case("practice2.markov_entropy")
+def bench_markov_entropy(scale):
+    entropy = load_script(os.path.join(PRACTICE2, "1.py"))
+    text = corpus_text(int(4_000_000 * scale))
+    return lambda: entropy["markov_entropy_of_text"](text), mb(text), "МБ"
+
+
+def _zipf(n):
+    weights = [1 / (i + 1) for i in range(n)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+@case("practice3.shannon_fano")
+def bench_shannon_fano(scale):
+    from codes import shannon_fano
+    n = int(200_000 * scale)
+    symbols, probs = list(range(n)), _zipf(n)
+    return lambda: shannon_fano(symbols, probs), n / 1e3, "тис. символів"
+
+
+@case("practice3.huffman")
+def bench_huffman(scale):
+    from codes import huffman
+    n = int(200_000 * scale)
+    symbols, probs = list(range(n)), _zipf(n)
+    return lambda: huffman(symbols, probs), n / 1e3, "тис. символів"
+
+
+def _message(scale):
+    import random
+    from codes import shannon_fano
+    n = 12
+    symbols = [f"a{i}" for i in range(1, n + 1)]
+    probs = [0.5 ** i for i in range(1, n + 1)]
+    probs[-1] += 0.5 ** n
+    table = shannon_fano(symbols, probs)
+    rng = random.Random(SEED)
+    return table, rng.choices(symbols, weights=probs, k=int(500_000 * scale))
+
+
+@case("practice3.koduv_text")
+def bench_koduv_text(scale):
+    script = load_script(os.path.join(PRACTICE3, "1.py"))
+    table, message = _message(scale)
+    return lambda: script["koduv_text"](message, table), len(message) / 1e6, "млн символів"
+
+
+@case("practice3.dekoduv_text")
+def bench_dekoduv_text(scale):
+    script = load_script(os.path.join(PRACTICE3, "1.py"))
+    table, message = _message(scale)
+    encoded = script["koduv_text"](message, table)
+    reverse = {code: sym for sym, code in table.items()}
+    return lambda: script["dekoduv_text"](encoded, reverse), len(message) / 1e6, "млн символів"
+
+
+@case("practice3.bitcodec_encode")
+def bench_bitcodec_encode(scale):
+    import bitcodec
+    table, message = _message(scale)
+    return lambda: bitcodec.encode(message, table), len(message) / 1e6, "млн символів"
+
+
+@case("practice3.bitcodec_decode")
+def bench_bitcodec_decode(scale):
+    import bitcodec
+    table, message = _message(scale)
+    data, nbits = bitcodec.encode(message, table)
+    return lambda: bitcodec.decode(data, table, nbits), len(message) / 1e6, "млн символів"
+
+
+@case("practice3.adaptive_encode")
+def bench_adaptive_encode(scale):
+    from adaptive import encode_stream
+    data = corpus_text(int(300_000 * scale)).encode("utf-8")
+
+    def run():
+        encode_stream(io.BytesIO(data), io.BytesIO())
+    return run, len(data) / 2**20, "МБ"
+
+
+def measure(setup, scale, repeats, memory=True):
+    """Найкращий час із repeats запусків та пікова пам'ять (МБ) окремого запуску під tracemalloc."""
+    func, amount, unit = setup(scale)
+    func()  # прогрів: ліниві імпорти, кеші
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return {"seconds": best, "amount": amount, "unit": unit,
+            "throughput": amount / best if best > 0 else float("inf"), "peak_mb": peak}
+
+
+def compare(results, baseline, threshold):
+    """Повертає список регресій [(назва, опис)] порівняно з базовими результатами."""
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base or base.get("unit") != cur["unit"] or base.get("amount") != cur["amount"]:
+            continue
+        if cur["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append((name, f"пропускна здатність {base['throughput']:.3f} -> "
+                                      f"{cur['throughput']:.3f} {cur['unit']}/с"))
+        if cur["peak_mb"] is not None and base.get("peak_mb") is not None \
+                and cur["peak_mb"] > base["peak_mb"] * (1 + threshold) + 0.1:
+            regressions.append((name, f"пікова пам'ять {base['peak_mb']:.2f} -> {cur['peak_mb']:.2f} МБ"))
+    return regressions
+
+
+def environment():
+    info = {"python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "time": time.strftime("%Y-%m-%d %H:%M:%S")}
+    try:
+        import numpy
+        info["numpy"] = numpy.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки practice1-3 з відстеженням регресій")
+    parser.add_argument("--only", action="append", help="підрядок назви випадку (можна кілька)")
+    parser.add_argument("--scale", type=float, default=1.0, help="множник розміру вхідних даних")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="допустиме погіршення (частка)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="базовий JSON-файл")
+    parser.add_argument("--output", help="куди записати результати цього запуску (JSON)")
+    parser.add_argument("--save", action="store_true", help="зберегти результати як базовий файл")
+    parser.add_argument("--no-memory", action="store_true", help="не вимірювати пам'ять")
+    parser.add_argument("--list", action="store_true", help="показати випадки і вийти")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.only or any(part in name for part in args.only)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    print(f"{'випадок':<30} | {'час, с':>8} | {'пропускна здатність':>30} | {'пам., МБ':>8} | {'зміна':>7}")
+    for name in names:
+        try:
+            res = measure(CASES[name], args.scale, args.repeats, not args.no_memory)
+        except ImportError as e:
+            print(f"{name:<30} | пропущено: {e}")
+            continue
+        results[name] = res
+        base = baseline.get(name)
+        change = ""
+        if base and base.get("amount") == res["amount"]:
+            change = f"{res['throughput'] / base['throughput'] - 1:+.1%}"
+        peak = f"{res['peak_mb']:8.2f}" if res["peak_mb"] is not None else f"{'-':>8}"
+        print(f"{name:<30} | {res['seconds']:8.4f} | {res['throughput']:14.3f} {res['unit'] + '/с':<15} | "
+              f"{peak} | {change:>7}")
+
+    report = {"environment": environment(), "scale": args.scale, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+
+    regressions = compare(results, baseline, args.threshold)
+    if args.save:
+        # Зберігаємо разом зі старими записами випадків, які цього разу не запускались
+        merged = dict(baseline)
+        merged.update(results)
+        report["results"] = merged
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"\nБазові результати збережено у файл: {args.baseline}")
+    elif not baseline:
+        print(f"\nБазовий файл {args.baseline} не знайдено; збережіть його з --save")
+
+    if regressions:
+        print(f"\nРегресії (поріг {args.threshold:.0%}):")
+        for name, text in regressions:
+            print(f"  {name}: {text}")
+        return 0 if args.save else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,64 +1,109 @@
+import argparse
 import json
-from math import log2
-from collections import Counter
-import matplotlib.pyplot as plt
 import os
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from Middleware.streaming import count_file, count_text, symbol_stats
+from Middleware.parallel import WORKERS, count_file_parallel, count_texts_parallel, iter_count_texts, process_pool
+from Middleware.render import PlotQueue
+from Middleware.results import FORMATS, ResultsWriter, output_paths
+from Middleware.manifest import expand_texts, read_manifest
+from Middleware.memo import MEMO_PATH, MemoStore
+import Middleware.instrument as instrument
+from Middleware.instrument import PROFILER, stage
 
 # --- ЗМІНА 1: Визначення констант для папок ---
 OUTPUT_FILE = "results.txt"
+# Формати результатів: text (звіт), jsonl, bin (стовпчиковий двійковий)
+OUTPUT_FORMATS = ("text", "jsonl")
 IMG_FOLDER = "img"  # Назва папки для зображень
 
+# Графіки малюються у фонових процесах, аналіз їх не чекає
+PLOTS = PlotQueue()
 
-def write_to_file(content):
-    with open(OUTPUT_FILE, "a", encoding="utf-8") as f:
-        f.write(content + "\n")
+# Файли результатів відкриваються один раз на весь запуск
+RESULTS = ResultsWriter(OUTPUT_FILE, OUTPUT_FORMATS)
+# Чи друкувати звіти в консоль (у пакетному режимі можна вимкнути: --quiet)
+PRINT_REPORTS = True
+# Кеш результатів за хешем тексту; вмикається в main (тут - вимкнений, без файлів)
+MEMO = MemoStore(None)
 
 
 def analyze_text(text, lang, variant):
-    n = len(text)
-    counter = Counter(text)
-    if n == 0:
-        return [], 0.0, 0.0
-    inf_list = [(ch, freq, freq / n) for ch, freq in counter.items()]
-    inf_list.sort(key=lambda x: x[1])
-
-    H = -sum(p * log2(p) for _, _, p in inf_list if p > 0)
-    I = H * n
+    key = MEMO.text_key(text) if MEMO.enabled else None
+    hit = MEMO.get(key) if key else None
+    if hit is None:
+        with stage("count", f"{lang} ({variant})"):
+            hit = count_text(text), len(text)
+        if key:
+            MEMO.put(key, *hit)
+    return analyze_counter(*hit, lang, variant)
+
+
+def analyze_file(path, lang, variant):
+    """Потоковий аналіз файлу (або stdin для '-') без завантаження всього тексту в пам'ять."""
+    with stage("count", path):
+        if path == "-":
+            counter, n = count_file(path)
+        else:
+            counter, n = MEMO.count_file(path, lambda p: count_file_parallel(p, WORKERS))
+    return analyze_counter(counter, n, lang, variant)
 
-    header = f"\n=== {lang} ({variant}) ==="
-    stats = [header, f"Довжина тексту: {n} символів", "Символ | Кількість | Ймовірність"]
-    for ch, freq, p in inf_list:
-        stats.append(f"{repr(ch):6} | {freq:9} | {p:.5f}")
-    stats.append(f"Ентропія (H): {H:.4f} біт/символ")
-    stats.append(f"Кількість інформації: {I:.2f} біт (~{I / 8:.2f} байт)")
 
-    print("\n".join(stats))
-    write_to_file("\n".join(stats))
+def analyze_counter(counter, n, lang, variant):
+    inf_list, H, I = symbol_stats(counter, n)
+    if n == 0:
+        return inf_list, H, I
+
+    with stage("report", f"{lang} ({variant})"):
+        report = None
+        # Текстовий звіт формується лише тоді, коли його друкують або записують
+        if PRINT_REPORTS or RESULTS.wants_text:
+            header = f"\n=== {lang} ({variant}) ==="
+            stats = [header, f"Довжина тексту: {n} символів", "Символ | Кількість | Ймовірність"]
+            for ch, freq, p in inf_list:
+                stats.append(f"{repr(ch):6} | {freq:9} | {p:.5f}")
+            stats.append(f"Ентропія (H): {H:.4f} біт/символ")
+            stats.append(f"Кількість інформації: {I:.2f} біт (~{I / 8:.2f} байт)")
+            report = "\n".join(stats)
+            if PRINT_REPORTS:
+                print(report)
+        RESULTS.write(f"{lang} ({variant})", inf_list, n, H, I, report, lang=lang, variant=variant)
 
     return inf_list, H, I
 
 
+def safe_filename(name):
+    """Ім'я файлу без пробілів та символів, недопустимих у шляху (наприклад, з URL)."""
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
 def save_distribution(inf_list, lang, variant):
     if not inf_list:
         print(f"Немає символів для гістограми: {lang} ({variant})")
         return
     X = [item[0] for item in inf_list]
     Y = [item[1] for item in inf_list]
-    plt.figure(figsize=(8, 5))
-    plt.bar(X, Y)
-    plt.xlabel("Символ")
-    plt.ylabel("Кількість")
-    plt.title(f"Розподіл символів ({lang}, {variant})")
-    plt.grid(True)
-
-    filename = f"{lang}_{variant}_hist.png".replace(" ", "_")
+
+    filename = safe_filename(f"{lang}_{variant}_hist.png")
     # --- ЗМІНА 2: Формування повного шляху до файлу ---
     full_path = os.path.join(IMG_FOLDER, filename)
 
-    plt.tight_layout()
-    plt.savefig(full_path, dpi=200, bbox_inches="tight")
-    plt.close()
-    print(f"Графік збережено у файл: {os.path.abspath(full_path)}")
+    PLOTS.submit({
+        "path": full_path,
+        "figsize": (8, 5),
+        "x": X,
+        "y": Y,
+        "xlabel": "Символ",
+        "ylabel": "Кількість",
+        "title": f"Розподіл символів ({lang}, {variant})",
+        "grid": {"visible": True},
+        "savefig": {"dpi": 200, "bbox_inches": "tight"},
+    }, f"Графік збережено у файл: {os.path.abspath(full_path)}")
 
 
 def save_info_comparison(results):
@@ -68,22 +113,22 @@ def save_info_comparison(results):
     langs = [f"{lang} ({variant})" for lang, variant, _, _ in results]
     infos = [I for _, _, _, I in results]
 
-    plt.figure(figsize=(10, 6))
-    plt.bar(langs, infos)
-    plt.xlabel("Мова/Варіант")
-    plt.ylabel("Кількість інформації (біти)")
-    plt.title("Порівняння кількості інформації у текстах")
-    plt.grid(axis="y")
-    plt.xticks(rotation=30, ha='right')
-    plt.tight_layout()
-
     filename = "info_comparison.png"
     # --- ЗМІНА 3: Формування повного шляху до файлу ---
     full_path = os.path.join(IMG_FOLDER, filename)
 
-    plt.savefig(full_path, dpi=200, bbox_inches="tight")
-    plt.close()
-    print(f"Загальний графік збережено у файл: {os.path.abspath(full_path)}")
+    PLOTS.submit({
+        "path": full_path,
+        "figsize": (10, 6),
+        "x": langs,
+        "y": infos,
+        "xlabel": "Мова/Варіант",
+        "ylabel": "Кількість інформації (біти)",
+        "title": "Порівняння кількості інформації у текстах",
+        "grid": {"axis": "y"},
+        "xticks": {"rotation": 30, "ha": "right"},
+        "savefig": {"dpi": 200, "bbox_inches": "tight"},
+    }, f"Загальний графік збережено у файл: {os.path.abspath(full_path)}")
 
 
 def save_individual_comparisons(results):
@@ -108,21 +153,37 @@ def save_individual_comparisons(results):
         variants_labels = ["Зв'язний (variant1)", "Незв'язний (variant3)"]
         info_values = [info_v1, info_v3]
 
-        fig, ax = plt.subplots(figsize=(7, 6))
-        bars = ax.bar(variants_labels, info_values, color=['cornflowerblue', 'lightcoral'])
-        ax.set_ylabel('Кількість інформації (біти)')
-        ax.set_title(f"Порівняння для мови: {lang}")
-        ax.grid(axis='y', linestyle='--', alpha=0.7)
-        ax.bar_label(bars, fmt='%.0f', padding=3)
-        fig.tight_layout()
-
-        filename = f"comparison_{lang}.png".replace(" ", "_")
+        filename = safe_filename(f"comparison_{lang}.png")
         # --- ЗМІНА 4: Формування повного шляху до файлу ---
         full_path = os.path.join(IMG_FOLDER, filename)
 
-        plt.savefig(full_path, dpi=200)
-        plt.close(fig)
-        print(f"Графік для мови '{lang}' збережено у файл: {os.path.abspath(full_path)}")
+        PLOTS.submit({
+            "path": full_path,
+            "figsize": (7, 6),
+            "x": variants_labels,
+            "y": info_values,
+            "bar": {"color": ['cornflowerblue', 'lightcoral']},
+            "ylabel": 'Кількість інформації (біти)',
+            "title": f"Порівняння для мови: {lang}",
+            "grid": {"axis": 'y', "linestyle": '--', "alpha": 0.7},
+            "bar_label": {"fmt": '%.0f', "padding": 3},
+            "savefig": {"dpi": 200},
+        }, f"Графік для мови '{lang}' збережено у файл: {os.path.abspath(full_path)}")
+
+
+def compare_results(paths, out_dir, workers=WORKERS):
+    """Попарні дивергенції розподілів символів усіх результатів запуску (див. Middleware.divergence)."""
+    from Middleware.divergence import compare_file, nearest
+
+    source = paths.get("bin") or paths["jsonl"]
+    with stage("divergence", source):
+        labels, matrices = compare_file(source, out_dir, workers=workers)
+    print(f"\nМатриці дивергенцій ({', '.join(matrices)}) для {len(labels)} документів "
+          f"записано у теку: {os.path.abspath(out_dir)}")
+    if PRINT_REPORTS and len(labels) <= 20:
+        print("Найближчі за розподілом символів (Дженсен-Шеннон, біт):")
+        for label, close in nearest(matrices["js"], labels):
+            print(f"  {label}: " + ", ".join(f"{other} ({value:.4f})" for other, value in close))
 
 
 def load_test_texts(filename="texts.json"):
@@ -133,8 +194,154 @@ def load_test_texts(filename="texts.json"):
         return json.load(f)
 
 
+def run_manifest(entries, texts, workers=WORKERS, pool=None):
+    """
+    Неінтерактивний аналіз елементів маніфесту. Сторінки завантажуються у фоновому потоці;
+    їх розбір і підрахунок текстів та файлів виконуються в одному пулі з workers процесів,
+    а звіти пишуться по мірі готовності. pool - вже створений спільний пул (інакше - власний).
+    Повертає (результати [(мова, варіант, H, I)], невдалі елементи, кількість символів).
+    """
+    results, failed = [], []
+    total_chars = 0
+    url_results = queue.Queue()
+    urls = [entry.source for entry in entries if entry.kind == "url"]
+
+    def handle(lang, variant, counter, n):
+        nonlocal total_chars
+        inf_list, H, I = analyze_counter(counter, n, lang, variant)
+        save_distribution(inf_list, lang, variant)
+        results.append((lang, variant, H, I))
+        total_chars += n
+
+    def drain_urls(block=False):
+        while True:
+            try:
+                url, counter, n, error = url_results.get(block=block, timeout=0.1)
+            except queue.Empty:
+                return
+            if error is not None:
+                print(f"Помилка: {url}: {type(error).__name__}: {error}")
+                failed.append(url)
+            else:
+                handle(url, "url", counter, n)
+
+    text_items, missing = expand_texts(entries, texts)
+    for name in missing:
+        print(f"{name}: текст відсутній або порожній!")
+        failed.append(name)
+
+    # Один пул на всі етапи (розбір сторінок, тексти, файли): разом вони не займають
+    # більше workers процесів. Пул створюється до запуску потоку завантаження
+    with nullcontext(pool) if pool is not None else process_pool(workers) as pool:
+        fetcher = None
+        if urls:
+            def fetch():
+                try:
+                    from Middleware.fetch import run_batch
+                    run_batch(urls, lambda *result: url_results.put(result), pool=pool)
+                except Exception as e:
+                    for url in urls:
+                        url_results.put((url, None, 0, e))
+
+            fetcher = threading.Thread(target=fetch, daemon=True)
+            fetcher.start()
+
+        items = [((lang, variant), text) for lang, variant, text in text_items]
+        # Незмінені тексти беруться з кешу, решта рахується в пулі
+        counted = MEMO.count_texts(items, lambda misses: iter_count_texts(misses, pool))
+        # Час очікування кожного результату з пулу записується як етап count
+        counted = PROFILER.iterate("count", counted, item=lambda result: "{} ({})".format(*result[0]))
+        for (lang, variant), counter, n in counted:
+            handle(lang, variant, counter, n)
+            drain_urls()
+
+        for entry in entries:
+            if entry.kind != "file":
+                continue
+            if not os.path.isfile(entry.source):
+                print(f"Файл '{entry.source}' не знайдено!")
+                failed.append(entry.source)
+                continue
+            with stage("count", entry.source):
+                counter, n = MEMO.count_file(entry.source,
+                                             lambda path: count_file_parallel(path, workers, pool=pool))
+            handle(os.path.basename(entry.source), "file", counter, n)
+            drain_urls()
+
+        while fetcher is not None and (fetcher.is_alive() or not url_results.empty()):
+            drain_urls(block=True)
+    return results, failed, total_chars
+
+
+def run_cli(argv):
+    """Пакетний режим без меню: python 1.py маніфест [--workers N] [--format text,jsonl,bin]."""
+    global RESULTS, PRINT_REPORTS, MEMO
+    parser = argparse.ArgumentParser(description="Пакетний аналіз текстів, файлів та сторінок за маніфестом")
+    parser.add_argument("manifest", help="файл маніфесту ('-' - stdin)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="кількість процесів")
+    parser.add_argument("--format", default=",".join(OUTPUT_FORMATS),
+                        help=f"формати результатів через кому: {', '.join(FORMATS)}")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="файл текстових результатів")
+    parser.add_argument("--texts", default="texts.json", help="файл з тестовими текстами")
+    parser.add_argument("--quiet", action="store_true", help="не друкувати звіти в консоль")
+    parser.add_argument("--no-plots", action="store_true", help="не будувати графіки")
+    parser.add_argument("--divergence", metavar="ТЕКА",
+                        help="записати попарні матриці дивергенцій розподілів (потрібен формат jsonl або bin)")
+    instrument.add_arguments(parser)
+    parser.add_argument("--no-memo", action="store_true", help="не використовувати кеш результатів")
+    args = parser.parse_args(argv)
+    instrument.start(args)
+
+    formats = [fmt.strip() for fmt in args.format.split(",") if fmt.strip()]
+    if set(formats) - set(FORMATS):
+        parser.error(f"невідомий формат; допустимі: {', '.join(FORMATS)}")
+    if args.divergence and not {"jsonl", "bin"} & set(formats):
+        parser.error("--divergence потребує формату результатів jsonl або bin")
+    if args.manifest != "-" and not os.path.isfile(args.manifest):
+        parser.error(f"файл маніфесту '{args.manifest}' не знайдено")
+    RESULTS = ResultsWriter(args.output, formats)
+    PRINT_REPORTS = not args.quiet
+    PLOTS.enabled = not args.no_plots
+    MEMO = MemoStore(None if args.no_memo else MEMO_PATH)
+
+    entries = read_manifest(args.manifest)
+    texts = load_test_texts(args.texts) if any(entry.kind == "text" for entry in entries) else {}
+    if PLOTS.enabled:
+        os.makedirs(IMG_FOLDER, exist_ok=True)
+
+    start = time.perf_counter()
+    # Розбір сторінок, підрахунок і графіки ділять один пул з --workers процесів
+    with process_pool(max(1, args.workers)) as pool:
+        PLOTS.share_pool(pool)
+        results, failed, total_chars = run_manifest(entries, texts, max(1, args.workers), pool)
+        if results:
+            save_info_comparison(results)
+            save_individual_comparisons(results)
+        PLOTS.close()
+    RESULTS.close()
+    if args.divergence and len(results) > 1:
+        compare_results(output_paths(args.output, formats), args.divergence, max(1, args.workers))
+    memo_summary = MEMO.summary()
+    MEMO.close()
+    elapsed = time.perf_counter() - start
+
+    print("\n=== Підсумок ===")
+    print(f"Оброблено: {len(results)}, з помилками: {len(failed)}")
+    print(f"Символів: {total_chars}, час: {elapsed:.2f} с ({total_chars / max(elapsed, 1e-9):,.0f} символів/с)")
+    print(memo_summary)
+    for name in failed:
+        print(f"  не оброблено: {name}")
+    instrument.finish(args)
+    return 1 if failed else 0
+
+
 def main():
+    global MEMO
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+
     test_texts = load_test_texts()
+    MEMO = MemoStore()
     results = []
 
     # --- ЗМІНА 5: Створення папки для зображень, якщо вона не існує ---
@@ -147,6 +354,7 @@ def main():
         print("\nВиберіть дію:")
         print("1. Ввести текст вручну")
         print("2. Використати тестові варіанти з JSON (варіант 1 або 3 для всіх мов)")
+        print("3. Аналізувати великий файл потоково")
         print("0. Вихід")
         choice = input("Ваш вибір: ").strip()
 
@@ -168,22 +376,42 @@ def main():
             variant = "variant1" if var_choice == "1" else "variant3"
 
             batch_results = []
+            batch = []
             for lang, variants in test_texts.items():
                 text = variants.get(variant, "")
                 if text and text.strip():
-                    inf_list, H, I = analyze_text(text, lang, variant)
-                    save_distribution(inf_list, lang, variant)
-                    batch_results.append((lang, variant, H, I))
+                    batch.append((lang, text))
                 else:
                     print(f"{lang}: текст для {variant} відсутній або порожній!")
 
+            # Підрахунок символів для всіх мов виконується паралельно
+            counted = MEMO.count_texts(batch, lambda misses: count_texts_parallel(misses, WORKERS))
+            for lang, counter, n in counted:
+                inf_list, H, I = analyze_counter(counter, n, lang, variant)
+                save_distribution(inf_list, lang, variant)
+                batch_results.append((lang, variant, H, I))
+
             if batch_results:
                 results.extend(batch_results)
 
+        elif choice == "3":
+            path = input("Шлях до файлу ('-' для stdin): ").strip()
+            if path != "-" and not os.path.isfile(path):
+                print(f"Файл '{path}' не знайдено!")
+                continue
+            name = os.path.basename(path) if path != "-" else "stdin"
+            inf_list, H, I = analyze_file(path, name, "stream")
+            save_distribution(inf_list, name, "stream")
+            results.append((name, "stream", H, I))
+
         elif choice == "0":
             if results:
                 save_info_comparison(results)
                 save_individual_comparisons(results)
+            PLOTS.close()
+            RESULTS.close()
+            print(MEMO.summary())
+            MEMO.close()
             print("Вихід з програми.")
             break
 
@@ -1,95 +1,123 @@
+import argparse
 import os
+import sys
+import time
 from urllib.parse import urlparse
-from collections import Counter
-from math import log2
-import matplotlib.pyplot as plt
-import requests
-from bs4 import BeautifulSoup
+from Middleware.streaming import count_text, symbol_stats
+from Middleware.html_extract import extract_text
+from Middleware.fetch import read_url_list, run_batch
+from Middleware.parallel import process_pool
+from Middleware.http_cache import HttpCache, counter_from_inf_list
+from Middleware.render import PlotQueue
+from Middleware.results import FORMATS, ResultsWriter
+from Middleware.manifest import read_manifest
+import Middleware.instrument as instrument
+from Middleware.instrument import stage
 
 # --- Константи ---
 OUTPUT_FILE = "results2.txt"
+# Формати результатів: text (звіт), jsonl, bin (стовпчиковий двійковий)
+OUTPUT_FORMATS = ("text", "jsonl")
 IMG_FOLDER = "img2"  # Назва папки для зображень
 
+# Графіки малюються у фонових процесах, аналіз їх не чекає
+PLOTS = PlotQueue()
+
+# Файли результатів відкриваються один раз на весь запуск
+RESULTS = ResultsWriter(OUTPUT_FILE, OUTPUT_FORMATS, text_sep="\n\n")
+# Чи друкувати звіти в консоль (у пакетному режимі можна вимкнути: --quiet)
+PRINT_REPORTS = True
+
+
+def get_text_from_url(url, cache=None):
+    import requests  # завантажується лише для інтерактивного аналізу сторінки
 
-def get_text_from_url(url):
     try:
         # Додаємо User-Agent, щоб імітувати запит від браузера
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        # Якщо сторінка є в кеші, просимо сервер відповісти 304, коли вона не змінилась
+        entry = cache.get(url) if cache else None
+        headers.update(HttpCache.conditional_headers(entry))
+
+        with stage("fetch", url):
+            response = requests.get(url, headers=headers, timeout=10)
+        if entry and response.status_code == 304:
+            cache.touch(url, response.headers)
+            return entry["text"]
         response.raise_for_status()  # Генерує помилку для кодів 4xx/5xx
 
-        # Використовуємо 'html.parser' - вбудований парсер
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Видаляємо теги script та style разом з їх вмістом
-        for script_or_style in soup(['script', 'style']):
-            script_or_style.decompose()
-
-        # Отримуємо текст і очищуємо його від зайвих пробілів
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        clean_text = '\n'.join(chunk for chunk in chunks if chunk)
-
-        return clean_text
+        # Видаляємо script/style та очищуємо текст від зайвих пробілів
+        with stage("parse", url):
+            text = extract_text(response.text)
+        if cache:
+            cache.store(url, response.headers, response.content, text)
+        return text
 
     except requests.RequestException as e:
         print(f"Помилка: Не вдалося завантажити сторінку. {e}")
         return None
 
 
-def write_to_file(content):
-    """Записує контент у вихідний файл."""
-    with open(OUTPUT_FILE, "a", encoding="utf-8") as f:
-        f.write(content + "\n\n")
-
-
 def analyze_text(text, source_url):
     """
     Аналізує текст: розраховує частоту символів, ентропію та кількість інформації.
     """
-    n = len(text)
+    with stage("count", source_url):
+        counter = count_text(text)
+    return analyze_counter(counter, len(text), source_url)
+
+
+def analyze_counter(counter, n, source_url):
+    """Формує звіт за готовим лічильником символів."""
     if n == 0:
         print("На сайті не знайдено тексту для аналізу.")
-        return [], 0.0, 0.0
-
-    counter = Counter(text)
-    # Створюємо список з інформацією про кожен символ
-    # (символ, кількість, ймовірність)
-    inf_list = [(char, freq, freq / n) for char, freq in counter.items()]
-    # Сортуємо за кількістю для наочності
-    inf_list.sort(key=lambda x: x[1], reverse=True)
-
-    # Розрахунок ентропії за формулою Шеннона
-    H = -sum(p * log2(p) for _, _, p in inf_list if p > 0)
-    # Розрахунок повної кількості інформації
-    I = H * n
-
-    header = f"=== Аналіз сайту: {source_url} ==="
-    stats = [
-        header,
-        f"Загальна довжина тексту: {n} символів",
-        "-" * 40,
-        "Символ | Кількість | Ймовірність",
-        "-" * 40
-    ]
-    for char, freq, p in inf_list:
-        # repr(char) для наочного відображення спецсимволів, як '\n'
-        stats.append(f"{repr(char):<7}| {freq:<10}| {p:.6f}")
-
-    stats.append("-" * 40)
-    stats.append(f"Ентропія (H): {H:.4f} біт/символ")
-    stats.append(f"Кількість інформації (I): {I:.2f} біт (~{I / 8 / 1024:.2f} Кбайт)")
-
-    report = "\n".join(stats)
-    print(report)
-    write_to_file(report)
+        return []
+
+    # Список (символ, кількість, ймовірність), відсортований за кількістю для наочності,
+    # ентропія за формулою Шеннона та повна кількість інформації
+    inf_list, H, I = symbol_stats(counter, n, reverse=True)
+
+    with stage("report", source_url):
+        report = None
+        # Текстовий звіт формується лише тоді, коли його друкують або записують
+        if PRINT_REPORTS or RESULTS.wants_text:
+            header = f"=== Аналіз сайту: {source_url} ==="
+            stats = [
+                header,
+                f"Загальна довжина тексту: {n} символів",
+                "-" * 40,
+                "Символ | Кількість | Ймовірність",
+                "-" * 40
+            ]
+            for char, freq, p in inf_list:
+                # repr(char) для наочного відображення спецсимволів, як '\n'
+                stats.append(f"{repr(char):<7}| {freq:<10}| {p:.6f}")
+
+            stats.append("-" * 40)
+            stats.append(f"Ентропія (H): {H:.4f} біт/символ")
+            stats.append(f"Кількість інформації (I): {I:.2f} біт (~{I / 8 / 1024:.2f} Кбайт)")
+
+            report = "\n".join(stats)
+            if PRINT_REPORTS:
+                print(report)
+        RESULTS.write(source_url, inf_list, n, H, I, report)
 
     return inf_list
 
 
+def analyze_page(text, source_url, cache):
+    """Аналізує текст сторінки, беручи inf_list з кешу, якщо сторінка не змінилась."""
+    entry = cache.get(source_url)
+    if entry and entry["inf_list"] is not None:
+        counter, n = counter_from_inf_list(entry["inf_list"])
+        return analyze_counter(counter, n, source_url)
+    inf_list = analyze_text(text, source_url)
+    cache.store_inf_list(source_url, inf_list)
+    return inf_list
+
+
 def save_char_distribution_plot(inf_list, source_url):
     """
     Створює та зберігає гістограму розподілу символів.
@@ -105,15 +133,6 @@ def save_char_distribution_plot(inf_list, source_url):
     chars = [repr(item[0]) for item in inf_list_top]
     counts = [item[1] for item in inf_list_top]
 
-    plt.figure(figsize=(15, 8))
-    plt.bar(chars, counts, color='skyblue')
-    plt.xlabel("Символи", fontsize=12)
-    plt.ylabel("Кількість", fontsize=12)
-    plt.title(f"Частота появи {top_n} найпопулярніших символів на сайті:\n{source_url}", fontsize=14)
-    plt.xticks(rotation=45, ha='right')
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-
     # Створюємо безпечне ім'я файлу з URL
     parsed_url = urlparse(source_url)
     # Використовуємо доменне ім'я, замінюючи точки на підкреслення
@@ -122,13 +141,109 @@ def save_char_distribution_plot(inf_list, source_url):
 
     full_path = os.path.join(IMG_FOLDER, filename)
 
-    plt.savefig(full_path, dpi=200)
-    plt.close()
-    print(f"\nГрафік розподілу символів збережено у файл: {os.path.abspath(full_path)}")
+    PLOTS.submit({
+        "path": full_path,
+        "figsize": (15, 8),
+        "x": chars,
+        "y": counts,
+        "bar": {"color": 'skyblue'},
+        "xlabel": "Символи",
+        "xlabel_kw": {"fontsize": 12},
+        "ylabel": "Кількість",
+        "ylabel_kw": {"fontsize": 12},
+        "title": f"Частота появи {top_n} найпопулярніших символів на сайті:\n{source_url}",
+        "title_kw": {"fontsize": 14},
+        "xticks": {"rotation": 45, "ha": 'right'},
+        "grid": {"axis": 'y', "linestyle": '--', "alpha": 0.7},
+        "savefig": {"dpi": 200},
+    }, f"\nГрафік розподілу символів збережено у файл: {os.path.abspath(full_path)}")
+
+
+def analyze_url_batch(path, cache=None):
+    """Пакетний режим: паралельно аналізує всі URL з файлу."""
+    urls = read_url_list(path)
+    print(f"Завантаження {len(urls)} URL з файлу '{path}'...")
+    failed = analyze_urls(urls, cache)
+    print(f"Оброблено: {len(urls) - len(failed)} з {len(urls)} URL.")
+
+
+def analyze_urls(urls, cache=None, workers=None, pool=None):
+    """
+    Паралельно аналізує сторінки; повертає список URL, які не вдалося обробити.
+    pool - спільний пул процесів для розбору (інакше run_batch створює власний з workers процесів).
+    """
+    failed = []
+
+    def on_result(url, counter, n, error):
+        if error is not None:
+            print(f"Помилка: Не вдалося завантажити сторінку {url}. {type(error).__name__}: {error}")
+            failed.append(url)
+            return
+        inf_list = analyze_counter(counter, n, url)
+        save_char_distribution_plot(inf_list, url)
+
+    run_batch(urls, on_result, cache=cache, workers=workers, pool=pool)
+    return failed
+
+
+def run_cli(argv):
+    """Пакетний режим без діалогу: python 2.py маніфест [--workers N] [--format text,jsonl,bin]."""
+    global RESULTS, PRINT_REPORTS
+    parser = argparse.ArgumentParser(description="Пакетний аналіз сторінок за маніфестом")
+    parser.add_argument("manifest", help="файл маніфесту з URL ('-' - stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів для розбору HTML")
+    parser.add_argument("--format", default=",".join(OUTPUT_FORMATS),
+                        help=f"формати результатів через кому: {', '.join(FORMATS)}")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="файл текстових результатів")
+    parser.add_argument("--quiet", action="store_true", help="не друкувати звіти в консоль")
+    parser.add_argument("--no-plots", action="store_true", help="не будувати графіки")
+    instrument.add_arguments(parser)
+    parser.add_argument("--no-cache", action="store_true", help="не використовувати кеш сторінок")
+    args = parser.parse_args(argv)
+    instrument.start(args)
+
+    formats = [fmt.strip() for fmt in args.format.split(",") if fmt.strip()]
+    if set(formats) - set(FORMATS):
+        parser.error(f"невідомий формат; допустимі: {', '.join(FORMATS)}")
+    if args.manifest != "-" and not os.path.isfile(args.manifest):
+        parser.error(f"файл маніфесту '{args.manifest}' не знайдено")
+    RESULTS = ResultsWriter(args.output, formats, text_sep="\n\n")
+    PRINT_REPORTS = not args.quiet
+    PLOTS.enabled = not args.no_plots
+
+    entries = read_manifest(args.manifest)
+    urls = [entry.source for entry in entries if entry.kind == "url"]
+    skipped = [entry for entry in entries if entry.kind != "url"]
+    if skipped:
+        print(f"Пропущено {len(skipped)} елементів маніфесту, що не є URL (їх аналізує 1.py).")
+    if PLOTS.enabled:
+        os.makedirs(IMG_FOLDER, exist_ok=True)
+
+    cache = None if args.no_cache else HttpCache()
+    start = time.perf_counter()
+    # Розбір сторінок і графіки ділять один пул, створений до запуску циклу asyncio
+    with process_pool(args.workers) as pool:
+        PLOTS.share_pool(pool)
+        failed = analyze_urls(urls, cache, pool=pool) if urls else []
+        PLOTS.close()
+    RESULTS.close()
+    if cache:
+        cache.close()
+    elapsed = time.perf_counter() - start
+
+    print("\n=== Підсумок ===")
+    print(f"Оброблено: {len(urls) - len(failed)} з {len(urls)} URL за {elapsed:.2f} с")
+    for url in failed:
+        print(f"  не оброблено: {url}")
+    instrument.finish(args)
+    return 1 if failed else 0
 
 
 def main():
     """Головна функція програми."""
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+
     # Створюємо папку для зображень, якщо вона не існує
     os.makedirs(IMG_FOLDER, exist_ok=True)
 
@@ -137,23 +252,37 @@ def main():
         os.remove(OUTPUT_FILE)
         print(f"Файл '{OUTPUT_FILE}' очищено.")
 
+    # Кеш сторінок між запусками
+    cache = HttpCache()
+
     while True:
-        url = input("\nВведіть URL сайту для аналізу (або '0' для виходу): ").strip()
+        url = input("\nВведіть URL сайту для аналізу ('@файл' - список URL, '0' - вихід): ").strip()
         if url == '0':
             print("Вихід з програми.")
+            PLOTS.close()
+            RESULTS.close()
+            cache.close()
             break
 
+        if url.startswith('@'):
+            path = url[1:].strip()
+            if not os.path.isfile(path):
+                print(f"Файл '{path}' не знайдено!")
+                continue
+            analyze_url_batch(path, cache)
+            continue
+
         # Перевірка, чи введено хоча б щось схоже на URL
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
             print(f"URL автоматично виправлено на: {url}")
 
         print("\nЗавантаження та обробка даних...")
-        text = get_text_from_url(url)
+        text = get_text_from_url(url, cache)
 
         if text:
             # Якщо текст отримано успішно, аналізуємо його
-            inf_list = analyze_text(text, url)
+            inf_list = analyze_page(text, url, cache)
             # Будуємо та зберігаємо графік
             save_char_distribution_plot(inf_list, url)
         else:
@@ -0,0 +1,293 @@
+"""
+Попарне порівняння розподілів символів багатьох документів (сторінок, варіантів текстів):
+крос-ентропія H(P, Q), дивергенція Кульбака-Лейблера KL(P || Q) і дивергенція
+Дженсена-Шеннона JS(P, Q), у бітах.
+
+Розподіли зводяться до спільного індексу символів, що зберігається розріджено (CSR:
+для кожного документа - лише символи, які в ньому трапляються), тож пам'ять під вхідні дані
+пропорційна сумі розмірів алфавітів документів, а не N x (розмір спільного алфавіту).
+Матриці рахуються блоками пар документів; блок перетворюється на щільний масив лише
+по символах, що трапляються в його документах.
+
+Q згладжується оцінкою q = (k + ALPHA) / (n + ALPHA * V), інакше KL нескінченна для кожного
+символа, якого немає в Q; тому KL(P || P) трохи більша за 0. Оскільки log2 q = log2(ALPHA) - L_Q
++ D_Q, де L_Q = log2(n + ALPHA * V), а D_Q = log2(k + ALPHA) - log2(ALPHA) ненульове лише для
+символів Q, крос-ентропія H(P, Q) = L_Q - log2(ALPHA) - P . D_Q - добуток матриць по спільних
+символах блоку, а KL(P || Q) = H(P, Q) - H(P).
+JS = H((P + Q) / 2) - (H(P) + H(Q)) / 2 згладжування не потребує і рахується по символах,
+що трапляються хоча б в одному документі пари; матриці симетричні за блоками, тож кожна
+пара блоків обробляється один раз.
+
+Результати - файли .npy (float32) у теці, записані через np.memmap: матриця 10 000 x 10 000
+займає 400 МБ на диску і не тримається в пам'яті цілком.
+
+Запуск:
+    python -m Middleware.divergence results.jsonl -o divergence
+    python -m Middleware.divergence results.bin -o divergence --metrics js --block 512
+"""
+import argparse
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from Middleware.results import read_bin, read_columns, read_jsonl
+
+METRICS = ("cross_entropy", "kl", "js")
+# Кількість документів у блоці рядків (і стовпців)
+BLOCK = 256
+# Максимальна кількість елементів щільного блоку (документи x символи); для великих
+# спільних алфавітів блок автоматично зменшується
+DENSE_ELEMENTS = 1 << 22
+# Максимальна кількість елементів проміжного масиву блоку JS (пари x символи)
+JS_CHUNK = 1 << 23
+# Псевдокількість для згладжування Q у крос-ентропії та KL
+ALPHA = 0.5
+WORKERS = os.cpu_count() or 1
+TINY = np.float32(1e-30)
+
+# Розріджена матриця кількостей (документи x символи) у форматі CSR: символи документа i -
+# indices[indptr[i]:indptr[i + 1]] (за зростанням), їх кількості - counts[...]
+SymbolCounts = namedtuple("SymbolCounts", ["indptr", "indices", "counts", "n_symbols"])
+
+
+def load_records(path):
+    """Записи результатів (файл JSON Lines або тека .bin) з полями source, symbols, counts."""
+    if os.path.isdir(path):
+        return list(read_bin(path))
+    return list(read_jsonl(path))
+
+
+def _build_index(codes, counts, offsets, max_symbols=None):
+    """Спільний індекс символів для кодів/кількостей усіх документів підряд: (символи, SymbolCounts)."""
+    codes = np.asarray(codes, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    alphabet, column = np.unique(codes, return_inverse=True)
+    column = column.ravel()
+    symbols = [chr(c) for c in alphabet]
+    if max_symbols is not None and len(symbols) > max_symbols:
+        # Рідкісні символи зводяться в один стовпець "" (інші)
+        order = np.argsort(-np.bincount(column, weights=counts, minlength=len(alphabet)), kind="stable")
+        keep = np.sort(order[:max_symbols - 1])
+        remap = np.full(len(alphabet), max_symbols - 1)
+        remap[keep] = np.arange(len(keep))
+        column = remap[column]
+        symbols = [symbols[j] for j in keep] + [""]
+    V = len(symbols)
+    row = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    keys, inverse = np.unique(row * V + column, return_inverse=True)
+    data = np.bincount(inverse.ravel(), weights=counts, minlength=len(keys))
+    indptr = np.searchsorted(keys, np.arange(len(offsets)) * V)
+    return symbols, SymbolCounts(indptr, keys % V if V else keys, data, V)
+
+
+def symbol_matrix(records, max_symbols=None):
+    """
+    Спільний індекс символів для записів з полями source, symbols, counts:
+    (підписи документів, символи, SymbolCounts).
+    max_symbols - залишити найчастіші символи, решту звести в один стовпець "" (інші).
+    """
+    labels = [record["source"] for record in records]
+    lengths = [len(record["symbols"]) for record in records]
+    codes = np.fromiter((ord(ch) for record in records for ch in record["symbols"]),
+                        dtype=np.int64, count=sum(lengths))
+    counts = np.fromiter((c for record in records for c in record["counts"]),
+                         dtype=np.float64, count=sum(lengths))
+    offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+    return (labels, *_build_index(codes, counts, offsets, max_symbols))
+
+
+def load_symbol_counts(path, max_symbols=None):
+    """
+    Результати аналізу (файл JSON Lines або тека .bin): (підписи, символи, SymbolCounts).
+    Стовпці теки .bin читаються напряму, без розбору записів.
+    """
+    if not os.path.isdir(path):
+        return symbol_matrix(load_records(path), max_symbols)
+    columns, meta = read_columns(path)
+    labels_data = bytes(columns["labels"])
+    label_offsets = columns["label_offsets"]
+    labels = [labels_data[label_offsets[i]:label_offsets[i + 1]].decode("utf-8") for i in range(meta["records"])]
+    offsets = columns["symbol_offsets"][:meta["records"] + 1]
+    return (labels, *_build_index(columns["codes"][:offsets[-1]], columns["counts"][:offsets[-1]],
+                                  offsets, max_symbols))
+
+
+def _as_symbol_counts(counts):
+    """SymbolCounts без змін; щільна матриця (документи x символи) - у SymbolCounts."""
+    if isinstance(counts, SymbolCounts):
+        return counts
+    counts = np.asarray(counts, dtype=np.float64)
+    rows, cols = np.nonzero(counts)
+    indptr = np.searchsorted(rows, np.arange(counts.shape[0] + 1))
+    return SymbolCounts(indptr, cols, counts[rows, cols], counts.shape[1])
+
+
+def _xlog2x(x):
+    """x * log2(x) поелементно, з 0 * log 0 = 0."""
+    return x * np.log2(x, out=np.zeros_like(x), where=x > 0)
+
+
+def _dense(sc, start, stop, columns, dtype=np.float64):
+    """Щільний блок кількостей документів [start, stop) по стовпцях columns (впорядкованих)."""
+    lo, hi = sc.indptr[start], sc.indptr[stop]
+    idx = sc.indices[lo:hi]
+    out = np.zeros((stop - start, len(columns)), dtype=dtype)
+    if not len(columns) or not len(idx):
+        return out
+    pos = np.minimum(np.searchsorted(columns, idx), len(columns) - 1)
+    found = columns[pos] == idx
+    rows = np.repeat(np.arange(stop - start), np.diff(sc.indptr[start:stop + 1]))
+    out[rows[found], pos[found]] = sc.counts[lo:hi][found]
+    return out
+
+
+def _js_block(A, B, H_a, H_b):
+    """JS для блоку пар: A, B - ймовірності (float32) документів по спільних стовпцях блоку."""
+    out = np.empty((len(A), len(B)), dtype=np.float32)
+    # Рядків за раз, щоб масив пар (рядки x стовпці x символи) не перевищував JS_CHUNK
+    step = max(1, JS_CHUNK // max(1, len(B) * A.shape[1]))
+    for start in range(0, len(A), step):
+        M = A[start:start + step, None, :] + B[None, :, :]
+        M *= 0.5
+        # m * log2(m + TINY): для m = 0 дає 0 без окремої перевірки, для m > 0 зсув нехтовно малий
+        L = np.log2(M + TINY)
+        out[start:start + step] = -np.einsum("ijk,ijk->ij", M, L)
+    out -= (H_a[:, None] + H_b[None, :]) * 0.5
+    # Похибка округлення не повинна давати від'ємних значень
+    return np.maximum(out, 0, out=out)
+
+
+def pairwise(counts, out_dir, metrics=METRICS, block=BLOCK, alpha=ALPHA, workers=WORKERS):
+    """
+    Обчислює матриці metrics для кількостей counts (SymbolCounts або щільна матриця
+    документи x символи) і записує їх у out_dir/<метрика>.npy; повертає словник метрика -> np.memmap.
+    Рядок i, стовпець j - порівняння документа i (P) з документом j (Q).
+    """
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Невідомі метрики: {', '.join(sorted(unknown))}")
+    sc = _as_symbol_counts(counts)
+    N, V = len(sc.indptr) - 1, sc.n_symbols
+    row_of = np.repeat(np.arange(N), np.diff(sc.indptr))
+    totals = np.bincount(row_of, weights=sc.counts, minlength=N)
+    if N == 0 or (totals <= 0).any():
+        raise ValueError("Кожен документ повинен містити хоча б один символ")
+    H = -np.bincount(row_of, weights=_xlog2x(sc.counts / totals[row_of]), minlength=N)
+    # L_Q - log2(ALPHA): частина крос-ентропії, що не залежить від P
+    base = np.log2(totals + alpha * V) - np.log2(alpha)
+
+    os.makedirs(out_dir, exist_ok=True)
+    out = {name: np.lib.format.open_memmap(os.path.join(out_dir, f"{name}.npy"), mode="w+",
+                                           dtype=np.float32, shape=(N, N))
+           for name in metrics}
+    # Для великих алфавітів блок зменшується, щоб щільні масиви блоку залишались обмеженими
+    max_support = max((len(np.unique(sc.indices[sc.indptr[i]:sc.indptr[min(i + block, N)]]))
+                       for i in range(0, N, block)), default=1)
+    block = max(1, min(block, DENSE_ELEMENTS // max(1, 2 * max_support)))
+    blocks = [(start, min(start + block, N)) for start in range(0, N, block)]
+    columns = [np.unique(sc.indices[sc.indptr[a]:sc.indptr[b]]) for a, b in blocks]
+    cross = "cross_entropy" in out or "kl" in out
+
+    def write(name, rows, cols, values):
+        out[name][rows, cols] = values
+
+    def cross_part(a, b, common):
+        # H(P_a, Q_b) = L_b - log2(ALPHA) - P_a . D_b по спільних символах
+        (a0, a1), (b0, b1) = a, b
+        P = _dense(sc, a0, a1, common) / totals[a0:a1, None]
+        D = np.log2(_dense(sc, b0, b1, common) + alpha) - np.log2(alpha)
+        ce = base[None, b0:b1] - P @ D.T
+        if "cross_entropy" in out:
+            write("cross_entropy", slice(a0, a1), slice(b0, b1), ce)
+        if "kl" in out:
+            write("kl", slice(a0, a1), slice(b0, b1), ce - H[a0:a1, None])
+
+    def pair(i, j):
+        a, b = blocks[i], blocks[j]
+        if cross:
+            common = np.intersect1d(columns[i], columns[j], assume_unique=True)
+            cross_part(a, b, common)
+            if i != j:
+                cross_part(b, a, common)
+        if "js" in out:
+            union = np.union1d(columns[i], columns[j])
+            A = (_dense(sc, *a, union) / totals[a[0]:a[1], None]).astype(np.float32)
+            B = (_dense(sc, *b, union) / totals[b[0]:b[1], None]).astype(np.float32)
+            values = _js_block(A, B, H[a[0]:a[1]], H[b[0]:b[1]])
+            write("js", slice(*a), slice(*b), values)
+            if i != j:
+                write("js", slice(*b), slice(*a), values.T)
+
+    # Кожне завдання пише у власні частини матриць; NumPy звільняє GIL під час обчислень
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(pair, i, j) for i in range(len(blocks)) for j in range(i, len(blocks))]
+        for future in futures:
+            future.result()
+    for matrix in out.values():
+        matrix.flush()
+    return out
+
+
+def compare_file(path, out_dir, metrics=METRICS, block=BLOCK, alpha=ALPHA, max_symbols=None, workers=WORKERS):
+    """Порівнює всі документи результатів аналізу; підписи та символи - у out_dir/labels.json."""
+    labels, symbols, counts = load_symbol_counts(path, max_symbols)
+    matrices = pairwise(counts, out_dir, metrics, block, alpha, workers)
+    with open(os.path.join(out_dir, "labels.json"), "w", encoding="utf-8") as f:
+        json.dump({"labels": labels, "symbols": symbols, "alpha": alpha}, f, ensure_ascii=False)
+    return labels, matrices
+
+
+def load_matrices(out_dir):
+    """Записані матриці (відображені в пам'ять, лише читання) та підписи документів."""
+    with open(os.path.join(out_dir, "labels.json"), "r", encoding="utf-8") as f:
+        labels = json.load(f)["labels"]
+    matrices = {name: np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode="r")
+                for name in METRICS if os.path.exists(os.path.join(out_dir, f"{name}.npy"))}
+    return labels, matrices
+
+
+def nearest(matrix, labels, top=3):
+    """Для кожного документа - top найближчих інших: [(підпис, [(підпис, значення), ...])]."""
+    result = []
+    for i, label in enumerate(labels):
+        row = np.array(matrix[i], dtype=np.float64)
+        row[i] = np.inf
+        best = np.argsort(row, kind="stable")[:top]
+        result.append((label, [(labels[j], float(row[j])) for j in best if np.isfinite(row[j])]))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Попарні дивергенції розподілів символів документів")
+    parser.add_argument("results", help="результати аналізу (файл .jsonl або тека .bin)")
+    parser.add_argument("-o", "--output", default="divergence", help="тека для матриць .npy")
+    parser.add_argument("--metrics", default=",".join(METRICS), help=f"метрики через кому: {', '.join(METRICS)}")
+    parser.add_argument("--block", type=int, default=BLOCK, help="документів у блоці")
+    parser.add_argument("--alpha", type=float, default=ALPHA, help="згладжування для крос-ентропії та KL")
+    parser.add_argument("--max-symbols", type=int, default=None, help="обмежити спільний алфавіт")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="кількість потоків")
+    args = parser.parse_args()
+
+    metrics = [name.strip() for name in args.metrics.split(",") if name.strip()]
+    if set(metrics) - set(METRICS):
+        parser.error(f"невідома метрика; допустимі: {', '.join(METRICS)}")
+    start = time.perf_counter()
+    labels, matrices = compare_file(args.results, args.output, metrics, args.block, args.alpha,
+                                    args.max_symbols, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Документів: {len(labels)}, пар: {len(labels) ** 2:,}, час: {elapsed:.2f} с")
+    print(f"Матриці записано у теку: {os.path.abspath(args.output)}")
+    if len(labels) <= 20:
+        name = "js" if "js" in matrices else metrics[0]
+        print(f"\nНайближчі документи ({name}):")
+        for label, close in nearest(matrices[name], labels):
+            print(f"  {label}: " + ", ".join(f"{other} ({value:.4f})" for other, value in close))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+import time
+
+from Middleware.html_extract import extract_text
+from Middleware.http_cache import HttpCache, counter_from_inf_list
+from Middleware.instrument import PROFILER
+from Middleware.parallel import process_pool
+from Middleware.streaming import count_text, symbol_stats
+
+# Імітуємо запит від браузера
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+TIMEOUT = 10  # секунд на один запит
+MAX_CONNECTIONS = 100  # загальний ліміт одночасних з'єднань
+PER_HOST_LIMIT = 4  # ліміт одночасних з'єднань до одного хоста
+
+
+def normalize_url(url):
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+
+def read_url_list(path):
+    """Читає файл зі списком URL (по одному в рядку, '#' - коментар)."""
+    urls = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.append(normalize_url(line))
+    return urls
+
+
+def process_html(html, timed=False):
+    """
+    Розбір HTML та підрахунок символів; виконується в окремому процесі.
+    timed=True - додатково повертає виміри етапів [(етап, початок, тривалість, CPU, pid)].
+    """
+    if not timed:
+        text = extract_text(html)
+        return text, count_text(text), len(text)
+    start, cpu = time.perf_counter(), time.thread_time()
+    text = extract_text(html)
+    mid, cpu_mid = time.perf_counter(), time.thread_time()
+    counter = count_text(text)
+    end, cpu_end = time.perf_counter(), time.thread_time()
+    pid = os.getpid()
+    return text, counter, len(text), [("parse", start, mid - start, cpu_mid - cpu, pid),
+                                      ("count", mid, end - mid, cpu_end - cpu_mid, pid)]
+
+
+def describe_error(error):
+    """Короткий опис помилки запиту: код HTTP-статусу або тип винятку."""
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return f"HTTP {status}"
+    return type(error).__name__
+
+
+async def _worker(index, queue, session, pool, on_result, cache):
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    while True:
+        url = await queue.get()
+        start = time.perf_counter()
+        try:
+            entry = cache.get(url) if cache else None
+            async with session.get(url, headers=HttpCache.conditional_headers(entry)) as response:
+                not_modified = entry is not None and response.status == 304
+                if not not_modified:
+                    response.raise_for_status()
+                    body = await response.read()
+                    html = body.decode(response.get_encoding(), errors="replace")
+            # Корутини чергуються в одному потоці, тому етап записується з окремою "доріжкою"
+            PROFILER.record("fetch", start, time.perf_counter() - start, url, tid=f"з'єднання {index}")
+
+            if not_modified:
+                # Сторінка не змінилась - ні розбору, ні підрахунку
+                cache.touch(url, response.headers)
+                if entry["inf_list"] is not None:
+                    counter, n = counter_from_inf_list(entry["inf_list"])
+                else:
+                    counter, n = count_text(entry["text"]), len(entry["text"])
+            else:
+                # Розбір виконується в пулі процесів, поки інші запити чекають на мережу
+                if PROFILER.enabled:
+                    text, counter, n, spans = await loop.run_in_executor(pool, process_html, html, True)
+                    for name, begin, duration, cpu, pid in spans:
+                        PROFILER.record(name, begin, duration, url, cpu, tid=f"процес {pid}")
+                else:
+                    text, counter, n = await loop.run_in_executor(pool, process_html, html)
+                if cache:
+                    inf_list, _, _ = symbol_stats(counter, n, reverse=True)
+                    cache.store(url, response.headers, body, text, inf_list)
+            on_result(url, counter, n, None)
+        except Exception as e:
+            # Помилка однієї сторінки (мережа, таймаут, розбір) не зупиняє всю чергу;
+            # невдалий запит теж записується, щоб виміри не приховували відмов
+            PROFILER.record("fetch error", start, time.perf_counter() - start, f"{url} ({describe_error(e)})",
+                            tid=f"з'єднання {index}")
+            on_result(url, None, 0, e)
+        finally:
+            queue.task_done()
+
+
+async def fetch_all(urls, on_result, max_connections=MAX_CONNECTIONS,
+                    per_host=PER_HOST_LIMIT, timeout=TIMEOUT, workers=None, cache=None, pool=None):
+    """
+    Паралельно завантажує та аналізує сторінки.
+    on_result(url, counter, n, error) викликається для кожного URL по мірі готовності.
+    З'єднання перевикористовуються (keep-alive) в межах однієї сесії.
+    Якщо передано cache (HttpCache), незмінені сторінки не завантажуються і не розбираються повторно.
+    pool - спільний пул процесів для розбору HTML; без нього створюється власний з workers процесів.
+    """
+    # asyncio та aiohttp імпортуються лише в пакетному режимі, щоб не сповільнювати запуск скриптів
+    import asyncio
+    import aiohttp
+
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+
+    connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=per_host)
+    # Таймаути на з'єднання та читання, а не на весь запит: час очікування
+    # вільного з'єднання в черзі не повинен вважатися таймаутом
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    own_pool = pool is None
+    if own_pool:
+        pool = process_pool(workers)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                         headers=HEADERS) as session:
+            tasks = [asyncio.create_task(_worker(i, queue, session, pool, on_result, cache))
+                     for i in range(min(max_connections, len(urls)))]
+            await queue.join()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+
+def run_batch(urls, on_result, **kwargs):
+    """Синхронна обгортка над fetch_all."""
+    import asyncio
+
+    asyncio.run(fetch_all(urls, on_result, **kwargs))
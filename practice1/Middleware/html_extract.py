@@ -0,0 +1,110 @@
+"""
+Витягування видимого тексту зі сторінки HTML. Еталон - BeautifulSoup (extract_text_bs4);
+потоковий і regex-варіанти дають той самий текст, крім посилань на символи, де
+BeautifulSoup відходить від HTML5 (fixtures/html/entities.html):
+    "&unknown;" - bs4 дає "&unknown" (без ";"), інші залишають як є, як і браузер;
+    "&ampx", "&copyx" - bs4 залишає як є, інші розкривають посилання без ";" ("&x", "©x"), як і браузер.
+Вміст <script>, <style> і <template> не є текстом; вміст <![CDATA[...]]> - є.
+"""
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+# Теги, вміст яких не є видимим текстом (вміст template BeautifulSoup теж не видає в get_text)
+SKIP_TAGS = ("script", "style", "template")
+
+
+def clean_text(text):
+    """Прибирає зайві пробіли: розбиває на рядки та фрази (за подвійним пробілом)."""
+    chunks = []
+    for line in text.splitlines():
+        for phrase in line.strip().split("  "):
+            phrase = phrase.strip()
+            if phrase:
+                chunks.append(phrase)
+    return '\n'.join(chunks)
+
+
+def extract_text_bs4(html):
+    """Еталонний варіант: повне дерево BeautifulSoup з видаленням script та style."""
+    from bs4 import BeautifulSoup
+
+    # Використовуємо 'html.parser' - вбудований парсер
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Видаляємо теги script та style разом з їх вмістом
+    for script_or_style in soup(SKIP_TAGS):
+        script_or_style.decompose()
+
+    return clean_text(soup.get_text())
+
+
+class StreamExtractor(HTMLParser):
+    """
+    Потоковий екстрактор: збирає текст по мірі розбору, не будуючи DOM.
+    HTML можна подавати частинами через feed(), результат - через close().
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._parts.append(data)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> - текст, як у BeautifulSoup
+        if data.startswith("CDATA["):
+            self.handle_data(data[len("CDATA["):])
+
+    def handle_comment(self, data):
+        # Новіші версії html.parser передають CDATA поза SVG/MathML як коментар
+        if data.startswith("[CDATA[") and data.endswith("]]"):
+            self.handle_data(data[len("[CDATA["):-2])
+
+    def close(self):
+        super().close()
+        return clean_text("".join(self._parts))
+
+
+def extract_text_stream(html):
+    """Витягує текст потоковим парсером без побудови дерева."""
+    parser = StreamExtractor()
+    parser.feed(html)
+    return parser.close()
+
+
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+_SKIP_RE = re.compile(r"<(script|style|template)\b[^>]*>.*?</\1\s*>|<!--.*?-->|<![^>]*>|<\?[^>]*>",
+                      re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+
+
+def extract_text_regex(html):
+    """Найшвидший варіант: видалення тегів регулярними виразами (можливі дрібні розбіжності)."""
+    text = _TAG_RE.sub("", _SKIP_RE.sub("", _CDATA_RE.sub(r"\1", html)))
+    return clean_text(unescape(text))
+
+
+# Доступні способи витягування тексту
+EXTRACTORS = {
+    "bs4": extract_text_bs4,
+    "stream": extract_text_stream,
+    "regex": extract_text_regex,
+}
+DEFAULT_EXTRACTOR = "stream"
+
+
+def extract_text(html, backend=DEFAULT_EXTRACTOR):
+    """Витягує видимий текст зі сторінки HTML (без script та style)."""
+    return EXTRACTORS[backend](html)
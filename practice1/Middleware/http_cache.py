@@ -0,0 +1,121 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import Counter
+
+# Файл кешу та обмеження його розміру
+CACHE_PATH = os.path.join(".cache", "http_cache.sqlite")
+MAX_BYTES = 512 * 1024 * 1024
+
+
+def evict_lru(db, table, key, max_bytes):
+    """
+    Видаляє з таблиці table найдавніше використані записи (стовпці size та accessed),
+    поки сумарний розмір не вміститься в max_bytes; key - стовпець первинного ключа.
+    """
+    total = db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+    if total <= max_bytes:
+        return
+    rows = db.execute(f"SELECT {key}, size FROM {table} ORDER BY accessed").fetchall()
+    for value, size in rows:
+        if total <= max_bytes:
+            break
+        db.execute(f"DELETE FROM {table} WHERE {key} = ?", (value,))
+        total -= size
+
+
+class HttpCache:
+    """
+    Постійний кеш сторінок за URL: сиру відповідь сервера, очищений текст
+    та inf_list. Перевалідація через ETag/Last-Modified, витіснення за розміром (LRU).
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_BYTES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " body BLOB, text TEXT, inf_list TEXT, size INTEGER, accessed REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+        self.db.commit()
+
+    def get(self, url):
+        """Повертає запис кешу як dict або None."""
+        row = self.db.execute(
+            "SELECT etag, last_modified, text, inf_list FROM entries WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, text, inf_list = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "text": text,
+            "inf_list": [tuple(item) for item in json.loads(inf_list)] if inf_list else None,
+        }
+
+    def get_body(self, url):
+        row = self.db.execute("SELECT body FROM entries WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Заголовки умовного запиту для перевалідації запису."""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url, headers=None):
+        """
+        Позначає запис використаним; headers - заголовки відповіді 304,
+        з яких оновлюються ETag/Last-Modified (якщо сервер їх надіслав).
+        """
+        headers = headers or {}
+        self.db.execute(
+            "UPDATE entries SET accessed = ?, etag = COALESCE(?, etag),"
+            " last_modified = COALESCE(?, last_modified) WHERE url = ?",
+            (time.time(), headers.get("ETag"), headers.get("Last-Modified"), url),
+        )
+        self.db.commit()
+
+    def store(self, url, headers, body, text, inf_list=None):
+        """Зберігає нову версію сторінки (старий inf_list скидається разом з нею)."""
+        body = zlib.compress(body)
+        inf_json = json.dumps(inf_list, ensure_ascii=False) if inf_list is not None else None
+        # Розмір у байтах UTF-8, а не в символах, інакше сторінки не латиницею перевищують ліміт
+        size = len(body) + len(text.encode("utf-8")) + len((inf_json or "").encode("utf-8"))
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, headers.get("ETag"), headers.get("Last-Modified"),
+             body, text, inf_json, size, time.time()),
+        )
+        evict_lru(self.db, "entries", "url", self.max_bytes)
+        self.db.commit()
+
+    def store_inf_list(self, url, inf_list):
+        inf_json = json.dumps(inf_list, ensure_ascii=False)
+        self.db.execute(
+            "UPDATE entries SET inf_list = ?, size = size + ? WHERE url = ? AND inf_list IS NULL",
+            (inf_json, len(inf_json.encode("utf-8")), url),
+        )
+        evict_lru(self.db, "entries", "url", self.max_bytes)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def counter_from_inf_list(inf_list):
+    """Відновлює лічильник символів і довжину тексту з inf_list."""
+    counter = Counter({ch: freq for ch, freq, _ in inf_list})
+    return counter, sum(counter.values())
@@ -0,0 +1,221 @@
+"""
+Вимірювання етапів аналізу: час (wall), процесорний час і пікове виділення пам'яті
+для кожного етапу та кожного елемента (URL, файлу, тексту).
+
+За замовчуванням вимкнено: stage() повертає спільний порожній контекст.
+Після PROFILER.enable() результати можна вивести зведенням (print_summary)
+або записати часовою шкалою у форматі Chrome trace (chrome://tracing, Perfetto).
+
+    with stage("count", url):
+        counter = count_text(text)
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+_NULL = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "item", "start", "cpu", "peak")
+
+    def __init__(self, profiler, name, item):
+        self.profiler = profiler
+        self.name = name
+        self.item = item
+        self.peak = 0
+
+    def __enter__(self):
+        profiler = self.profiler
+        if profiler.memory:
+            stack = profiler._stack()
+            if stack:
+                # Пік батьківського етапу до початку вкладеного не повинен загубитись
+                parent = stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            stack.append(self)
+            tracemalloc.reset_peak()
+        self.cpu = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        cpu = time.thread_time() - self.cpu
+        profiler = self.profiler
+        peak = None
+        if profiler.memory:
+            # Пік - максимум відстежуваної tracemalloc пам'яті під час етапу (разом з вкладеними)
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            stack = profiler._stack()
+            stack.pop()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+        profiler.record(self.name, self.start, end - self.start, self.item, cpu, peak)
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.events = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self, memory=False):
+        """Вмикає вимірювання; memory=True - також пікова пам'ять через tracemalloc (повільніше)."""
+        self.enabled = True
+        self.memory = memory
+        self.origin = time.perf_counter()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        self.enabled = False
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memory = False
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name, item=None):
+        """Контекст вимірювання етапу name для елемента item."""
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name, item)
+
+    def iterate(self, name, iterable, item=None):
+        """
+        Видає елементи iterable, записуючи як етап name час очікування кожного з них
+        (наприклад, результатів з пулу процесів); item(x) - підпис елемента.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+            self.record(name, start, time.perf_counter() - start, item(value) if item else None)
+            yield value
+
+    def record(self, name, start, duration, item=None, cpu=None, peak=None, tid=None):
+        """
+        Додає вже виміряний етап (start - значення time.perf_counter()).
+        Використовується там, де контекст не підходить, наприклад для корутин,
+        що чергуються в одному потоці, або для вимірів з інших процесів.
+        tid - назва "доріжки" на часовій шкалі (за замовчуванням - поточний потік).
+        """
+        if not self.enabled:
+            return
+        event = {"name": name, "item": item, "start": start - self.origin, "wall": duration,
+                 "cpu": cpu, "peak": peak, "tid": tid if tid is not None else threading.get_ident()}
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self):
+        """Зведення за етапами: [(етап, кількість, сума wall, сума cpu, макс. пік байт)]."""
+        stages = {}
+        for event in self.events:
+            row = stages.setdefault(event["name"], [0, 0.0, 0.0, None])
+            row[0] += 1
+            row[1] += event["wall"]
+            if event["cpu"] is not None:
+                row[2] += event["cpu"]
+            if event["peak"] is not None:
+                row[3] = max(row[3] or 0, event["peak"])
+        return [(name, *row) for name, row in sorted(stages.items(), key=lambda x: -x[1][1])]
+
+    def print_summary(self, top=5):
+        """
+        Друкує зведення за етапами, top найповільніших вимірів з елементами
+        та всі виміри етапів "... error" (невдалі елементи).
+        """
+        if not self.events:
+            print("Немає виміряних етапів.")
+            return
+        print(f"\n{'етап':<16} | {'разів':>6} | {'wall, с':>9} | {'CPU, с':>9} | {'пік, МБ':>8}")
+        for name, count, wall, cpu, peak in self.summary():
+            peak_text = f"{peak / 2**20:8.2f}" if peak is not None else f"{'-':>8}"
+            print(f"{name:<16} | {count:6} | {wall:9.3f} | {cpu:9.3f} | {peak_text}")
+        slow = sorted((e for e in self.events if e["item"] is not None), key=lambda e: -e["wall"])[:top]
+        if slow:
+            print("Найповільніші елементи:")
+            for event in slow:
+                print(f"  {event['name']:<14} {event['wall']:8.3f} с  {event['item']}")
+        errors = [e for e in self.events if e["name"].endswith(" error")]
+        if errors:
+            print("Невдалі елементи:")
+            for event in errors:
+                print(f"  {event['name']:<14} {event['wall']:8.3f} с  {event['item']}")
+
+    def export_chrome_trace(self, path):
+        """Записує часову шкалу у форматі Chrome trace (JSON), зведення - в otherData."""
+        pid = os.getpid()
+        threads = {}
+        trace = []
+        for event in self.events:
+            if event["tid"] not in threads:
+                threads[event["tid"]] = len(threads)
+                if isinstance(event["tid"], str):
+                    # Назва доріжки для переглядача
+                    trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": threads[event["tid"]],
+                                  "args": {"name": event["tid"]}})
+            tid = threads[event["tid"]]
+            args = {}
+            if event["item"] is not None:
+                args["item"] = str(event["item"])
+            if event["cpu"] is not None:
+                args["cpu_ms"] = round(event["cpu"] * 1000, 3)
+            if event["peak"] is not None:
+                args["peak_kb"] = round(event["peak"] / 1024, 1)
+            trace.append({"name": event["name"], "ph": "X", "pid": pid, "tid": tid,
+                          "ts": round(event["start"] * 1e6, 1), "dur": round(event["wall"] * 1e6, 1),
+                          "args": args})
+        summary = [{"stage": name, "count": count, "wall": wall, "cpu": cpu, "peak": peak}
+                   for name, count, wall, cpu, peak in self.summary()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms",
+                       "otherData": {"summary": summary}}, f, ensure_ascii=False)
+
+
+# Спільний профайлер процесу
+PROFILER = Profiler()
+
+
+def stage(name, item=None):
+    return PROFILER.stage(name, item)
+
+
+def add_arguments(parser):
+    """Параметри командного рядка для вимірювання етапів."""
+    parser.add_argument("--profile", action="store_true", help="вивести час і пам'ять за етапами")
+    parser.add_argument("--profile-memory", action="store_true", help="також пікова пам'ять (tracemalloc)")
+    parser.add_argument("--trace", help="записати часову шкалу у форматі Chrome trace (JSON)")
+
+
+def start(args):
+    if args.profile or args.profile_memory or args.trace:
+        PROFILER.enable(memory=args.profile_memory)
+
+
+def finish(args):
+    """Друкує зведення та записує часову шкалу відповідно до параметрів."""
+    if not PROFILER.enabled:
+        return
+    PROFILER.print_summary()
+    if args.trace:
+        PROFILER.export_chrome_trace(args.trace)
+        print(f"Часову шкалу записано у файл: {args.trace}")
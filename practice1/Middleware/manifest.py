@@ -0,0 +1,71 @@
+"""
+Маніфест пакетного запуску: один елемент у рядку, '#' - коментар.
+
+    https://example.com            - сторінка (також url:example.com)
+    file:data/book.txt             - файл (рядок без префікса теж вважається файлом)
+    texts:Українська:variant1      - текст з texts.json
+    texts:*:variant3               - variant3 для всіх мов
+    texts:Німецька                 - усі варіанти мови
+"""
+import sys
+from collections import namedtuple
+
+from Middleware.fetch import normalize_url
+
+# kind: "url", "file" або "text"; для text - lang та variant, для інших - source
+Entry = namedtuple("Entry", "kind source lang variant")
+
+
+def parse_line(line):
+    """Повертає список елементів для одного рядка маніфесту (порожній для коментарів)."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return []
+    if line.startswith(("http://", "https://")):
+        return [Entry("url", line, None, None)]
+    prefix, sep, rest = line.partition(":")
+    if sep and prefix == "url":
+        return [Entry("url", normalize_url(rest.strip()), None, None)]
+    if sep and prefix == "file":
+        return [Entry("file", rest.strip(), None, None)]
+    if sep and prefix == "texts":
+        lang, _, variant = rest.strip().partition(":")
+        return [Entry("text", None, lang.strip() or "*", variant.strip() or "*")]
+    return [Entry("file", line, None, None)]
+
+
+def read_manifest(path):
+    """Читає маніфест з файлу ('-' - stdin)."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    entries = []
+    for line in lines:
+        entries.extend(parse_line(line))
+    return entries
+
+
+def expand_texts(entries, texts):
+    """
+    Розкриває елементи texts:* за словником texts.json.
+    Повертає (тексти [(мова, варіант, текст)], елементи, для яких не знайдено жодного тексту).
+    """
+    items, missing = [], []
+    for entry in entries:
+        if entry.kind != "text":
+            continue
+        found = False
+        langs = list(texts) if entry.lang == "*" else [entry.lang]
+        for lang in langs:
+            variants = texts.get(lang, {})
+            names = list(variants) if entry.variant == "*" else [entry.variant]
+            for variant in names:
+                text = variants.get(variant, "")
+                if text and text.strip():
+                    items.append((lang, variant, text))
+                    found = True
+        if not found:
+            missing.append(f"texts:{entry.lang}:{entry.variant}")
+    return items, missing
@@ -0,0 +1,224 @@
+"""
+Генератор тексту ланцюгом Маркова порядку k, навченим на реальних текстах (наприклад, texts.json).
+
+Модель зберігається в стиснутому рядковому форматі (CSR): рядок - контекст з k символів,
+для кожного переходу - наступний символ, накопичена кількість і номер наступного контексту.
+Генерація йде блоками: багато незалежних ланцюгів роблять крок одночасно, а перехід
+вибирається за таблицею, де кожен перехід повторено стільки разів, скільки він траплявся.
+
+Запуск:
+    python -m Middleware.markov --order 3 --length 100000000 --seed 1 -o corpus.txt
+    python -m Middleware.markov --order 2 --train book.txt --length 1000
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from Middleware.random_symbols import BLOCK_SIZE
+
+# Кількість ланцюгів, що генеруються одночасно
+CHAINS = 4096
+# Мінімальна довжина відрізка одного ланцюга у виводі: на межі відрізків перехід не з моделі
+MIN_SEGMENT = 1024
+# Максимальний розмір таблиці вибору переходу за O(1) (елементів int32);
+# для більших моделей перехід шукається через searchsorted
+LOOKUP_LIMIT = 1 << 24
+
+
+def _text_ids(texts):
+    """Спільний алфавіт (коди UTF-32) і масиви номерів символів для кожного тексту."""
+    arrays = [np.frombuffer(text.encode("utf-32-le"), dtype="<u4") for text in texts if text]
+    if not arrays:
+        raise ValueError("Немає тексту для навчання моделі")
+    alphabet, inverse = np.unique(np.concatenate(arrays), return_inverse=True)
+    ids, start = [], 0
+    for arr in arrays:
+        ids.append(inverse[start:start + len(arr)].astype(np.int64))
+        start += len(arr)
+    return alphabet, ids
+
+
+class MarkovModel:
+    """
+    Модель порядку order. Масиви:
+    symbols - коди символів алфавіту, contexts - номери контекстів (число в системі з основою
+    len(symbols)), indptr - межі рядків, next_symbol / next_row / cum - дані переходів.
+    """
+
+    def __init__(self, order, symbols, contexts, indptr, next_symbol, next_row, cum):
+        self.order = order
+        self.symbols = symbols
+        self.contexts = contexts
+        self.indptr = indptr
+        self.next_symbol = next_symbol
+        self.next_row = next_row
+        self.cum = cum
+        self._lookup = None
+
+    @classmethod
+    def train(cls, texts, order=2):
+        """
+        Навчання на списку текстів. Кожен текст вважається циклічним, тож у кожного
+        контексту є хоча б один перехід і ланцюг ніколи не зупиняється.
+        """
+        if order < 0:
+            raise ValueError("Порядок моделі повинен бути >= 0")
+        alphabet, ids = _text_ids(texts)
+        base = len(alphabet)
+        if base ** (order + 1) >= 2 ** 62:
+            raise ValueError("Завеликий порядок моделі для цього алфавіту")
+        size = base ** order
+
+        pairs = []
+        for arr in ids:
+            ext = np.concatenate([arr, np.resize(arr, order)]) if order else arr
+            n = len(arr)
+            ctx = np.zeros(n, dtype=np.int64)
+            for j in range(order):
+                ctx = ctx * base + ext[j:j + n]
+            nxt = ext[order:order + n]
+            pairs.append(ctx * base + nxt)
+        codes, counts = np.unique(np.concatenate(pairs), return_counts=True)
+
+        ctx, sym = np.divmod(codes, base)
+        contexts, row_of = np.unique(ctx, return_inverse=True)
+        indptr = np.zeros(len(contexts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_of, minlength=len(contexts)), out=indptr[1:])
+        # Наступний контекст: відкидаємо найстарший символ і дописуємо новий
+        next_ctx = (ctx * base + sym) % size if size > 1 else np.zeros_like(ctx)
+        next_row = np.searchsorted(contexts, next_ctx)
+        return cls(order, alphabet.astype("<u4"), contexts, indptr,
+                   sym.astype(np.int32), next_row.astype(np.int64), np.cumsum(counts))
+
+    @property
+    def row_totals(self):
+        ends = self.cum[self.indptr[1:] - 1]
+        starts = np.concatenate([[0], ends[:-1]])
+        return starts, ends - starts
+
+    def lookup(self):
+        """
+        Таблиці (наступний символ, наступний рядок) для кожної одиниці накопиченої кількості:
+        перехід з кількістю c займає c елементів. None для великих моделей.
+        """
+        if self._lookup is None and self.cum[-1] <= LOOKUP_LIMIT:
+            counts = np.diff(self.cum, prepend=0)
+            self._lookup = (np.repeat(self.next_symbol.astype(np.int32), counts),
+                            np.repeat(self.next_row.astype(np.int32), counts))
+        return self._lookup
+
+    def save(self, path):
+        np.savez_compressed(path, order=self.order, symbols=self.symbols, contexts=self.contexts,
+                            indptr=self.indptr, next_symbol=self.next_symbol,
+                            next_row=self.next_row, cum=self.cum)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(int(data["order"]), data["symbols"], data["contexts"], data["indptr"],
+                   data["next_symbol"], data["next_row"], data["cum"])
+
+    def iter_text(self, length, seed=None, chains=CHAINS, block_size=BLOCK_SIZE):
+        """
+        Повертає згенерований текст довжини length блоками.
+        Блок складається з відрізків незалежних ланцюгів (стан кожного ланцюга
+        зберігається між блоками), тож усі переходи всередині відрізків - з моделі.
+        """
+        rng = np.random.default_rng(seed)
+        starts, totals = self.row_totals
+        lookup = self.lookup()
+        chains = max(1, min(chains, length // MIN_SEGMENT))
+        # Початкові контексти - пропорційно їх частоті в текстах навчання
+        row = np.searchsorted(self.cum[self.indptr[1:] - 1], rng.random(chains) * self.cum[-1], side="right")
+        row = np.minimum(row, len(totals) - 1)
+        steps = max(MIN_SEGMENT, block_size // chains)
+        done = 0
+        while done < length:
+            count = min(steps, -(-(length - done) // chains))
+            out = np.empty((count, chains), dtype=np.int32)
+            u = rng.random((count, chains))
+            for t in range(count):
+                # floor(u * total) < total для u з [0, 1), тож target не виходить за межі рядка
+                target = starts[row] + (u[t] * totals[row]).astype(np.int64)
+                if lookup is not None:
+                    out[t] = lookup[0][target]
+                    row = lookup[1][target]
+                else:
+                    pos = np.searchsorted(self.cum, target, side="right")
+                    out[t] = self.next_symbol[pos]
+                    row = self.next_row[pos]
+            codes = self.symbols[out.T.ravel()[:length - done]]
+            done += len(codes)
+            yield codes.tobytes().decode("utf-32-le")
+
+    def generate(self, length, seed=None, chains=CHAINS):
+        return "".join(self.iter_text(length, seed, chains))
+
+    def write(self, path, length, seed=None, chains=CHAINS):
+        """Записує текст у файл ('-' - stdout) потоково; повертає кількість байтів."""
+        out = sys.stdout.buffer if path == "-" else open(path, "wb")
+        written = 0
+        try:
+            for block in self.iter_text(length, seed, chains):
+                data = block.encode("utf-8")
+                out.write(data)
+                written += len(data)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+            else:
+                out.flush()
+        return written
+
+
+def load_corpus(texts_file="texts.json", variants=None):
+    """Тексти з texts.json (усі мови; variants - список варіантів, за замовчуванням усі)."""
+    with open(texts_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [text for lang_variants in data.values() for name, text in lang_variants.items()
+            if text and (variants is None or name in variants)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерація тексту ланцюгом Маркова")
+    parser.add_argument("--order", type=int, default=2, help="порядок моделі (довжина контексту)")
+    parser.add_argument("--train", nargs="*", help="файли для навчання (за замовчуванням texts.json)")
+    parser.add_argument("--texts", default="texts.json")
+    parser.add_argument("--variant", action="append", help="варіанти з texts.json (можна кілька)")
+    parser.add_argument("--model", help="файл моделі .npz: завантажити, якщо існує, інакше зберегти")
+    parser.add_argument("--length", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chains", type=int, default=CHAINS)
+    parser.add_argument("-o", "--output", help="вихідний файл ('-' - stdout)")
+    args = parser.parse_args()
+
+    model = None
+    if args.model:
+        try:
+            model = MarkovModel.load(args.model)
+        except OSError:
+            pass
+    if model is None:
+        if args.train:
+            texts = []
+            for path in args.train:
+                with open(path, "r", encoding="utf-8") as f:
+                    texts.append(f.read())
+        else:
+            texts = load_corpus(args.texts, args.variant)
+        model = MarkovModel.train(texts, args.order)
+        if args.model:
+            model.save(args.model)
+
+    if args.output:
+        written = model.write(args.output, args.length, args.seed, args.chains)
+        if args.output != "-":
+            print(f"Записано {args.length} символів ({written} байт) у файл {args.output}")
+    else:
+        print(model.generate(args.length, args.seed, args.chains))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import Counter
+
+from Middleware.http_cache import evict_lru
+
+# Версія аналізатора: при зміні правил підрахунку старі записи перестають збігатися
+ANALYZER_VERSION = "1"
+# Файл кешу та обмеження його розміру
+MEMO_PATH = os.path.join(".cache", "memo.sqlite")
+MAX_BYTES = 64 * 1024 * 1024
+HASH_CHUNK = 1 << 20
+
+
+def _digest():
+    h = hashlib.blake2b(digest_size=20)
+    h.update(ANALYZER_VERSION.encode("ascii") + b"\0")
+    return h
+
+
+class MemoStore:
+    """
+    Постійний кеш результатів аналізу за хешем вмісту тексту (blake2b + версія аналізатора):
+    кількості символів у порядку першої появи та довжина тексту (H та I з них рахує symbol_stats).
+    Витіснення за розміром (LRU). MemoStore(None) - вимкнений кеш з тим самим інтерфейсом.
+    """
+
+    def __init__(self, path=MEMO_PATH, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        if path is None:
+            return
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, counts BLOB, n INTEGER, size INTEGER, accessed REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed)")
+        self.db.commit()
+
+    @property
+    def enabled(self):
+        return self.db is not None
+
+    @staticmethod
+    def text_key(text):
+        h = _digest()
+        h.update(text.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    @staticmethod
+    def file_key(path, encoding="utf-8"):
+        """Хеш вмісту файлу (читається блоками, без завантаження в пам'ять)."""
+        h = _digest()
+        h.update(encoding.encode("ascii") + b"\0")
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_CHUNK), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    def get(self, key):
+        """Повертає (counter, n) або None."""
+        if self.db is None:
+            return None
+        row = self.db.execute("SELECT counts, n FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        counts = json.loads(zlib.decompress(row[0]))
+        return Counter(dict(counts)), row[1]
+
+    def put(self, key, counter, n):
+        if self.db is None:
+            return
+        counts = zlib.compress(json.dumps(list(counter.items()), ensure_ascii=False).encode("utf-8"))
+        self.db.execute(
+            "INSERT OR REPLACE INTO results (key, counts, n, size, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, counts, n, len(counts), time.time()),
+        )
+        evict_lru(self.db, "results", "key", self.max_bytes)
+        self.db.commit()
+
+    def count_texts(self, items, count_many):
+        """
+        Як count_texts_parallel для [(ключ, текст), ...], але рахує лише тексти, яких немає
+        в кеші, функцією count_many (вона отримує [(ключ, текст)] і повертає (ключ, counter, n)).
+        Результати видаються в порядку items: результат з кешу - одразу, як тільки
+        видано всі попередні.
+        """
+        ready = {}  # номер елемента -> (ключ, counter, n)
+        misses = []
+        for index, (key, text) in enumerate(items):
+            digest = self.text_key(text) if self.db is not None else None
+            hit = self.get(digest) if digest else None
+            if hit is None:
+                misses.append(((index, key, digest), text))
+            else:
+                ready[index] = (key, hit[0], hit[1])
+        total = len(ready) + len(misses)
+        # Пропущені тексти рахуються, поки видаються результати з кешу перед ними
+        counted = iter(count_many(misses)) if misses else iter(())
+        position = 0
+        while position < total:
+            if position in ready:
+                yield ready.pop(position)
+                position += 1
+                continue
+            (index, key, digest), counter, n = next(counted)
+            if digest:
+                self.put(digest, counter, n)
+            ready[index] = (key, counter, n)
+
+    def count_file(self, path, count):
+        """Лічильник файлу з кешу або count(path) -> (counter, n) з записом у кеш."""
+        key = self.file_key(path) if self.db is not None else None
+        hit = self.get(key) if key else None
+        if hit is not None:
+            return hit
+        counter, n = count(path)
+        if key:
+            self.put(key, counter, n)
+        return counter, n
+
+    def summary(self):
+        total = self.hits + self.misses
+        if not self.enabled or total == 0:
+            return "Кеш результатів: не використовувався"
+        return f"Кеш результатів: влучань {self.hits} з {total} ({100 * self.hits / total:.1f}%)"
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
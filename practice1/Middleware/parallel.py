@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from Middleware.streaming import CHUNK_SIZE, count_stream, count_text, merge_counters
+
+# Кількість процесів за замовчуванням
+WORKERS = os.cpu_count() or 1
+# Скільки шматків припадає на один процес (для рівномірнішого навантаження)
+SPLITS_PER_WORKER = 4
+
+
+def process_pool(workers=WORKERS):
+    """
+    Пул процесів для конвеєрів з іншими потоками (завантаження сторінок, asyncio);
+    створюється до запуску цих потоків. З методом fork усі процеси пулу запускаються
+    першим завданням, тож тут вони стартують одразу: fork з процесу, де вже працюють
+    інші потоки, може успадкувати захоплені ними блокування. Інші методи (spawn,
+    forkserver) безпечні для запуску процесів будь-коли.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    if multiprocessing.get_start_method() == "fork":
+        pool.submit(int).result()
+    return pool
+
+
+def _split_text(text, parts):
+    step = max(1, -(-len(text) // parts))
+    return [text[i:i + step] for i in range(0, len(text), step)]
+
+
+def parallel_count(text, workers=WORKERS):
+    """
+    Рахує символи тексту в кількох процесах і об'єднує часткові лічильники.
+    Шматки об'єднуються по порядку, тому порядок символів і кількості
+    збігаються з Counter(text).
+    """
+    if workers <= 1 or len(text) < CHUNK_SIZE:
+        return count_text(text)
+    parts = _split_text(text, workers * SPLITS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_counters(pool.map(count_text, parts))
+
+
+def _count_item(item):
+    key, text = item
+    return key, count_text(text), len(text)
+
+
+def count_texts_parallel(items, workers=WORKERS):
+    """
+    Рахує символи для пакета текстів [(ключ, текст), ...] -> [(ключ, counter, n), ...].
+    Короткі пакети (разом менше CHUNK_SIZE символів) рахуються без пулу процесів:
+    запуск пулу коштує більше, ніж сам підрахунок.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1 or sum(len(text) for _, text in items) < CHUNK_SIZE:
+        return [_count_item(item) for item in items]
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(_count_item, items))
+
+
+def iter_count_texts(items, pool):
+    """
+    Як count_texts_parallel, але в уже створеному пулі: результати видаються по порядку
+    в міру готовності, тож їх можна обробляти, поки рахуються наступні.
+    """
+    return pool.map(_count_item, items)
+
+
+def _char_boundary(f, pos):
+    """Зсуває позицію вперед до початку символу UTF-8 (пропускає байти продовження)."""
+    f.seek(pos)
+    while True:
+        b = f.read(1)
+        if not b or (b[0] & 0xC0) != 0x80:
+            return pos
+        pos += 1
+
+
+class _RangeReader:
+    """Обмежує читання файлу діапазоном байтів [start, end)."""
+
+    def __init__(self, f, start, end):
+        self.f = f
+        self.left = end - start
+        f.seek(start)
+
+    def read(self, size):
+        if self.left <= 0:
+            return b""
+        data = self.f.read(min(size, self.left))
+        self.left -= len(data)
+        return data
+
+
+def _count_range(args):
+    path, start, end, encoding = args
+    with open(path, "rb") as f:
+        return count_stream(_RangeReader(f, start, end), CHUNK_SIZE, encoding)
+
+
+def file_ranges(path, parts):
+    """Ділить файл на діапазони байтів, межі яких не розрізають символи UTF-8."""
+    size = os.path.getsize(path)
+    step = max(1, -(-size // parts))
+    bounds = [0]
+    with open(path, "rb") as f:
+        for pos in range(step, size, step):
+            pos = _char_boundary(f, pos)
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+
+def count_file_parallel(path, workers=WORKERS, encoding="utf-8", pool=None):
+    """
+    Рахує символи у файлі, розподіливши діапазони байтів між процесами.
+    pool - вже створений пул процесів (щоб не запускати новий для кожного файлу).
+    """
+    ranges = file_ranges(path, workers * SPLITS_PER_WORKER)
+    jobs = [(path, start, end, encoding) for start, end in ranges]
+    if pool is not None and len(jobs) > 1:
+        results = list(pool.map(_count_range, jobs))
+    elif workers <= 1 or len(jobs) <= 1:
+        results = [_count_range(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_count_range, jobs))
+    counter = merge_counters(c for c, _ in results)
+    return counter, sum(n for _, n in results)
@@ -1,4 +1,19 @@
+"""
+Генерація випадкового тексту з символів заданого алфавіту (рівномірно або за частотами,
+наприклад з inf_list, який повертає analyze_text). Текст генерується великими блоками
+через NumPy, з відтворюваністю за seed, і може записуватися у файл потоково.
+
+Запуск:
+    python -m Middleware.random_symbols                          - приклад для трьох мов
+    python -m Middleware.random_symbols --lang uk --length 100000000 --seed 1 -o corpus.txt
+    python -m Middleware.random_symbols --weights results.jsonl --record "Українська (variant1)" -o corpus.txt
+"""
+import argparse
 import random
+import sys
+
+# NumPy не обов'язковий (без нього працює random.choices) і завантажується лише під час генерації
+from Middleware.streaming import load_numpy
 
 # Списки символів для кожної мови
 ukrainian_chars = "абвгдеєжзиіїйклмнопрстуфхцчшщьюяАБВГҐДЕЄЖЗИЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ " \
@@ -8,19 +23,123 @@ german_chars = "abcdefghijklmnopqrstuvwxyzäöüßABCDEFGHIJKLMNOPQRSTUVWXYZÄÖ
 english_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ " \
                 " ,.!?()"
 
+LANGUAGES = {"uk": ukrainian_chars, "de": german_chars, "en": english_chars}
+# Кількість символів, що генерується за один крок
+BLOCK_SIZE = 1 << 22
+
+
+def weights_from_inf_list(inf_list):
+    """Алфавіт і ваги з таблиці (символ, кількість, ймовірність)."""
+    return "".join(item[0] for item in inf_list), [item[1] for item in inf_list]
+
+
+def _numpy_blocks(chars, length, weights, seed, block_size):
+    np = load_numpy()
+    rng = np.random.default_rng(seed)
+    codes = np.array([ord(ch) for ch in chars], dtype="<u4")
+    if weights is not None:
+        cdf = np.cumsum(np.asarray(weights, dtype=np.float64))
+        cdf /= cdf[-1]
+    done = 0
+    while done < length:
+        size = min(block_size, length - done)
+        # Одне число з [0, 1) на символ: результат не залежить від розміру блоку
+        u = rng.random(size)
+        if weights is None:
+            idx = (u * len(codes)).astype(np.intp)
+        else:
+            idx = np.minimum(np.searchsorted(cdf, u, side="right"), len(codes) - 1)
+        yield codes[idx].tobytes().decode("utf-32-le")
+        done += size
+
+
+def _python_blocks(chars, length, weights, seed, block_size):
+    rng = random.Random(seed)
+    done = 0
+    while done < length:
+        size = min(block_size, length - done)
+        yield "".join(rng.choices(chars, weights=weights, k=size))
+        done += size
+
+
+def iter_random_text(language_chars, length, weights=None, seed=None, block_size=BLOCK_SIZE):
+    """
+    Повертає випадковий текст довжини length блоками до block_size символів.
+    weights - ваги символів (за замовчуванням рівномірно), seed - для відтворюваності.
+    """
+    if not language_chars:
+        raise ValueError("Алфавіт не може бути порожнім")
+    if weights is not None:
+        if len(weights) != len(language_chars):
+            raise ValueError("Кількість ваг не збігається з кількістю символів")
+        if sum(weights) <= 0 or min(weights) < 0:
+            raise ValueError("Ваги повинні бути невід'ємні і не всі нульові")
+    blocks = _numpy_blocks if load_numpy() is not None else _python_blocks
+    return blocks(language_chars, length, weights, seed, block_size)
+
+
 # Функція для генерації випадкового тексту з символами конкретної мови
-def generate_random_text(language_chars, length):
-    return ''.join(random.choice(language_chars) for _ in range(length))
-
-# Генерація тексту для кожної мови
-ukrainian_text = generate_random_text(ukrainian_chars, 1500)
-german_text = generate_random_text(german_chars, 1500)
-english_text = generate_random_text(english_chars, 1500)
-
-# Виведення результату
-print("Текст українською:")
-print(ukrainian_text)
-print("\nТекст німецькою:")
-print(german_text)
-print("\nТекст англійською:")
-print(english_text)
+def generate_random_text(language_chars, length, weights=None, seed=None):
+    return "".join(iter_random_text(language_chars, length, weights, seed))
+
+
+def write_random_text(path, language_chars, length, weights=None, seed=None, block_size=BLOCK_SIZE):
+    """Записує випадковий текст у файл ('-' - stdout) потоково; повертає кількість байтів."""
+    out = sys.stdout.buffer if path == "-" else open(path, "wb")
+    written = 0
+    try:
+        for block in iter_random_text(language_chars, length, weights, seed, block_size):
+            data = block.encode("utf-8")
+            out.write(data)
+            written += len(data)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+    return written
+
+
+def _load_weights(path, record=None):
+    from Middleware.results import read_jsonl
+
+    for item in read_jsonl(path):
+        if record is None or item["source"] == record:
+            return "".join(item["symbols"]), item["counts"]
+    raise SystemExit(f"Запис '{record}' не знайдено у файлі {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерація випадкового тексту")
+    parser.add_argument("--lang", choices=sorted(LANGUAGES), help="алфавіт мови (рівномірний розподіл)")
+    parser.add_argument("--weights", help="файл результатів JSON Lines: частоти символів з аналізу")
+    parser.add_argument("--record", help="підпис запису у файлі --weights (за замовчуванням перший)")
+    parser.add_argument("--length", type=int, default=1500, help="кількість символів")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", help="вихідний файл ('-' - stdout)")
+    args = parser.parse_args()
+
+    if args.lang is None and args.weights is None:
+        # Приклад: генерація тексту для кожної мови
+        print("Текст українською:")
+        print(generate_random_text(ukrainian_chars, args.length, seed=args.seed))
+        print("\nТекст німецькою:")
+        print(generate_random_text(german_chars, args.length, seed=args.seed))
+        print("\nТекст англійською:")
+        print(generate_random_text(english_chars, args.length, seed=args.seed))
+        return
+
+    if args.weights:
+        chars, weights = _load_weights(args.weights, args.record)
+    else:
+        chars, weights = LANGUAGES[args.lang], None
+    if args.output:
+        written = write_random_text(args.output, chars, args.length, weights, args.seed)
+        if args.output != "-":
+            print(f"Записано {args.length} символів ({written} байт) у файл {args.output}")
+    else:
+        print(generate_random_text(chars, args.length, weights, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Черга побудови графіків: опис графіка (spec) ставиться в чергу, а PNG малюються
+в окремих процесах з неінтерактивним бекендом Agg. Якщо опис не змінився
+з попереднього запуску і файл існує, графік не перемальовується.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from Middleware.instrument import stage
+
+# Файл з хешами вже намальованих графіків (у папці з зображеннями)
+MANIFEST_NAME = ".render_cache.json"
+
+
+def spec_hash(spec):
+    data = json.dumps(spec, ensure_ascii=False, sort_keys=True, default=list)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def render_spec(spec):
+    """
+    Малює стовпчикову діаграму за описом:
+    path, figsize, x, y, bar (параметри ax.bar), xlabel/ylabel/title (+ *_kw),
+    grid, xticks, bar_label, tight_layout, savefig (параметри savefig).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=spec.get("figsize", (8, 5)))
+    bars = ax.bar(spec["x"], spec["y"], **spec.get("bar", {}))
+    for name, setter in (("xlabel", ax.set_xlabel), ("ylabel", ax.set_ylabel), ("title", ax.set_title)):
+        if spec.get(name):
+            setter(spec[name], **spec.get(name + "_kw", {}))
+    if "grid" in spec:
+        ax.grid(**spec["grid"])
+    if "xticks" in spec:
+        plt.xticks(**spec["xticks"])
+    if "bar_label" in spec:
+        ax.bar_label(bars, **spec["bar_label"])
+    if spec.get("tight_layout", True):
+        fig.tight_layout()
+    fig.savefig(spec["path"], **spec.get("savefig", {}))
+    plt.close(fig)
+    return spec["path"]
+
+
+class PlotQueue:
+    """
+    Черга графіків, що рендеряться у пулі процесів; close() чекає завершення.
+    enabled=False - графіки не будуються (пул процесів і matplotlib не запускаються).
+    """
+
+    def __init__(self, workers=None, enabled=True):
+        self.workers = workers
+        self.enabled = enabled
+        self._pool = None
+        self._own_pool = True
+        self._pending = []  # (future, path, hash, message)
+        self._manifests = {}
+
+    def share_pool(self, pool):
+        """Малювати у вже створеному пулі (спільному з іншими етапами); close() його не закриває."""
+        self._pool = pool
+        self._own_pool = False
+
+    def _manifest(self, folder):
+        if folder not in self._manifests:
+            path = os.path.join(folder, MANIFEST_NAME)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._manifests[folder] = json.load(f)
+            except (OSError, ValueError):
+                self._manifests[folder] = {}
+        return self._manifests[folder]
+
+    def submit(self, spec, message=None):
+        """Ставить графік у чергу; message друкується після збереження файлу."""
+        if not self.enabled:
+            return
+        path = spec["path"]
+        with stage("plot", path):
+            folder = os.path.dirname(path) or "."
+            digest = spec_hash(spec)
+            if self._manifest(folder).get(os.path.basename(path)) == digest and os.path.exists(path):
+                print(f"Графік не змінився, пропуск: {os.path.abspath(path)}")
+                return
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            future = self._pool.submit(render_spec, spec)
+            self._pending.append((future, path, digest, message))
+
+    def wait(self):
+        """Чекає на всі графіки в черзі та оновлює хеші намальованих файлів."""
+        for future, path, digest, message in self._pending:
+            try:
+                with stage("plot_wait", path):
+                    future.result()
+            except Exception as e:
+                print(f"Помилка побудови графіка {path}: {e}")
+                continue
+            folder = os.path.dirname(path) or "."
+            self._manifest(folder)[os.path.basename(path)] = digest
+            if message:
+                print(message)
+        self._pending = []
+        for folder, manifest in self._manifests.items():
+            with open(os.path.join(folder, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    def close(self):
+        self.wait()
+        if self._pool is not None and self._own_pool:
+            self._pool.shutdown()
+        self._pool = None
+        self._own_pool = True
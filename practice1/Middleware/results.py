@@ -0,0 +1,191 @@
+"""
+Запис результатів аналізу: файли відкриваються один раз на весь запуск і пишуться
+через великий буфер. Крім текстового звіту підтримуються JSON Lines та
+стовпчиковий двійковий формат, які читаються без розбору тексту.
+
+Двійковий формат (.bin) - тека з окремим файлом <стовпець>.bin на кожне поле і meta.json:
+    n, H, I          - по одному значенню на запис (uint64, float64, float64);
+    label_offsets    - межі підписів записів у labels (uint64, записів + 1), labels - UTF-8;
+    symbol_offsets   - межі таблиць символів записів у codes/counts (uint64, записів + 1),
+    codes, counts    - коди символів (uint32) і кількості (uint64) усіх записів підряд.
+Усі числа - little-endian; стовпці завантажуються без копіювання через read_columns() (np.memmap).
+"""
+import json
+import os
+import shutil
+import sys
+from array import array
+
+FORMATS = ("text", "jsonl", "bin")
+BUFFER_SIZE = 1 << 20
+BIN_VERSION = 2
+# Стовпці двійкового формату: (назва, код типу array, тип NumPy)
+BIN_COLUMNS = (("n", "Q", "<u8"), ("H", "d", "<f8"), ("I", "d", "<f8"),
+               ("label_offsets", "Q", "<u8"), ("labels", "B", "u1"),
+               ("symbol_offsets", "Q", "<u8"), ("codes", "I", "<u4"), ("counts", "Q", "<u8"))
+
+
+def _le(values):
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def output_paths(path, formats):
+    """Шляхи файлів для кожного формату: текст - path, інші - з тим самим іменем."""
+    root = os.path.splitext(path)[0]
+    return {fmt: path if fmt == "text" else f"{root}.{fmt}" for fmt in formats}
+
+
+class ResultsWriter:
+    """
+    Буферизований запис результатів. Файли створюються (з очищенням) при першому записі,
+    тож екземпляр можна створити на рівні модуля; close() скидає буфери.
+    """
+
+    def __init__(self, path, formats=("text",), text_sep="\n", buffer_size=BUFFER_SIZE):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Невідомі формати результатів: {', '.join(sorted(unknown))}")
+        self.path = path
+        self.formats = tuple(formats)
+        self.text_sep = text_sep
+        self.buffer_size = buffer_size
+        self._files = None
+        self._columns = None
+
+    def _open(self):
+        self._files = {}
+        for fmt, path in output_paths(self.path, self.formats).items():
+            if fmt == "bin":
+                self._open_columns(path)
+            else:
+                self._files[fmt] = open(path, "w", encoding="utf-8", buffering=self.buffer_size)
+
+    def _open_columns(self, path):
+        # Тека перезаписується, як і файли інших форматів
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        os.makedirs(path)
+        self._columns = {name: open(os.path.join(path, f"{name}.bin"), "wb", buffering=self.buffer_size)
+                         for name, _, _ in BIN_COLUMNS}
+        self._bin_path = path
+        self._records = self._label_end = self._symbol_end = 0
+        self._columns["label_offsets"].write(_le(array("Q", [0])))
+        self._columns["symbol_offsets"].write(_le(array("Q", [0])))
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {"version": BIN_VERSION, "records": self._records, "symbols": self._symbol_end,
+                "label_bytes": self._label_end, "columns": [[name, dtype] for name, _, dtype in BIN_COLUMNS]}
+        with open(os.path.join(self._bin_path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @property
+    def wants_text(self):
+        return "text" in self.formats
+
+    def write(self, label, inf_list, n, H, I, report=None, **meta):
+        """
+        Записує результат одного аналізу: inf_list - список (символ, кількість, ймовірність),
+        report - готовий текстовий звіт, meta - додаткові поля для JSON Lines.
+        """
+        if self._files is None:
+            self._open()
+        files = self._files
+        if "text" in files and report is not None:
+            files["text"].write(report + self.text_sep)
+        if "jsonl" in files:
+            record = {"source": label, **meta, "n": n, "H": H, "I": I,
+                      "symbols": [ch for ch, _, _ in inf_list],
+                      "counts": [freq for _, freq, _ in inf_list]}
+            files["jsonl"].write(json.dumps(record, ensure_ascii=False) + "\n")
+        if self._columns is not None:
+            columns = self._columns
+            name = label.encode("utf-8")
+            self._records += 1
+            self._label_end += len(name)
+            self._symbol_end += len(inf_list)
+            columns["n"].write(_le(array("Q", [n])))
+            columns["H"].write(_le(array("d", [H])))
+            columns["I"].write(_le(array("d", [I])))
+            columns["labels"].write(name)
+            columns["label_offsets"].write(_le(array("Q", [self._label_end])))
+            columns["codes"].write(_le(array("I", [ord(ch) for ch, _, _ in inf_list])))
+            columns["counts"].write(_le(array("Q", [freq for _, freq, _ in inf_list])))
+            columns["symbol_offsets"].write(_le(array("Q", [self._symbol_end])))
+
+    def flush(self):
+        for f in (self._files or {}).values():
+            f.flush()
+        if self._columns is not None:
+            for f in self._columns.values():
+                f.flush()
+            self._write_meta()
+
+    def close(self):
+        for f in (self._files or {}).values():
+            f.close()
+        if self._columns is not None:
+            for f in self._columns.values():
+                f.close()
+            self._write_meta()
+        self._files = None
+        self._columns = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_jsonl(path):
+    """Повертає записи з файлу JSON Lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_meta(path):
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != BIN_VERSION:
+        raise ValueError("Тека не містить результатів цього формату")
+    return meta
+
+
+def read_columns(path):
+    """Стовпці двійкового формату: (словник назва -> np.memmap лише для читання, meta)."""
+    import numpy as np
+
+    meta = _read_meta(path)
+    columns = {}
+    for name, dtype in meta["columns"]:
+        file = os.path.join(path, f"{name}.bin")
+        size = os.path.getsize(file) // np.dtype(dtype).itemsize
+        columns[name] = np.memmap(file, dtype=dtype, mode="r", shape=(size,)) if size else np.empty(0, dtype)
+    return columns, meta
+
+
+def read_bin(path):
+    """Повертає записи двійкового формату як dict з полями source, n, H, I, symbols, counts."""
+    meta = _read_meta(path)
+    columns = {}
+    for name, typecode, _ in BIN_COLUMNS:
+        values = array(typecode)
+        with open(os.path.join(path, f"{name}.bin"), "rb") as f:
+            values.frombytes(f.read())
+        if sys.byteorder != "little":
+            values.byteswap()
+        columns[name] = values
+    labels = columns["labels"].tobytes()
+    for i in range(meta["records"]):
+        start, end = columns["symbol_offsets"][i], columns["symbol_offsets"][i + 1]
+        yield {"source": labels[columns["label_offsets"][i]:columns["label_offsets"][i + 1]].decode("utf-8"),
+               "n": columns["n"][i], "H": columns["H"][i], "I": columns["I"][i],
+               "symbols": [chr(c) for c in columns["codes"][start:end]],
+               "counts": list(columns["counts"][start:end])}
@@ -0,0 +1,164 @@
+"""
+Інкрементальна оцінка ентропії для потоку тексту:
+ковзне вікно останніх N символів та експоненційно згасаюча ентропія.
+Оновлення - O(1) на символ (без перерахунку Counter для кожного вікна).
+
+Запуск (моніторинг stdin): python -m Middleware.rolling [вікно] [крок]
+"""
+import sys
+from collections import deque
+from math import log2
+
+from Middleware.streaming import iter_text_chunks, symbol_stats
+
+# Порог перенормування ваг у згасаючій оцінці
+RENORM = 2.0 ** 64
+
+
+class WindowEntropy:
+    """Ентропія H та кількість інформації I в ковзному вікні останніх window символів."""
+
+    def __init__(self, window):
+        if window <= 0:
+            raise ValueError("Розмір вікна повинен бути > 0")
+        self.window = window
+        self.buf = deque()
+        self.counts = {}
+        # Таблиця c*log2(c), щоб оновлення суми не викликало log2
+        self._clogc = [0.0] + [c * log2(c) for c in range(1, window + 1)]
+        self._s = 0.0  # сума c*log2(c) по символах вікна
+        self._since_exact = 0
+
+    def update(self, text):
+        """Додає символи тексту; символи, що виходять за межі вікна, видаляються."""
+        buf, counts, t, window = self.buf, self.counts, self._clogc, self.window
+        s = self._s
+        for ch in text:
+            c = counts.get(ch, 0)
+            s += t[c + 1] - t[c]
+            counts[ch] = c + 1
+            buf.append(ch)
+            if len(buf) > window:
+                old = buf.popleft()
+                c = counts[old]
+                s += t[c - 1] - t[c]
+                if c == 1:
+                    del counts[old]
+                else:
+                    counts[old] = c - 1
+        self._s = s
+        # Періодично перераховуємо суму точно, щоб не накопичувалась похибка округлення
+        self._since_exact += len(text)
+        if self._since_exact >= window:
+            self._s = sum(t[c] for c in counts.values())
+            self._since_exact = 0
+
+    @property
+    def n(self):
+        return len(self.buf)
+
+    @property
+    def H(self):
+        n = len(self.buf)
+        if n == 0:
+            return 0.0
+        return max(0.0, log2(n) - self._s / n)
+
+    @property
+    def I(self):
+        return self.H * len(self.buf)
+
+    def inf_list(self):
+        """Таблиця (символ, кількість, ймовірність) для поточного вікна, як у analyze_text."""
+        return symbol_stats(self.counts, len(self.buf))[0]
+
+
+class DecayedEntropy:
+    """
+    Експоненційно згасаюча ентропія: символ, що надійшов k кроків тому, має вагу decay**k.
+    Замість множення всіх ваг на decay вага нового символу зростає в 1/decay разів.
+    """
+
+    def __init__(self, decay=0.999):
+        if not 0 < decay < 1:
+            raise ValueError("Коефіцієнт згасання повинен бути в (0, 1)")
+        self.decay = decay
+        self.counts = {}
+        self._total = 0.0
+        self._s = 0.0  # сума w*log2(w) по вагах символів
+        self._g = 1.0  # вага наступного символу
+
+    def update(self, text):
+        counts = self.counts
+        s, total, g, grow = self._s, self._total, self._g, 1.0 / self.decay
+        for ch in text:
+            c = counts.get(ch, 0.0)
+            new = c + g
+            s += new * log2(new) - (c * log2(c) if c else 0.0)
+            counts[ch] = new
+            total += g
+            g *= grow
+            if g > RENORM:
+                self._s, self._total, self._g = s, total, g
+                self._renormalize()
+                s, total, g = self._s, self._total, self._g
+        self._s, self._total, self._g = s, total, g
+
+    def _renormalize(self):
+        """Ділить усі ваги на поточну вагу нового символу (H при цьому не змінюється)."""
+        k = 1.0 / self._g
+        for ch in self.counts:
+            self.counts[ch] *= k
+        self._total *= k
+        self._s = sum(w * log2(w) for w in self.counts.values() if w > 0)
+        self._g = 1.0
+
+    @property
+    def n(self):
+        """Ефективна кількість символів (сума ваг у масштабі останнього символу)."""
+        return self._total / (self._g * self.decay)
+
+    @property
+    def H(self):
+        if self._total <= 0:
+            return 0.0
+        return max(0.0, log2(self._total) - self._s / self._total)
+
+    @property
+    def I(self):
+        return self.H * self.n
+
+
+def monitor_stream(stream, window=4096, step=1024, decay=None):
+    """
+    Читає бінарний потік і кожні step символів повертає (позиція, H вікна, I вікна, H згасаюча).
+    decay за замовчуванням відповідає середній "пам'яті" в одне вікно.
+    """
+    win = WindowEntropy(window)
+    dec = DecayedEntropy(decay if decay is not None else 1.0 - 1.0 / window)
+    pos = 0
+    pending = ""
+    for chunk in iter_text_chunks(stream, chunk_size=step):
+        pending += chunk
+        while len(pending) >= step:
+            part, pending = pending[:step], pending[step:]
+            win.update(part)
+            dec.update(part)
+            pos += step
+            yield pos, win.H, win.I, dec.H
+    if pending:
+        win.update(pending)
+        dec.update(pending)
+        yield pos + len(pending), win.H, win.I, dec.H
+
+
+def main():
+    window = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    step = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    print("позиція | H вікна | I вікна | H згасаюча")
+    for pos, H, I, H_decay in monitor_stream(sys.stdin.buffer, window, step):
+        print(f"{pos} | {H:.4f} | {I:.1f} | {H_decay:.4f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
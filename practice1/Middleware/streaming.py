@@ -0,0 +1,147 @@
+import codecs
+import sys
+from collections import Counter
+from math import log2
+
+# NumPy необов'язковий (без нього працює звичайний Counter) і завантажується
+# лише при першому великому тексті, щоб не сповільнювати запуск скриптів
+np = None
+_numpy_checked = False
+
+# Розмір блоку читання (у байтах) для потокового аналізу
+CHUNK_SIZE = 1 << 20
+# З якої довжини тексту вмикається підрахунок через NumPy
+NUMPY_THRESHOLD = 1 << 16
+# Скільки символів перетворюється в масив кодів за один раз (обмежує пам'ять)
+NUMPY_BLOCK = 1 << 22
+# З якого розміру алфавіту ентропія рахується векторно
+NUMPY_SYMBOLS_THRESHOLD = 4096
+
+
+def iter_text_chunks(stream, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """
+    Читає бінарний потік блоками фіксованого розміру і повертає декодовані шматки тексту.
+    Інкрементальний декодер зберігає неповні багатобайтові послідовності UTF-8
+    на межі блоків до наступного читання.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        chunk = decoder.decode(block)
+        if chunk:
+            yield chunk
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def load_numpy():
+    """Імпортує NumPy при першому виклику; повертає модуль або None, якщо його не встановлено."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+def _first_seen(codes, new):
+    """Коди з new у порядку їх першої появи в масиві codes."""
+    remaining = set(new.tolist())
+    order = []
+    start, step = 0, 4096
+    # Переглядаємо префікси зростаючої довжини: нові символи зазвичай з'являються рано
+    while remaining:
+        values, first = np.unique(codes[start:start + step], return_index=True)
+        found = sorted((f, v) for v, f in zip(values.tolist(), first.tolist()) if v in remaining)
+        order.extend(v for _, v in found)
+        remaining.difference_update(v for _, v in found)
+        start += step
+        step *= 2
+    return order
+
+
+def count_text_numpy(text, block=NUMPY_BLOCK):
+    """
+    Рахує символи через масив кодів Unicode та np.bincount.
+    Символи впорядковуються за першою появою, тож результат дорівнює Counter(text).
+    """
+    load_numpy()
+    totals = np.zeros(0, dtype=np.int64)
+    order = []
+    for start in range(0, len(text), block):
+        codes = np.frombuffer(text[start:start + block].encode("utf-32-le", "surrogatepass"),
+                              dtype=np.uint32)
+        counts = np.bincount(codes)
+        if len(counts) > len(totals):
+            totals = np.concatenate([totals, np.zeros(len(counts) - len(totals), dtype=np.int64)])
+        present = np.flatnonzero(counts)
+        new = present[totals[present] == 0]
+        if len(new):
+            order.extend(_first_seen(codes, new))
+        totals[:len(counts)] += counts
+    return Counter({chr(code): int(totals[code]) for code in order})
+
+
+def count_text(text):
+    """Рахує символи тексту; для великих текстів автоматично використовує NumPy."""
+    if len(text) >= NUMPY_THRESHOLD and load_numpy() is not None:
+        return count_text_numpy(text)
+    return Counter(text)
+
+
+def entropy_numpy(counts, n):
+    """Векторне обчислення ентропії H за масивом кількостей."""
+    load_numpy()
+    p = np.asarray(counts, dtype=np.float64) / n
+    p = p[p > 0]
+    return float(-np.sum(p * np.log2(p)))
+
+
+def merge_counters(counters):
+    """Об'єднує часткові лічильники у порядку їх надходження."""
+    total = Counter()
+    for counter in counters:
+        total.update(counter)
+    return total
+
+
+def count_stream(stream, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """Рахує символи в бінарному потоці, не тримаючи весь текст у пам'яті."""
+    counter = Counter()
+    n = 0
+    for chunk in iter_text_chunks(stream, chunk_size, encoding):
+        counter.update(count_text(chunk))
+        n += len(chunk)
+    return counter, n
+
+
+def count_file(path, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """Рахує символи у файлі (або у stdin, якщо path == '-')."""
+    if path == "-":
+        return count_stream(sys.stdin.buffer, chunk_size, encoding)
+    with open(path, "rb") as f:
+        return count_stream(f, chunk_size, encoding)
+
+
+def symbol_stats(counter, n, reverse=False):
+    """
+    Повертає (inf_list, H, I) за лічильником символів.
+    Результат збігається з обчисленням через Counter(text) для того ж тексту.
+    """
+    if n == 0:
+        return [], 0.0, 0.0
+    inf_list = [(ch, freq, freq / n) for ch, freq in counter.items()]
+    inf_list.sort(key=lambda x: x[1], reverse=reverse)
+
+    if len(inf_list) >= NUMPY_SYMBOLS_THRESHOLD and load_numpy() is not None:
+        H = entropy_numpy([freq for _, freq, _ in inf_list], n)
+    else:
+        H = -sum(p * log2(p) for _, _, p in inf_list if p > 0)
+    I = H * n
+    return inf_list, H, I
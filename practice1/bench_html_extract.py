@@ -0,0 +1,57 @@
+"""
+Бенчмарк способів витягування тексту з HTML: швидкість (МБ/с) та розбіжності
+з еталонним BeautifulSoup на папці збережених сторінок.
+
+Запуск: python bench_html_extract.py [папка_з_html] [повторів]
+"""
+import difflib
+import glob
+import os
+import sys
+import time
+
+from Middleware.html_extract import EXTRACTORS
+
+REFERENCE = "bs4"
+
+
+def load_fixtures(folder):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(folder, "*.htm*"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def main():
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join("fixtures", "html")
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    pages = load_fixtures(folder)
+    if not pages:
+        print(f"У папці '{folder}' немає HTML-файлів!")
+        return
+    size_mb = sum(len(html.encode("utf-8")) for html in pages.values()) / 2**20
+    print(f"Сторінок: {len(pages)}, обсяг: {size_mb * 1024:.1f} КБ, повторів: {repeats}")
+
+    reference = {name: EXTRACTORS[REFERENCE](html) for name, html in pages.items()}
+
+    print(f"{'спосіб':>8} | {'МБ/с':>8} | {'розбіжних сторінок':>18}")
+    for backend, extract in EXTRACTORS.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            results = {name: extract(html) for name, html in pages.items()}
+        elapsed = time.perf_counter() - start
+
+        diffs = [name for name in pages if results[name] != reference[name]]
+        print(f"{backend:>8} | {size_mb * repeats / elapsed:8.2f} | {len(diffs):18}")
+        for name in diffs:
+            diff = difflib.unified_diff(reference[name].splitlines(), results[name].splitlines(),
+                                        REFERENCE, backend, n=0, lineterm="")
+            print(f"   {name}:")
+            for line in list(diff)[2:12]:
+                print(f"      {line}")
+
+
+if __name__ == "__main__":
+    main()
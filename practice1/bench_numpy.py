@@ -0,0 +1,90 @@
+"""
+Таблиця часу підрахунку символів: Counter (чистий Python) проти NumPy
+для текстів від 1 КБ до заданого максимуму (за замовчуванням 1 ГБ), а також для
+текстів з великим алфавітом. Таблиці символів обох шляхів повинні збігатися,
+а векторна ентропія H (entropy_numpy) - з чисто Python-обчисленням у межах 1e-12,
+інакше код виходу 1.
+
+Запуск: python bench_numpy.py [макс_розмір_МБ]
+"""
+import json
+import sys
+import time
+from collections import Counter
+from math import log2
+
+from Middleware.streaming import count_text_numpy, entropy_numpy, load_numpy
+
+# Допустима розбіжність H між шляхами Counter і NumPy
+TOLERANCE = 1e-12
+# Розміри великих алфавітів і довжина таких текстів
+WIDE_ALPHABETS = (20_000, 60_000)
+WIDE_SIZE = 1 << 22
+
+
+def corpus_text(size, source="texts.json"):
+    with open(source, "r", encoding="utf-8") as f:
+        texts = json.load(f)
+    block = "\n".join(t for variants in texts.values() for t in variants.values())
+    return (block * (size // len(block) + 1))[:size]
+
+
+def wide_text(symbols, size, seed=1):
+    """Текст з великим алфавітом (symbols символів CJK і далі за Unicode) і розподілом Ціпфа."""
+    np = load_numpy()
+    rng = np.random.default_rng(seed)
+    codes = np.arange(0x4E00, 0x4E00 + symbols, dtype="<u4")
+    codes[codes >= 0xD800] += 0x800  # сурогати не є символами
+    weights = 1 / np.arange(1, symbols + 1)
+    idx = rng.choice(symbols, size=size, p=weights / weights.sum())
+    return codes[idx].tobytes().decode("utf-32-le")
+
+
+def entropy_python(counter, n):
+    """Ентропія чисто Python-шляхом (як у symbol_stats для малих алфавітів)."""
+    return -sum(p * log2(p) for p in (freq / n for freq in counter.values()) if p > 0)
+
+
+def check(text, label):
+    """Порівнює таблицю символів і H шляхів Counter та NumPy; повертає рядок таблиці."""
+    size = len(text)
+    expected, t_py = timed(Counter, text)
+    counter, t_np = timed(count_text_numpy, text)
+    if list(counter.items()) != list(expected.items()):
+        print(f"Розбіжність таблиці символів для {label}!")
+        sys.exit(1)
+    dH = abs(entropy_numpy(list(counter.values()), size) - entropy_python(expected, size))
+    if dH > TOLERANCE:
+        print(f"Розбіжність H для {label}: {dH:.1e} > {TOLERANCE:.0e}!")
+        sys.exit(1)
+    return f"{label:>22} | {t_py:11.4f} | {t_np:10.4f} | {t_py / t_np:11.2f} | {dH:8.1e}"
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    np = load_numpy()
+    if np is None:
+        print("NumPy не встановлено!")
+        return
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    sizes = []
+    size = 1024
+    while size <= max_mb * 2**20:
+        sizes.append(size)
+        size *= 16
+
+    print(f"{'символів':>22} | {'Counter, с':>11} | {'NumPy, с':>10} | {'прискорення':>11} | {'|ΔH|':>8}")
+    for size in sizes:
+        print(check(corpus_text(size), str(size)))
+    # Великі алфавіти: тут symbol_stats перемикається на entropy_numpy
+    for symbols in WIDE_ALPHABETS:
+        print(check(wide_text(symbols, WIDE_SIZE), f"{WIDE_SIZE} ({symbols} симв.)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Бенчмарк масштабування паралельного підрахунку символів (1..N процесів)
+на корпусі texts.json, розмноженому до заданого розміру.
+
+Запуск: python bench_parallel.py [розмір_МБ] [макс_процесів]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from Middleware.parallel import WORKERS, count_file_parallel
+from Middleware.streaming import count_file, symbol_stats
+
+
+def build_corpus(path, size_mb, source="texts.json"):
+    """Записує у файл тексти з texts.json, повторені до потрібного розміру."""
+    with open(source, "r", encoding="utf-8") as f:
+        texts = json.load(f)
+    block = "\n".join(t for variants in texts.values() for t in variants.values()).encode("utf-8")
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, "wb") as f:
+        while written < target:
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else WORKERS
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        size = build_corpus(path, size_mb)
+        print(f"Корпус: {size / 2**20:.1f} МБ")
+
+        start = time.perf_counter()
+        serial = symbol_stats(*count_file(path))
+        base = time.perf_counter() - start
+        print(f"{'процесів':>9} | {'час, с':>8} | {'МБ/с':>8} | {'прискорення':>11}")
+        print(f"{'serial':>9} | {base:8.2f} | {size / 2**20 / base:8.1f} | {1.0:11.2f}")
+
+        for workers in range(1, max_workers + 1):
+            start = time.perf_counter()
+            result = symbol_stats(*count_file_parallel(path, workers))
+            elapsed = time.perf_counter() - start
+            if result != serial:
+                print(f"Розбіжність результатів для {workers} процесів!")
+                sys.exit(1)
+            print(f"{workers:9} | {elapsed:8.2f} | {size / 2**20 / elapsed:8.1f} | {base / elapsed:11.2f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Перевірка часу запуску скриптів: імпорт 1.py, 2.py та Middleware/random_symbols.py
+(без виконання main) у новому процесі не повинен перевищувати бюджет і не повинен
+завантажувати важкі залежності - вони імпортуються лише там, де справді потрібні.
+
+Запуск:
+    python check_startup.py                  - бюджет за замовчуванням
+    python check_startup.py --budget 150 --runs 7
+Код виходу 1, якщо хоча б одна перевірка не пройдена; ті самі перевірки виконує tests/test_startup.py.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Скрипти та модулі, імпорт яких не повинен виконувати роботу
+SCRIPTS = ("1.py", "2.py", os.path.join("Middleware", "random_symbols.py"))
+# Модулі, яких не повинно бути в sys.modules одразу після імпорту скрипта
+HEAVY = ("numpy", "matplotlib", "requests", "bs4", "aiohttp")
+# Бюджет часу імпорту скрипта (мс, медіана)
+BUDGET_MS = 150
+RUNS = 5
+
+# Виконується в окремому процесі: скрипт завантажується як модуль, main() не викликається
+_PROBE = """
+import json, runpy, sys, time
+start = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="startup_check")
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in sys.argv[2].split(",") if name in sys.modules]
+print(json.dumps({"ms": elapsed, "heavy": heavy}))
+"""
+
+
+def probe(script, heavy=HEAVY):
+    """Час імпорту скрипта (мс) у новому процесі і список завантажених важких модулів."""
+    folder = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-c", _PROBE, script, ",".join(heavy)],
+                            cwd=folder, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return data["ms"], data["heavy"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перевірка часу запуску скриптів")
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="бюджет імпорту, мс")
+    parser.add_argument("--runs", type=int, default=RUNS, help="кількість запусків для медіани")
+    args = parser.parse_args()
+
+    failed = False
+    for script in SCRIPTS:
+        times, heavy = [], set()
+        for _ in range(max(1, args.runs)):
+            ms, loaded = probe(script)
+            times.append(ms)
+            heavy.update(loaded)
+        median = statistics.median(times)
+        ok = median <= args.budget and not heavy
+        failed = failed or not ok
+        status = "OK" if ok else "ПОМИЛКА"
+        print(f"{script:<28} {median:8.1f} мс (бюджет {args.budget:.0f} мс)  {status}")
+        if heavy:
+            print(f"       завантажено під час імпорту: {', '.join(sorted(heavy))}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
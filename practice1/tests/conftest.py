@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Тести імпортують Middleware так само, як скрипти, запущені з practice1
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
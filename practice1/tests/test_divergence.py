@@ -0,0 +1,96 @@
+"""Попарні дивергенції з розрідженого індексу збігаються з прямим щільним обчисленням."""
+import numpy as np
+import pytest
+
+from Middleware.divergence import ALPHA, METRICS, load_symbol_counts, pairwise, symbol_matrix
+from Middleware.results import ResultsWriter, output_paths
+from Middleware.streaming import count_text, symbol_stats
+
+TEXTS = ["abracadabra", "Привіт, світе!", "aaaa", "😀 emoji 😀", "xyz xyz", "абвгґдеє", "a"]
+
+
+def records(texts):
+    result = []
+    for i, text in enumerate(texts):
+        counts = count_text(text)
+        result.append({"source": f"t{i}", "symbols": list(counts), "counts": list(counts.values())})
+    return result
+
+
+def dense(records):
+    """Щільна матриця кількостей (документи x символи) по всіх символах."""
+    alphabet = sorted({ch for record in records for ch in record["symbols"]})
+    matrix = np.zeros((len(records), len(alphabet)))
+    for i, record in enumerate(records):
+        for ch, count in zip(record["symbols"], record["counts"]):
+            matrix[i, alphabet.index(ch)] += count
+    return matrix
+
+
+def brute_force(C, alpha=ALPHA):
+    P = C / C.sum(axis=1, keepdims=True)
+    Q = (C + alpha) / (C.sum(axis=1, keepdims=True) + alpha * C.shape[1])
+    logP = np.log2(P, out=np.zeros_like(P), where=P > 0)
+    H = -(P * logP).sum(axis=1)
+    ce = -P @ np.log2(Q).T
+    M = (P[:, None, :] + P[None, :, :]) / 2
+    HM = -(M * np.log2(M, out=np.zeros_like(M), where=M > 0)).sum(axis=2)
+    return {"cross_entropy": ce, "kl": ce - H[:, None], "js": HM - (H[:, None] + H[None, :]) / 2}
+
+
+@pytest.mark.parametrize("block", [1, 3, 256])
+def test_matches_dense(tmp_path, block):
+    C = dense(records(TEXTS))
+    expected = brute_force(C)
+    _, _, counts = symbol_matrix(records(TEXTS))
+    result = pairwise(counts, str(tmp_path), block=block, workers=2)
+    for name in METRICS:
+        assert np.allclose(result[name], expected[name], atol=1e-5), name
+    # Щільна матриця на вході дає той самий результат
+    again = pairwise(C, str(tmp_path / "dense"), block=block, workers=1)
+    for name in METRICS:
+        assert np.allclose(again[name], result[name], atol=1e-6), name
+
+
+def test_duplicate_symbols_are_combined(tmp_path):
+    duplicated = [{"source": "d", "symbols": ["a", "b", "a"], "counts": [1, 2, 3]},
+                  {"source": "e", "symbols": ["b"], "counts": [5]}]
+    _, symbols, counts = symbol_matrix(duplicated)
+    assert symbols == ["a", "b"]
+    assert counts.indptr.tolist() == [0, 2, 3]
+    assert counts.indices.tolist() == [0, 1, 1] and counts.counts.tolist() == [4, 2, 5]
+
+
+def test_max_symbols(tmp_path):
+    recs = records(TEXTS)
+    _, symbols, counts = symbol_matrix(recs, max_symbols=5)
+    assert len(symbols) == 5 and symbols[-1] == ""
+    assert counts.n_symbols == 5
+    # Сума кількостей кожного документа не змінюється
+    totals = np.add.reduceat(counts.counts, counts.indptr[:-1])
+    assert totals.tolist() == [len(text) for text in TEXTS]
+    C = np.zeros((len(TEXTS), 5))
+    rows = np.repeat(np.arange(len(TEXTS)), np.diff(counts.indptr))
+    C[rows, counts.indices] = counts.counts
+    result = pairwise(counts, str(tmp_path), metrics=("kl",))
+    assert np.allclose(result["kl"], brute_force(C)["kl"], atol=1e-5)
+
+
+def test_bin_input(tmp_path):
+    root = str(tmp_path / "results.txt")
+    with ResultsWriter(root, ("jsonl", "bin")) as writer:
+        for i, text in enumerate(TEXTS):
+            inf_list, H, I = symbol_stats(count_text(text), len(text))
+            writer.write(f"t{i}", inf_list, len(text), H, I)
+    paths = output_paths(root, ("jsonl", "bin"))
+    labels, symbols, counts = load_symbol_counts(paths["bin"])
+    jsonl = load_symbol_counts(paths["jsonl"])
+    assert labels == jsonl[0] == [f"t{i}" for i in range(len(TEXTS))]
+    assert symbols == jsonl[1]
+    for field in ("indptr", "indices", "counts"):
+        assert np.array_equal(getattr(counts, field), getattr(jsonl[2], field))
+
+
+def test_empty_document_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        pairwise(np.array([[1.0, 2.0], [0.0, 0.0]]), str(tmp_path))
@@ -0,0 +1,133 @@
+"""fetch_all / run_batch проти локального HTTP-сервера."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+
+from Middleware.fetch import run_batch
+from Middleware.instrument import PROFILER
+from Middleware.parallel import process_pool
+
+PAGE = "<html><body><p>Привіт, світ</p><script>var x = 1;</script></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(server.slow)
+            elif self.path.startswith("/missing"):
+                self.send_error(404)
+                return
+            else:
+                time.sleep(server.delay)
+            body = PAGE.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.active = httpd.max_active = 0
+    httpd.delay = 0.0
+    httpd.slow = 2.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def collect(urls, **kwargs):
+    results = {}
+    run_batch(urls, lambda url, counter, n, error: results.setdefault(url, (counter, n, error)),
+              workers=1, **kwargs)
+    return results
+
+
+def test_every_url_delivered(server):
+    urls = [f"{server.base}/page/{i}" for i in range(20)]
+    results = collect(urls)
+    assert sorted(results) == sorted(urls)
+    for counter, n, error in results.values():
+        assert error is None
+        assert n == sum(counter.values()) > 0
+        assert counter["і"] == 2
+        assert "x" not in counter  # вміст <script> не входить у текст
+
+
+def test_404_reported_as_error(server):
+    ok, missing = f"{server.base}/page/1", f"{server.base}/missing"
+    results = collect([ok, missing])
+    assert results[ok][2] is None
+    counter, n, error = results[missing]
+    assert counter is None and n == 0
+    assert isinstance(error, aiohttp.ClientResponseError) and error.status == 404
+
+
+def test_per_host_limit(server):
+    server.delay = 0.1
+    urls = [f"{server.base}/page/{i}" for i in range(12)]
+    results = collect(urls, per_host=3)
+    assert len(results) == 12
+    assert all(error is None for _, _, error in results.values())
+    assert server.max_active == 3
+
+
+def test_read_timeout(server):
+    slow, ok = f"{server.base}/slow", f"{server.base}/page/1"
+    start = time.perf_counter()
+    results = collect([slow, ok], timeout=0.3)
+    assert time.perf_counter() - start < server.slow
+    assert isinstance(results[slow][2], TimeoutError)
+    assert results[ok][2] is None
+
+
+def test_failures_recorded_in_profiler(server):
+    ok, missing, slow = f"{server.base}/page/1", f"{server.base}/missing", f"{server.base}/slow"
+    PROFILER.enable()
+    try:
+        collect([ok, missing, slow], timeout=0.3)
+        events = list(PROFILER.events)
+        summary = {name: count for name, count, *_ in PROFILER.summary()}
+    finally:
+        PROFILER.disable()
+        PROFILER.events.clear()
+    errors = sorted(event["item"] for event in events if event["name"] == "fetch error")
+    assert len(errors) == 2
+    assert errors[0] == f"{missing} (HTTP 404)"
+    # aiohttp повідомляє таймаут читання підкласом TimeoutError
+    assert errors[1].startswith(f"{slow} (") and "TimeoutError" in errors[1]
+    assert [event["item"] for event in events if event["name"] == "fetch"] == [ok]
+    assert summary["fetch error"] == 2
+
+
+def test_shared_pool(server):
+    urls = [f"{server.base}/page/{i}" for i in range(5)]
+    results = {}
+    with process_pool(2) as pool:
+        run_batch(urls, lambda url, counter, n, error: results.setdefault(url, error), pool=pool)
+        # Пул не закривається fetch_all і придатний для наступних етапів
+        assert pool.submit(len, "abc").result() == 3
+    assert sorted(results) == sorted(urls) and not any(results.values())
@@ -0,0 +1,42 @@
+"""HttpCache: розмір записів у байтах і оновлення валідаторів після 304."""
+import json
+
+from Middleware.http_cache import HttpCache
+
+TEXT = "Привіт, світ! " * 100
+
+
+def test_size_counts_utf8_bytes(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache.sqlite"))
+    body = TEXT.encode("utf-8")
+    inf_list = [["П", 100, 0.1], ["р", 100, 0.1]]
+    cache.store("u", {}, body, TEXT)
+    cache.store_inf_list("u", inf_list)
+    size = cache.db.execute("SELECT size, body FROM entries").fetchone()
+    expected = (len(size[1]) + len(TEXT.encode("utf-8"))
+                + len(json.dumps(inf_list, ensure_ascii=False).encode("utf-8")))
+    assert size[0] == expected
+    cache.close()
+
+
+def test_byte_limit_evicts_non_ascii_pages(tmp_path):
+    one = len(TEXT.encode("utf-8"))
+    # Ліміт вміщує два записи за кількістю символів, але лише один за байтами
+    cache = HttpCache(str(tmp_path / "cache.sqlite"), max_bytes=2 * len(TEXT) + 200)
+    cache.store("a", {}, b"", TEXT)
+    cache.store("b", {}, b"", TEXT)
+    assert one > len(TEXT) + 200
+    assert cache.get("a") is None and cache.get("b") is not None
+    cache.close()
+
+
+def test_touch_refreshes_validators(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache.sqlite"))
+    cache.store("u", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"", "x")
+    cache.touch("u", {"ETag": '"v2"'})
+    entry = cache.get("u")
+    assert entry["etag"] == '"v2"'
+    assert entry["last_modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    cache.touch("u")
+    assert cache.get("u")["etag"] == '"v2"'
+    cache.close()
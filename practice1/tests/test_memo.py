@@ -0,0 +1,75 @@
+"""Кеш результатів за хешем вмісту та спільне LRU-витіснення."""
+import sqlite3
+from collections import Counter
+
+from Middleware.http_cache import HttpCache
+from Middleware.memo import MemoStore
+from Middleware.parallel import count_texts_parallel
+
+
+def test_hit_returns_same_counter(tmp_path):
+    memo = MemoStore(str(tmp_path / "memo.sqlite"))
+    items = [("a", "абвгґ" * 10), ("b", "hello")]
+    first = list(memo.count_texts(items, lambda misses: count_texts_parallel(misses, 1)))
+    second = list(memo.count_texts(items, lambda misses: []))
+    assert sorted(first) == sorted(second)
+    assert list(dict((k, c) for k, c, _ in second)["a"].items()) == list(Counter("абвгґ" * 10).items())
+    assert (memo.hits, memo.misses) == (2, 2)
+    memo.close()
+
+
+def test_lru_eviction(tmp_path):
+    memo = MemoStore(str(tmp_path / "memo.sqlite"), max_bytes=10**9)
+    texts = [("".join(chr(0x400 + (i * 7 + j) % 300) for j in range(3000))) for i in range(4)]
+    keys = [memo.text_key(text) for text in texts]
+    for key, text in zip(keys, texts):
+        memo.put(key, Counter(text), len(text))
+    memo.get(keys[0])  # keys[0] тепер використано найпізніше
+    size = memo.db.execute("SELECT MAX(size) FROM results").fetchone()[0]
+    memo.max_bytes = 2 * size
+    memo.put(keys[3], Counter(texts[3]), len(texts[3]))
+    left = {row[0] for row in memo.db.execute("SELECT key FROM results")}
+    assert left == {keys[0], keys[3]}
+    memo.close()
+
+
+def test_old_schema_still_works(tmp_path):
+    path = str(tmp_path / "memo.sqlite")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE results (key TEXT PRIMARY KEY, counts BLOB, n INTEGER, H REAL, I REAL,"
+               " size INTEGER, accessed REAL)")
+    db.commit()
+    db.close()
+    memo = MemoStore(path)
+    memo.put("k", Counter("aab"), 3)
+    assert memo.get("k") == (Counter("aab"), 3)
+    memo.close()
+
+
+def test_http_cache_eviction(tmp_path):
+    cache = HttpCache(str(tmp_path / "http.sqlite"), max_bytes=10**9)
+    for i in range(3):
+        cache.store(f"http://x/{i}", {}, bytes(range(256)) * 20, "текст" * 100)
+    size = cache.db.execute("SELECT MAX(size) FROM entries").fetchone()[0]
+    cache.max_bytes = size
+    cache.store("http://x/3", {}, bytes(range(256)) * 20, "текст" * 100)
+    assert [row[0] for row in cache.db.execute("SELECT url FROM entries")] == ["http://x/3"]
+    cache.close()
+
+
+def test_partial_hits_keep_input_order(tmp_path):
+    memo = MemoStore(str(tmp_path / "memo.sqlite"))
+    items = [(i, "текст " * (i + 1)) for i in range(6)]
+    list(memo.count_texts(items[1::2], lambda misses: count_texts_parallel(misses, 1)))
+    seen = []
+
+    def count_many(misses):
+        seen.extend(key for key, _ in misses)
+        # Порядок результатів count_many не має значення
+        return reversed(count_texts_parallel(misses, 1))
+
+    result = list(memo.count_texts(items, count_many))
+    assert [key for key, _, _ in result] == [key for key, _ in items]
+    assert [key[0] for key in seen] == [0, 2, 4]
+    assert all(counter == Counter(text) and n == len(text) for (_, counter, n), (_, text) in zip(result, items))
+    memo.close()
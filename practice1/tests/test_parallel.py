@@ -0,0 +1,28 @@
+"""Пули процесів і паралельний підрахунок символів."""
+import multiprocessing
+import threading
+from collections import Counter
+
+import pytest
+
+from Middleware.parallel import count_texts_parallel, iter_count_texts, process_pool
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="лише для методу fork")
+def test_fork_pool_starts_all_workers():
+    with process_pool(3) as pool:
+        # Усі процеси вже запущені, поки в процесі немає інших потоків
+        assert len(pool._processes) == 3
+        thread = threading.Thread(target=lambda: None)
+        thread.start()
+        thread.join()
+        list(pool.map(len, ["a"] * 20))
+        assert len(pool._processes) == 3
+
+
+def test_iter_count_texts_in_order():
+    items = [(i, "абв" * i) for i in range(1, 8)]
+    with process_pool(2) as pool:
+        result = list(iter_count_texts(items, pool))
+    assert result == [(i, Counter(text), len(text)) for i, text in items]
+    assert result == count_texts_parallel(items, workers=2)
@@ -0,0 +1,50 @@
+"""ResultsWriter: JSON Lines і стовпчиковий двійковий формат читаються назад без втрат."""
+import numpy as np
+
+from Middleware.results import ResultsWriter, output_paths, read_bin, read_columns, read_jsonl
+from Middleware.streaming import count_text, symbol_stats
+
+FORMATS = ("text", "jsonl", "bin")
+TEXTS = {"uk": "Привіт, світе! Ґанок.", "emoji": "😀😀 a\r\nb", "empty": ""}
+
+
+def write_all(path, formats):
+    expected = []
+    with ResultsWriter(str(path), formats) as writer:
+        for label, text in TEXTS.items():
+            inf_list, H, I = symbol_stats(count_text(text), len(text))
+            writer.write(label, inf_list, len(text), H, I, report=f"{label}: {H}")
+            expected.append({"source": label, "n": len(text), "H": H, "I": I,
+                             "symbols": [ch for ch, _, _ in inf_list], "counts": [c for _, c, _ in inf_list]})
+    return expected
+
+
+def test_jsonl_and_bin_round_trip(tmp_path):
+    paths = output_paths(str(tmp_path / "results.txt"), FORMATS)
+    expected = write_all(tmp_path / "results.txt", FORMATS)
+    jsonl = [{key: record[key] for key in expected[0]} for record in read_jsonl(paths["jsonl"])]
+    assert jsonl == expected
+    assert list(read_bin(paths["bin"])) == expected
+
+
+def test_columns(tmp_path):
+    expected = write_all(tmp_path / "results.txt", ("bin",))
+    columns, meta = read_columns(output_paths(str(tmp_path / "results.txt"), ("bin",))["bin"])
+    assert meta["records"] == len(expected)
+    assert isinstance(columns["counts"], np.memmap)
+    assert columns["n"].tolist() == [record["n"] for record in expected]
+    assert np.allclose(columns["H"], [record["H"] for record in expected])
+    offsets = columns["symbol_offsets"]
+    assert offsets[0] == 0 and offsets[-1] == len(columns["codes"]) == len(columns["counts"])
+    first = expected[0]
+    assert "".join(map(chr, columns["codes"][offsets[0]:offsets[1]])) == "".join(first["symbols"])
+    labels = bytes(columns["labels"])
+    assert labels[columns["label_offsets"][1]:columns["label_offsets"][2]].decode("utf-8") == "emoji"
+
+
+def test_rewrite_replaces_previous_run(tmp_path):
+    write_all(tmp_path / "results.txt", ("bin",))
+    path = output_paths(str(tmp_path / "results.txt"), ("bin",))["bin"]
+    with ResultsWriter(str(tmp_path / "results.txt"), ("bin",)) as writer:
+        writer.write("one", [("a", 2, 1.0)], 2, 0.0, 0.0)
+    assert [record["source"] for record in read_bin(path)] == ["one"]
@@ -0,0 +1,17 @@
+"""Імпорт скриптів вкладається в бюджет часу і не завантажує важких залежностей."""
+import statistics
+
+import pytest
+
+from check_startup import BUDGET_MS, RUNS, SCRIPTS, probe
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_startup(script):
+    times, heavy = [], set()
+    for _ in range(RUNS):
+        ms, loaded = probe(script)
+        times.append(ms)
+        heavy.update(loaded)
+    assert not heavy, f"{script} під час імпорту завантажує: {', '.join(sorted(heavy))}"
+    assert statistics.median(times) <= BUDGET_MS
@@ -0,0 +1,36 @@
+"""symbol_stats: векторний шлях NumPy для великих алфавітів збігається з чисто Python-обчисленням."""
+from collections import Counter
+from math import log2
+
+import pytest
+
+from Middleware import streaming
+from Middleware.streaming import NUMPY_SYMBOLS_THRESHOLD, symbol_stats
+
+np = pytest.importorskip("numpy")
+
+
+def entropy_python(counter, n):
+    return -sum(p * log2(p) for p in (freq / n for freq in counter.values()) if p > 0)
+
+
+@pytest.mark.parametrize("symbols", [NUMPY_SYMBOLS_THRESHOLD, 60_000])
+def test_numpy_entropy_matches_python(monkeypatch, symbols):
+    rng = np.random.default_rng(symbols)
+    counter = Counter({chr(0x4E00 + i): int(c) for i, c in enumerate(rng.integers(1, 1000, symbols))})
+    n = sum(counter.values())
+    calls = []
+    entropy_numpy = streaming.entropy_numpy
+    monkeypatch.setattr(streaming, "entropy_numpy", lambda *args: calls.append(len(args[0])) or entropy_numpy(*args))
+
+    _, H, I = symbol_stats(counter, n)
+    assert calls == [symbols]
+    assert abs(H - entropy_python(counter, n)) <= 1e-12
+    assert I == H * n
+
+
+def test_small_alphabet_stays_scalar(monkeypatch):
+    monkeypatch.setattr(streaming, "entropy_numpy", lambda *args: pytest.fail("entropy_numpy викликано"))
+    counter = Counter("abracadabra")
+    _, H, _ = symbol_stats(counter, 11)
+    assert H == entropy_python(counter, 11)
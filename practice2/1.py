@@ -2,24 +2,97 @@
 Обчислює ентропійні величини H(A), H(B), H(A,B), H(B|A), H(A|B)
 на основі заданої матриці спільних ймовірностей P(A,B).
 """
+import json
+import os
+from collections import namedtuple
+
 import numpy as np
 
+from bigrams import BigramCounter
+
 # Налаштування відображення чисел: 6 знаків після коми, без наукової нотації
 np.set_printoptions(precision=6, suppress=True)
 
 # уникнення log(0)
 EPS = 1e-12
 
-def normalize_matrix(mat):
-    """Нормалізувати матрицю так, щоб сума елементів = 1."""
-    s = np.sum(mat)
+# --- 0. Розріджені (COO) та memmap-матриці ---
+# Розріджена матриця у форматі COO: ненульові елементи data[k] у клітинках (rows[k], cols[k])
+SparseJoint = namedtuple("SparseJoint", ["rows", "cols", "data", "shape"])
+
+# Скільки елементів щільної memmap-матриці читається в пам'ять за один раз
+BLOCK_ELEMENTS = 1 << 23
+
+def is_sparse(joint):
+    """Чи є матриця розрідженою (SparseJoint або scipy.sparse)."""
+    return isinstance(joint, SparseJoint) or hasattr(joint, "tocoo")
+
+def as_sparse(joint):
+    """
+    Привести scipy.sparse (COO/CSR/...) або SparseJoint до SparseJoint.
+    COO допускає кілька записів для однієї клітинки - вони сумуються, тож у результаті
+    кожна клітинка зустрічається один раз (у порядку рядків, потім стовпців).
+    """
+    if isinstance(joint, SparseJoint):
+        rows, cols, data, shape = joint
+    else:
+        coo = joint.tocoo()
+        rows, cols, data, shape = coo.row, coo.col, coo.data, coo.shape
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    data = np.asarray(data, dtype=float)
+    keys = rows * shape[1] + cols
+    if np.all(keys[1:] > keys[:-1]):
+        # Уже впорядковано без повторів (напр. результат попереднього as_sparse)
+        return SparseJoint(rows, cols, data, shape)
+    keys, inverse = np.unique(keys, return_inverse=True)
+    data = np.bincount(inverse.ravel(), weights=data, minlength=len(keys))
+    return SparseJoint(keys // shape[1], keys % shape[1], data, shape)
+
+def iter_row_blocks(joint):
+    """Перебирає щільну (у т.ч. np.memmap) матрицю блоками рядків: (початковий рядок, блок)."""
+    rows = max(1, BLOCK_ELEMENTS // max(1, joint.shape[1]))
+    for start in range(0, joint.shape[0], rows):
+        yield start, np.asarray(joint[start:start + rows], dtype=float)
+
+def normalize_matrix(mat, out=None):
+    """
+    Нормалізувати матрицю так, щоб сума елементів = 1.
+    Для np.memmap можна передати out (напр. інший memmap), щоб не створювати копію в пам'яті.
+    """
+    if is_sparse(mat):
+        mat = as_sparse(mat)
+        s = np.sum(mat.data)
+        if s <= 0:
+            raise ValueError("Сума елементів матриці повинна бути > 0")
+        return mat._replace(data=mat.data / s)
+    if isinstance(mat, np.memmap):
+        s = sum(np.sum(block) for _, block in iter_row_blocks(mat))
+    else:
+        s = np.sum(mat)
     if s <= 0:
         raise ValueError("Сума елементів матриці повинна бути > 0")
-    return mat / s
+    if out is None:
+        return mat / s
+    for start, block in iter_row_blocks(mat):
+        out[start:start + len(block)] = block / s
+    return out
 
 # --- 1. Обчислення маргінальних ймовірностей ---
 def marginal_from_joint(joint):
     """Отримати маргінали P(A) (рядки) та P(B) (стовпці) з P(A,B)."""
+    if is_sparse(joint):
+        sp = as_sparse(joint)
+        pA = np.bincount(sp.rows, weights=sp.data, minlength=sp.shape[0])
+        pB = np.bincount(sp.cols, weights=sp.data, minlength=sp.shape[1])
+        return pA, pB
+    if isinstance(joint, np.memmap):
+        pA = np.empty(joint.shape[0])
+        pB = np.zeros(joint.shape[1])
+        for start, block in iter_row_blocks(joint):
+            pA[start:start + len(block)] = block.sum(axis=1)
+            pB += block.sum(axis=0)
+        return pA, pB
     pA = np.sum(joint, axis=1)  # сума по стовпцях -> для кожного рядка
     pB = np.sum(joint, axis=0)  # сума по рядках -> для кожного стовпця
     return pA, pB
@@ -27,6 +100,10 @@ def marginal_from_joint(joint):
 # --- 2. Умовні ймовірності ---
 def conditional_A_given_B(joint, pB):
     """Обчислює умовні ймовірності P(A|B), колонки відповідають фіксованому B."""
+    if is_sparse(joint):
+        sp = as_sparse(joint)
+        pb = np.asarray(pB)[sp.cols]
+        return sp._replace(data=np.where(pb > 0, sp.data / np.where(pb > 0, pb, 1.0), 0.0))
     cond = np.zeros_like(joint)
     for b in range(joint.shape[1]):
         if pB[b] > 0:
@@ -37,6 +114,10 @@ def conditional_A_given_B(joint, pB):
 
 def conditional_B_given_A(joint, pA):
     """Обчислює умовні ймовірності P(B|A), рядки відповідають фіксованому A."""
+    if is_sparse(joint):
+        sp = as_sparse(joint)
+        pa = np.asarray(pA)[sp.rows]
+        return sp._replace(data=np.where(pa > 0, sp.data / np.where(pa > 0, pa, 1.0), 0.0))
     cond = np.zeros_like(joint)
     for a in range(joint.shape[0]):
         if pA[a] > 0:
@@ -55,13 +136,36 @@ def entropy_of_distribution(p):
 
 def joint_entropy(joint):
     """H(A,B), спільна ентропія двох змінних."""
+    if is_sparse(joint):
+        return entropy_of_distribution(as_sparse(joint).data)
+    if isinstance(joint, np.memmap):
+        return sum(entropy_of_distribution(block.ravel()) for _, block in iter_row_blocks(joint))
     flat = joint.flatten()
     flat_nz = flat[flat > EPS]
     return -np.sum(flat_nz * np.log2(flat_nz))
 
 # --- 4. Умовні ентропії ---
+def _cond_terms(values, marginal):
+    """-q*log2(q) для q = values / marginal; клітинки з marginal <= EPS або q <= EPS дають 0."""
+    ok = marginal > EPS
+    q = np.where(ok, values / np.where(ok, marginal, 1.0), 0.0)
+    mask = q > EPS
+    return -np.where(mask, q * np.log2(np.where(mask, q, 1.0)), 0.0)
+
 def conditional_entropy_A_given_B(joint, pB):
-    """H(B|A) = Σ_a p(a) * H(B|A=a)"""
+    """H(A|B) = Σ_b p(b) * H(A|B=b)"""
+    pB = np.asarray(pB, dtype=float)
+    if is_sparse(joint):
+        # Умовна матриця не будується: ентропії стовпців збираються з ненульових елементів
+        sp = as_sparse(joint)
+        col_H = np.bincount(sp.cols, weights=_cond_terms(sp.data, pB[sp.cols]),
+                            minlength=sp.shape[1])
+        return np.sum(np.where(pB > EPS, pB * col_H, 0.0))
+    if isinstance(joint, np.memmap):
+        col_H = np.zeros(joint.shape[1])
+        for _, block in iter_row_blocks(joint):
+            col_H += _cond_terms(block, pB[None, :]).sum(axis=0)
+        return np.sum(np.where(pB > EPS, pB * col_H, 0.0))
     H = 0.0
     for b in range(joint.shape[1]):
         pb = pB[b]
@@ -73,6 +177,19 @@ def conditional_entropy_A_given_B(joint, pB):
 
 def conditional_entropy_B_given_A(joint, pA):
     """H(B|A) = Σ_a p(a) * H(B|A=a)"""
+    pA = np.asarray(pA, dtype=float)
+    if is_sparse(joint):
+        sp = as_sparse(joint)
+        row_H = np.bincount(sp.rows, weights=_cond_terms(sp.data, pA[sp.rows]),
+                            minlength=sp.shape[0])
+        return np.sum(np.where(pA > EPS, pA * row_H, 0.0))
+    if isinstance(joint, np.memmap):
+        H = 0.0
+        for start, block in iter_row_blocks(joint):
+            pa = pA[start:start + len(block)]
+            row_H = _cond_terms(block, pa[:, None]).sum(axis=1)
+            H += np.sum(np.where(pa > EPS, pa * row_H, 0.0))
+        return H
     H = 0.0
     for a in range(joint.shape[0]):
         pa = pA[a]
@@ -82,6 +199,94 @@ def conditional_entropy_B_given_A(joint, pA):
             H += pa * H_ba
     return H
 
+# --- 5. Пакетні обчислення для стосу матриць (batch, m, n) ---
+# Кількість елементів (матриць x m x n) у порції, що обробляється за один раз:
+# кожен тимчасовий масив порції займає не більше BATCH_CHUNK_ELEMENTS чисел (32 МБ)
+BATCH_CHUNK_ELEMENTS = 1 << 22
+
+def _neg_plogp(p):
+    """-p*log2(p) поелементно; значення p <= EPS дають 0, як у скалярних функціях."""
+    mask = p > EPS
+    return -np.where(mask, p * np.log2(np.where(mask, p, 1.0)), 0.0)
+
+def _batch_entropies(joint):
+    pA = joint.sum(axis=2)  # (batch, m)
+    pB = joint.sum(axis=1)  # (batch, n)
+    H_A = _neg_plogp(pA).sum(axis=1)
+    H_B = _neg_plogp(pB).sum(axis=1)
+    H_AB = _neg_plogp(joint).sum(axis=(1, 2))
+
+    # Умовні розподіли рахуються лише для маргіналів > EPS, решта вносить 0
+    okB = pB > EPS
+    cond_A_given_B = joint / np.where(okB, pB, 1.0)[:, None, :]
+    H_A_given_B = np.sum(np.where(okB, pB * _neg_plogp(cond_A_given_B).sum(axis=1), 0.0), axis=1)
+
+    okA = pA > EPS
+    cond_B_given_A = joint / np.where(okA, pA, 1.0)[:, :, None]
+    H_B_given_A = np.sum(np.where(okA, pA * _neg_plogp(cond_B_given_A).sum(axis=2), 0.0), axis=1)
+
+    return H_A, H_B, H_AB, H_A_given_B, H_B_given_A
+
+def batch_entropies(joints, normalize=False, chunk_elements=BATCH_CHUNK_ELEMENTS):
+    """
+    Ентропійні величини для стосу спільних розподілів форми (batch, m, n).
+    Повертає словник масивів довжини batch: H_A, H_B, H_AB, H_A_given_B, H_B_given_A, I_AB.
+    Матриці обробляються порціями не більше ніж chunk_elements елементів.
+    """
+    joints = np.asarray(joints, dtype=float)
+    if joints.ndim == 2:
+        joints = joints[None]
+    if joints.ndim != 3:
+        raise ValueError("Очікується масив форми (batch, m, n)")
+    if normalize:
+        sums = joints.sum(axis=(1, 2))
+        if np.any(sums <= 0):
+            raise ValueError("Сума елементів кожної матриці повинна бути > 0")
+
+    chunk = max(1, chunk_elements // (joints.shape[1] * joints.shape[2] or 1))
+    names = ("H_A", "H_B", "H_AB", "H_A_given_B", "H_B_given_A")
+    result = {name: np.empty(len(joints)) for name in names}
+    for start in range(0, len(joints), chunk):
+        part = joints[start:start + chunk]
+        if normalize:
+            part = part / sums[start:start + chunk, None, None]
+        for name, values in zip(names, _batch_entropies(part)):
+            result[name][start:start + chunk] = values
+    # Взаємна інформація I(A;B) = H(A) + H(B) - H(A,B)
+    result["I_AB"] = result["H_A"] + result["H_B"] - result["H_AB"]
+    return result
+
+# --- 6. Марковська ентропія тексту ---
+# Тексти з practice1 для прикладу
+TEXTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "practice1", "texts.json")
+
+def bigram_joint(counter):
+    """P(A,B) сусідніх символів у розрідженому вигляді з BigramCounter."""
+    return normalize_matrix(SparseJoint(*counter.to_coo()))
+
+def markov_entropy(counter):
+    """
+    Ентропія першого порядку H(A) та умовна (марковська) ентропія H(B|A)
+    наступного символу за поточним.
+    Текст з менш ніж двох символів не має переходів: обидві ентропії дорівнюють 0.
+    """
+    if counter.n < 2:
+        return 0.0, 0.0
+    joint = bigram_joint(counter)
+    pA, _ = marginal_from_joint(joint)
+    return entropy_of_distribution(pA), conditional_entropy_B_given_A(joint, pA)
+
+def markov_entropy_of_text(text):
+    counter = BigramCounter()
+    counter.update(text)
+    return markov_entropy(counter)
+
+def markov_entropy_of_file(path):
+    """Потокова обробка великого файлу без завантаження його в пам'ять."""
+    counter = BigramCounter()
+    counter.update_file(path)
+    return markov_entropy(counter)
+
 # ================== ВИВІД ==================
 def pretty_print_matrix(mat, row_labels=None, col_labels=None, title=None):
     """Друкує матрицю з підписами рядків і стовпців."""
@@ -150,6 +355,28 @@ def main():
     print(f"H(A) + H(B|A) = {H_A + H_B_given_A:.6f}")
     print(f"H(A,B) - H(A) = {H_AB - H_A:.6f}")
     print(f"H(A,B) - H(B) = {H_AB - H_B:.6f}")
+    print()
+
+    # Пакетний розрахунок для стосу випадкових матриць (разом з поточною)
+    print("=== Пакетний розрахунок ===")
+    stack = np.concatenate([joint[None], np.random.rand(99_999, 9, 9)])
+    batch = batch_entropies(stack, normalize=True)
+    print(f"Матриць у пакеті: {len(stack)}")
+    print(f"H(A|B) першої матриці = {batch['H_A_given_B'][0]:.6f}")
+    print(f"H(B|A) першої матриці = {batch['H_B_given_A'][0]:.6f}")
+    print(f"I(A;B) першої матриці = {batch['I_AB'][0]:.6f}")
+    print(f"Середня I(A;B) у пакеті = {batch['I_AB'].mean():.6f}")
+
+    # Марковська ентропія для текстів кожної мови
+    if os.path.exists(TEXTS_FILE):
+        with open(TEXTS_FILE, "r", encoding="utf-8") as f:
+            texts = json.load(f)
+        print()
+        print("=== Марковська ентропія текстів (пари сусідніх символів) ===")
+        for lang, variants in texts.items():
+            for variant, text in variants.items():
+                H_A, H_B_given_A = markov_entropy_of_text(text)
+                print(f"{lang:>10} ({variant}): H(A) = {H_A:.6f}, H(B|A) = {H_B_given_A:.6f}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
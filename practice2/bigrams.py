@@ -0,0 +1,98 @@
+"""
+Однопрохідна побудова таблиці спільних частот P(A,B) для пар сусідніх символів тексту
+(A - поточний символ, B - наступний).
+"""
+import codecs
+
+import numpy as np
+
+# Розмір блоку читання файлу (байт) та обробки тексту (символів)
+CHUNK_SIZE = 1 << 22
+# До якого розміру алфавіту пари рахуються через bincount (K*K комірок)
+BINCOUNT_LIMIT = 1 << 24
+
+
+class BigramCounter:
+    """Накопичує кількості пар сусідніх символів; текст можна подавати частинами."""
+
+    def __init__(self):
+        self.symbols = []  # символи у порядку першої появи
+        self._index_of = np.full(128, -1, dtype=np.int32)  # код символу -> індекс
+        self._pairs = {}  # (індекс A, індекс B) -> кількість
+        self._last = -1  # індекс останнього символу попередньої частини
+        self.n = 0
+
+    def _indices(self, codes):
+        """Перетворює коди Unicode на індекси алфавіту, додаючи нові символи."""
+        top = int(codes.max()) + 1
+        if top > len(self._index_of):
+            grown = np.full(max(top, 2 * len(self._index_of)), -1, dtype=np.int32)
+            grown[:len(self._index_of)] = self._index_of
+            self._index_of = grown
+        idx = self._index_of[codes]
+        missing = idx < 0
+        if missing.any():
+            values, first = np.unique(codes[missing], return_index=True)
+            for code in values[np.argsort(first, kind="stable")].tolist():
+                self._index_of[code] = len(self.symbols)
+                self.symbols.append(chr(code))
+            idx = self._index_of[codes]
+        return idx
+
+    def update(self, text):
+        for start in range(0, len(text), CHUNK_SIZE):
+            self._update_chunk(text[start:start + CHUNK_SIZE])
+
+    def _update_chunk(self, text):
+        if not text:
+            return
+        codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        idx = self._indices(codes)
+        pairs = self._pairs
+        # Пара на межі частин: останній символ попередньої та перший символ поточної
+        if self._last >= 0:
+            pair = (self._last, int(idx[0]))
+            pairs[pair] = pairs.get(pair, 0) + 1
+        self._last = int(idx[-1])
+        self.n += len(codes)
+        if len(idx) < 2:
+            return
+
+        k = len(self.symbols)
+        keys = idx[:-1].astype(np.int64 if k * k >= 2**31 else np.int32)
+        keys *= k
+        keys += idx[1:]
+        if k * k <= BINCOUNT_LIMIT:
+            counts = np.bincount(keys, minlength=k * k)
+            keys = np.flatnonzero(counts)
+            counts = counts[keys]
+        else:
+            keys, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            pair = divmod(key, k)
+            pairs[pair] = pairs.get(pair, 0) + count
+
+    def update_stream(self, stream, encoding="utf-8"):
+        """Читає бінарний потік блоками; символи UTF-8 на межі блоків декодуються коректно."""
+        for text in codecs.iterdecode(iter(lambda: stream.read(CHUNK_SIZE), b""), encoding):
+            self._update_chunk(text)
+
+    def update_file(self, path, encoding="utf-8"):
+        with open(path, "rb") as f:
+            self.update_stream(f, encoding)
+
+    def to_coo(self):
+        """(rows, cols, counts, shape) - таблиця кількостей пар у форматі COO."""
+        k = len(self.symbols)
+        if not self._pairs:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0), (k, k)
+        pairs = np.array(list(self._pairs.keys()), dtype=np.int64)
+        counts = np.array(list(self._pairs.values()), dtype=float)
+        return pairs[:, 0], pairs[:, 1], counts, (k, k)
+
+    def to_dense(self):
+        rows, cols, counts, shape = self.to_coo()
+        table = np.zeros(shape)
+        table[rows, cols] = counts
+        return table
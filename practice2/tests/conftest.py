@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 1.py імпортує bigrams так само, як при запуску з practice2
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,46 @@
+"""batch_entropies: порції обмежені кількістю елементів, результати збігаються зі скалярними функціями."""
+import os
+import runpy
+
+import numpy as np
+import pytest
+
+ENTROPY = runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "1.py"),
+                         run_name="entropy")
+batch_entropies = ENTROPY["batch_entropies"]
+
+
+@pytest.fixture
+def joints():
+    rng = np.random.default_rng(1)
+    stack = rng.random((7, 6, 5))
+    stack[2, 1, :] = 0  # нульовий маргінал A
+    stack[3, :, 4] = 0  # нульовий маргінал B
+    return stack / stack.sum(axis=(1, 2), keepdims=True)
+
+
+def test_matches_scalar(joints):
+    result = batch_entropies(joints)
+    for k, joint in enumerate(joints):
+        pA, pB = ENTROPY["marginal_from_joint"](joint)
+        assert np.isclose(result["H_A"][k], ENTROPY["entropy_of_distribution"](pA))
+        assert np.isclose(result["H_B"][k], ENTROPY["entropy_of_distribution"](pB))
+        assert np.isclose(result["H_B_given_A"][k], ENTROPY["conditional_entropy_B_given_A"](joint, pA))
+        assert np.isclose(result["H_A_given_B"][k], ENTROPY["conditional_entropy_A_given_B"](joint, pB))
+
+
+def test_chunks_bounded_by_elements(monkeypatch, joints):
+    sizes = []
+    inner = ENTROPY["_batch_entropies"]
+    # run_path повертає копію простору імен модуля, тому підміняємо в globals самої функції
+    monkeypatch.setitem(batch_entropies.__globals__, "_batch_entropies", lambda part: sizes.append(part.size) or inner(part))
+    result = batch_entropies(joints, chunk_elements=100)
+    assert max(sizes) <= 100 and sum(sizes) == joints.size
+    expected = batch_entropies(joints)
+    for name, values in expected.items():
+        assert np.allclose(result[name], values)
+
+    # Матриця, більша за порцію, обробляється по одній
+    sizes.clear()
+    batch_entropies(np.full((3, 20, 20), 1 / 400), chunk_elements=100)
+    assert sizes == [400] * 3
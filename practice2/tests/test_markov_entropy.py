@@ -0,0 +1,34 @@
+"""Марковська ентропія тексту: короткі тексти без переходів і частинами поданий потік."""
+import io
+import os
+import runpy
+
+import pytest
+
+ENTROPY = runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "1.py"),
+                         run_name="entropy")
+markov_entropy_of_text = ENTROPY["markov_entropy_of_text"]
+
+
+@pytest.mark.parametrize("text", ["", "a", "😀"])
+def test_no_transitions(text):
+    assert markov_entropy_of_text(text) == (0.0, 0.0)
+
+
+def test_two_symbols():
+    H_A, H_B_given_A = markov_entropy_of_text("ab")
+    assert H_A == pytest.approx(0.0) and H_B_given_A == pytest.approx(0.0)
+
+
+def test_alternating_text():
+    # Після a завжди b, після b - завжди a: наступний символ повністю визначений
+    H_A, H_B_given_A = markov_entropy_of_text("ab" * 1000)
+    assert H_A == pytest.approx(1.0)
+    assert H_B_given_A == pytest.approx(0.0)
+
+
+def test_stream_matches_text():
+    text = "Привіт, світе! " * 500
+    counter = ENTROPY["BigramCounter"]()
+    counter.update_stream(io.BytesIO(text.encode("utf-8")))
+    assert ENTROPY["markov_entropy"](counter) == pytest.approx(markov_entropy_of_text(text))
@@ -0,0 +1,42 @@
+"""Розріджені (COO) матриці з повторними записами дають ті самі ентропії, що й щільні."""
+import os
+import runpy
+
+import numpy as np
+import pytest
+
+ENTROPY = runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "1.py"),
+                         run_name="entropy")
+SparseJoint = ENTROPY["SparseJoint"]
+
+
+@pytest.fixture
+def joint():
+    rng = np.random.default_rng(0)
+    dense = rng.random((4, 5))
+    dense[1, 2] = 0
+    return dense / dense.sum()
+
+
+def split_cells(dense):
+    """Кожна ненульова клітинка - двома записами COO, у перемішаному порядку."""
+    rows, cols = np.nonzero(dense)
+    values = dense[rows, cols]
+    order = np.random.default_rng(1).permutation(2 * len(rows))
+    return SparseJoint(np.concatenate([rows, rows])[order], np.concatenate([cols, cols])[order],
+                       np.concatenate([values * 0.25, values * 0.75])[order], dense.shape)
+
+
+def test_duplicates_combined(joint):
+    sparse = ENTROPY["as_sparse"](split_cells(joint))
+    rows, cols = np.nonzero(joint)
+    assert np.array_equal(sparse.rows, rows) and np.array_equal(sparse.cols, cols)
+    assert np.allclose(sparse.data, joint[rows, cols])
+
+
+def test_entropies_match_dense(joint):
+    sparse = split_cells(joint)
+    pA, pB = ENTROPY["marginal_from_joint"](joint)
+    for name, args in (("joint_entropy", ()), ("conditional_entropy_A_given_B", (pB,)),
+                       ("conditional_entropy_B_given_A", (pA,))):
+        assert ENTROPY[name](sparse, *args) == pytest.approx(ENTROPY[name](joint, *args), abs=1e-12)
@@ -1,4 +1,8 @@
 from math import log2, sqrt
+import random
+import time
+import bitcodec
+from codes import average_length, huffman, shannon_fano
 # -----------------------------
 # ЗАДАЧА 1. Обчислення ентропії
 # -----------------------------
@@ -55,47 +59,22 @@ print(f"Швидкість передавання повідомлень: R={V_b
 # ЗАДАЧА 4. Побудувати оптимальний код повідомлення з використанням методу Шеннона-Фано
 # -----------------------------------
 
-def shannon_fano(symbols, probabilities):
-    """Побудова кодів методом Шеннона–Фано"""
-    codes = {sym: "" for sym in symbols}
-
-    def recursive_build(symbols, probs):
-        if len(symbols) == 1:
-            return
-        total = sum(probs)
-        acc = 0
-        split_index = 0
-        for i, p in enumerate(probs):
-            acc += p
-            if acc >= total / 2:
-                split_index = i
-                break
-        left = symbols[:split_index+1]
-        right = symbols[split_index+1:]
-        for sym in left:
-            codes[sym] += "0"
-        for sym in right:
-            codes[sym] += "1"
-        recursive_build(left, probs[:split_index+1])
-        recursive_build(right, probs[split_index+1:])
-
-    recursive_build(symbols, probabilities)
-    return codes
-
-#Функція шифрування тексту
+#Функція шифрування тексту (коди через пробіл)
 def koduv_text(text, table):
-    result = ""
-    for i in text:
-        result += table[i]+" "
-    return result
+    return "".join(table[i] + " " for i in text)
 
 #Функція дешифрування тексту
 def dekoduv_text(text, table):
-    result = ""
     s = text.split(" ")
-    for i in range(len(s)-1):
-        result += table[s[i]]
-    return result
+    return "".join(table[s[i]] for i in range(len(s)-1))
+
+#Двійкове кодування: біти пакуються в байти без роздільників
+def koduv_bytes(text, table):
+    return bitcodec.encode(text, table)
+
+#Двійкове декодування за таблицею префіксів
+def dekoduv_bytes(data, nbits, table):
+    return bitcodec.decode(data, table, nbits)
 
 simv = [f"a{i}" for i in range(1, N_2+1)]
 verog = [0.5 ** i for i in range(1, N_2 + 1)]
@@ -113,4 +92,24 @@ print("\nДемонстрація словника для кодування:")
 a=int((len(slov_for_koder)/6)//1)
 for i in range(a):
     print(list(slov_for_koder.items())[6*i:6*i+6])
-print(list(slov_for_koder.items())[a*6 :])
\ No newline at end of file
+print(list(slov_for_koder.items())[a*6 :])
+
+# Порівняння з канонічним кодом Хаффмана
+slov_huffman = huffman(simv, verog)
+print(f"\nСередня довжина коду Шеннона-Фано: {average_length(slov_for_koder, simv, verog):.6f} біт/символ")
+print(f"Середня довжина коду Хаффмана:     {average_length(slov_huffman, simv, verog):.6f} біт/символ")
+print(f"Ентропія джерела:                  {H_b_2:.6f} біт/символ")
+
+# Двійкове кодування випадкового повідомлення з заданим розподілом символів
+random.seed(1337)
+povid = random.choices(simv, weights=verog, k=200_000)
+start = time.perf_counter()
+data, nbits = koduv_bytes(povid, slov_for_koder)
+t_kod = time.perf_counter() - start
+start = time.perf_counter()
+rozkod = dekoduv_bytes(data, nbits, slov_for_koder)
+t_dekod = time.perf_counter() - start
+print("\nДвійкове кодування повідомлення:")
+print(f"Символів: {len(povid)}, бітів: {nbits}, байтів: {len(data)} ({nbits / len(povid):.4f} біт/символ)")
+print(f"Кодування: {len(data) / 2**20 / t_kod:.2f} МБ/с, декодування: {len(data) / 2**20 / t_dekod:.2f} МБ/с")
+print(f"Декодоване повідомлення збігається з вихідним: {rozkod == povid}")
@@ -0,0 +1,264 @@
+"""
+Адаптивне арифметичне кодування: модель частот оновлюється по мірі надходження символів,
+тому кодування й декодування виконуються за один прохід без попереднього підрахунку.
+Алфавіт - байти (0..255) та службовий символ кінця потоку. Модель першого порядку:
+окремі частоти для кожного попереднього байта (враховує зв'язок байтів одного символу UTF-8),
+тож пам'ять обмежена 256 моделями незалежно від довжини потоку.
+
+Запуск:
+    python adaptive.py c вхідний_файл стиснений_файл
+    python adaptive.py d стиснений_файл вихідний_файл
+"""
+import argparse
+import os
+import time
+
+MAGIC = b"AAC1"
+EOF_SYMBOL = 256
+NUM_SYMBOLS = 257
+# Параметри адаптації: приріст частоти символу та поріг масштабування
+INCREMENT = 32
+MAX_TOTAL = 1 << 16
+# 32-бітна арифметика кодера
+PRECISION = 32
+FULL = (1 << PRECISION) - 1
+HALF = 1 << (PRECISION - 1)
+QUARTER = 1 << (PRECISION - 2)
+CHUNK_SIZE = 1 << 16
+
+
+class AdaptiveModel:
+    """Частоти символів у дереві Фенвіка: накопичені суми та пошук за O(log n)."""
+
+    def __init__(self, size=NUM_SYMBOLS):
+        self.size = size
+        self.freq = [1] * size
+        self.total = size
+        self._rebuild()
+
+    def _rebuild(self):
+        tree = [0] * (self.size + 1)
+        for i, f in enumerate(self.freq, 1):
+            tree[i] += f
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.top = 1 << (self.size.bit_length() - 1)
+
+    def cum(self, symbol):
+        """Сума частот символів 0..symbol-1."""
+        s = 0
+        i = symbol
+        tree = self.tree
+        while i > 0:
+            s += tree[i]
+            i &= i - 1
+        return s
+
+    def find(self, target):
+        """Символ, для якого cum(symbol) <= target < cum(symbol + 1)."""
+        pos = 0
+        step = self.top
+        tree = self.tree
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return pos
+
+    def update(self, symbol):
+        self.freq[symbol] += INCREMENT
+        self.total += INCREMENT
+        if self.total > MAX_TOTAL:
+            # Масштабування: старі спостереження поступово "забуваються"
+            self.freq = [(f + 1) // 2 for f in self.freq]
+            self.total = sum(self.freq)
+            self._rebuild()
+            return
+        i = symbol + 1
+        tree = self.tree
+        while i <= self.size:
+            tree[i] += INCREMENT
+            i += i & -i
+
+
+class ContextModels:
+    """Адаптивні моделі, що створюються для кожного контексту (попереднього байта) при першій потребі."""
+
+    def __init__(self):
+        self.models = {}
+
+    def __getitem__(self, context):
+        model = self.models.get(context)
+        if model is None:
+            model = self.models[context] = AdaptiveModel()
+        return model
+
+
+class _BitWriter:
+    def __init__(self, out):
+        self.out = out
+        self.buf = bytearray()
+        self.acc = 0
+        self.nbits = 0
+
+    def write(self, bit, pending=0):
+        """Записує біт і pending протилежних бітів."""
+        self.acc = (self.acc << (pending + 1)) | (bit << pending) | (((1 << pending) - 1) * (1 - bit))
+        self.nbits += pending + 1
+        while self.nbits >= 8:
+            self.nbits -= 8
+            self.buf.append((self.acc >> self.nbits) & 0xFF)
+        self.acc &= (1 << self.nbits) - 1
+        if len(self.buf) >= CHUNK_SIZE:
+            self.out.write(self.buf)
+            self.buf = bytearray()
+
+    def flush(self):
+        if self.nbits:
+            self.buf.append((self.acc << (8 - self.nbits)) & 0xFF)
+            self.nbits = 0
+        self.out.write(self.buf)
+        self.buf = bytearray()
+
+
+class _BitReader:
+    def __init__(self, stream):
+        self.stream = stream
+        self.data = b""
+        self.pos = 0
+        self.bit = 8
+
+    def read(self):
+        if self.bit == 8:
+            self.pos += 1
+            if self.pos >= len(self.data):
+                self.data = self.stream.read(CHUNK_SIZE)
+                self.pos = 0
+                if not self.data:
+                    self.data = b"\0"  # після кінця даних - нулі
+            self.bit = 0
+        self.bit += 1
+        return (self.data[self.pos] >> (8 - self.bit)) & 1
+
+
+def encode_stream(fin, fout):
+    """Кодує бінарний потік fin у fout за один прохід."""
+    models = ContextModels()
+    writer = _BitWriter(fout)
+    low, high, pending = 0, FULL, 0
+    context = 0
+
+    def encode_symbol(symbol):
+        nonlocal low, high, pending, context
+        model = models[context]
+        rng = high - low + 1
+        c_low = model.cum(symbol)
+        c_high = c_low + model.freq[symbol]
+        high = low + rng * c_high // model.total - 1
+        low = low + rng * c_low // model.total
+        while True:
+            if high < HALF:
+                writer.write(0, pending)
+                pending = 0
+            elif low >= HALF:
+                writer.write(1, pending)
+                pending = 0
+                low -= HALF
+                high -= HALF
+            elif low >= QUARTER and high < 3 * QUARTER:
+                pending += 1
+                low -= QUARTER
+                high -= QUARTER
+            else:
+                break
+            low <<= 1
+            high = (high << 1) | 1
+        model.update(symbol)
+        context = symbol
+
+    fout.write(MAGIC)
+    while True:
+        chunk = fin.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        for symbol in chunk:
+            encode_symbol(symbol)
+    encode_symbol(EOF_SYMBOL)
+    writer.write(0 if low < QUARTER else 1, pending + 1)
+    writer.flush()
+
+
+def decode_stream(fin, fout):
+    """Декодує потік, створений encode_stream."""
+    if fin.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Файл не є стиснутим файлом цього формату")
+    models = ContextModels()
+    context = 0
+    reader = _BitReader(fin)
+    low, high = 0, FULL
+    value = 0
+    for _ in range(PRECISION):
+        value = (value << 1) | reader.read()
+
+    out = bytearray()
+    while True:
+        model = models[context]
+        rng = high - low + 1
+        target = ((value - low + 1) * model.total - 1) // rng
+        symbol = model.find(target)
+        if symbol == EOF_SYMBOL:
+            break
+        out.append(symbol)
+        if len(out) >= CHUNK_SIZE:
+            fout.write(out)
+            out = bytearray()
+
+        c_low = model.cum(symbol)
+        c_high = c_low + model.freq[symbol]
+        high = low + rng * c_high // model.total - 1
+        low = low + rng * c_low // model.total
+        while True:
+            if high < HALF:
+                pass
+            elif low >= HALF:
+                low -= HALF
+                high -= HALF
+                value -= HALF
+            elif low >= QUARTER and high < 3 * QUARTER:
+                low -= QUARTER
+                high -= QUARTER
+                value -= QUARTER
+            else:
+                break
+            low <<= 1
+            high = (high << 1) | 1
+            value = (value << 1) | reader.read()
+        model.update(symbol)
+        context = symbol
+    fout.write(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Адаптивне арифметичне кодування")
+    parser.add_argument("command", choices=["c", "d"])
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.src, "rb") as fin, open(args.dst, "wb") as fout:
+        if args.command == "c":
+            encode_stream(fin, fout)
+        else:
+            decode_stream(fin, fout)
+    elapsed = time.perf_counter() - start
+    src_size, dst_size = os.path.getsize(args.src), os.path.getsize(args.dst)
+    print(f"{args.src} ({src_size} байт) -> {args.dst} ({dst_size} байт) за {elapsed:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
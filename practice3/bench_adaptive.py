@@ -0,0 +1,75 @@
+"""
+Порівняння адаптивного однопрохідного кодування зі статичним двопрохідним кодом
+Шеннона-Фано: швидкість (МБ/с) та розмір стисненого файлу.
+
+Запуск: python bench_adaptive.py [файл або розмір_КБ тексту з texts.json]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import adaptive
+import compress
+
+TEXTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "practice1", "texts.json")
+
+
+def corpus_file(path, size_kb):
+    with open(TEXTS_FILE, "r", encoding="utf-8") as f:
+        texts = json.load(f)
+    block = "\n".join(t for variants in texts.values() for t in variants.values()).encode("utf-8")
+    data = (block * (size_kb * 1024 // len(block) + 1))[:size_kb * 1024]
+    # Не розрізаємо останній символ UTF-8
+    data = data.decode("utf-8", errors="ignore").encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run_adaptive(src, dst, mode):
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        (adaptive.encode_stream if mode == "c" else adaptive.decode_stream)(fin, fout)
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    arg = sys.argv[1] if len(sys.argv) > 1 else "1024"
+    if os.path.isfile(arg):
+        src = arg
+    else:
+        src = os.path.join(tmp, "input.txt")
+        corpus_file(src, int(arg))
+    size = os.path.getsize(src)
+    mb = size / 2**20
+    print(f"Вхідний файл: {size} байт")
+
+    rows = []
+    packed, restored = os.path.join(tmp, "sf.bin"), os.path.join(tmp, "sf.out")
+    t_c = timed(compress.compress, src, packed)
+    t_d = timed(compress.decompress, packed, restored, 1)
+    rows.append(("Шеннон-Фано (2 проходи)", t_c, t_d, os.path.getsize(packed), restored))
+
+    packed, restored = os.path.join(tmp, "aac.bin"), os.path.join(tmp, "aac.out")
+    t_c = timed(run_adaptive, src, packed, "c")
+    t_d = timed(run_adaptive, packed, restored, "d")
+    rows.append(("адаптивний (1 прохід)", t_c, t_d, os.path.getsize(packed), restored))
+
+    with open(src, "rb") as f:
+        original = f.read()
+    print(f"{'метод':>24} | {'стиск, МБ/с':>11} | {'розпак., МБ/с':>13} | {'байтів':>9} | {'біт/байт':>8} | збіг")
+    for name, t_c, t_d, packed_size, restored in rows:
+        with open(restored, "rb") as f:
+            same = f.read() == original
+        print(f"{name:>24} | {mb / t_c:11.3f} | {mb / t_d:13.3f} | {packed_size:9} | "
+              f"{8 * packed_size / size:8.3f} | {same}")
+
+
+if __name__ == "__main__":
+    main()
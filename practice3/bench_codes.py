@@ -0,0 +1,42 @@
+"""
+Бенчмарк побудови кодів Шеннона-Фано та Хаффмана на алфавітах від 12 до 1 000 000 символів
+(розподіл Ціпфа): час побудови та середня довжина коду порівняно з ентропією.
+
+Запуск: python bench_codes.py [макс_розмір_алфавіту]
+"""
+import sys
+import time
+from math import log2
+
+from codes import average_length, huffman, shannon_fano
+
+
+def zipf(n):
+    weights = [1 / (i + 1) for i in range(n)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def main():
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [n for n in (12, 100, 1_000, 10_000, 100_000, 1_000_000) if n <= max_n]
+
+    print(f"{'символів':>9} | {'H':>8} | {'Ш-Ф, с':>8} | {'L Ш-Ф':>8} | {'Хаффман, с':>10} | {'L Хаффм.':>8}")
+    for n in sizes:
+        symbols = list(range(n))
+        probs = zipf(n)
+        H = -sum(p * log2(p) for p in probs)
+
+        start = time.perf_counter()
+        sf = shannon_fano(symbols, probs)
+        t_sf = time.perf_counter() - start
+        start = time.perf_counter()
+        hf = huffman(symbols, probs)
+        t_hf = time.perf_counter() - start
+
+        print(f"{n:9} | {H:8.4f} | {t_sf:8.3f} | {average_length(sf, symbols, probs):8.4f} | "
+              f"{t_hf:10.3f} | {average_length(hf, symbols, probs):8.4f}")
+
+
+if __name__ == "__main__":
+    main()
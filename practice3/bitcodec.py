@@ -0,0 +1,122 @@
+"""
+Двійковий кодек для префіксних кодів (Шеннона-Фано, Хаффмана):
+біти пакуються в bytes без роздільників, декодування - через таблицю префіксів.
+"""
+
+# Скільки символів кодується за один крок (обмежує тимчасовий рядок бітів)
+ENCODE_BLOCK = 1 << 16
+# Максимальна ширина таблиці префіксів для декодування (2**LUT_BITS записів)
+LUT_BITS = 12
+
+
+def prefix_table(table):
+    """
+    Перевіряє таблицю кодів перед кодуванням/декодуванням. Алфавіт з одного символу
+    (Шеннон-Фано дає йому порожній код) отримує код "0", інакше повідомлення
+    кодувалося б нулем бітів і втрачалось; порожній код в алфавіті з кількох символів - помилка.
+    """
+    if len(table) == 1:
+        (sym, code), = table.items()
+        return {sym: code or "0"}
+    if any(not code for code in table.values()):
+        raise ValueError("Порожній код в алфавіті з кількох символів")
+    return table
+
+
+def encode(symbols, table):
+    """
+    Кодує послідовність символів за таблицею {символ: "0101"}.
+    Повертає (data, nbits): упаковані біти (останній байт доповнено нулями) та їх кількість.
+    """
+    table = prefix_table(table)
+    symbols = list(symbols)
+    out = bytearray()
+    carry = ""
+    nbits = 0
+    for start in range(0, len(symbols), ENCODE_BLOCK):
+        bits = carry + "".join(map(table.__getitem__, symbols[start:start + ENCODE_BLOCK]))
+        whole = len(bits) - len(bits) % 8
+        if whole:
+            out += int(bits[:whole], 2).to_bytes(whole // 8, "big")
+        nbits += whole
+        carry = bits[whole:]
+    if carry:
+        out += int(carry.ljust(8, "0"), 2).to_bytes(1, "big")
+        nbits += len(carry)
+    return bytes(out), nbits
+
+
+def build_decode_table(table):
+    """
+    Таблиця префіксів: для кожного значення перших width бітів - (символ, довжина коду).
+    Коди, довші за width, декодуються через словник long_codes.
+    """
+    table = prefix_table(table)
+    max_len = max((len(code) for code in table.values()), default=1)
+    width = max(1, min(max_len, LUT_BITS))
+    lut = [None] * (1 << width)
+    long_codes = {}
+    for sym, code in table.items():
+        length = len(code)
+        if length > width:
+            long_codes[code] = sym
+            continue
+        base = int(code, 2) << (width - length)
+        for i in range(base, base + (1 << (width - length))):
+            lut[i] = (sym, length)
+    return lut, width, max(max_len, width), long_codes
+
+
+def iter_decode(chunks, table, nbits):
+    """Декодує потік байтових блоків (nbits значущих бітів загалом), повертаючи символи."""
+    lut, width, need, long_codes = build_decode_table(table)
+    mask = (1 << width) - 1
+    acc = 0  # буфер бітів
+    acc_bits = 0  # скільки бітів у буфері
+    left = nbits  # скільки значущих бітів ще не декодовано
+    chunks = iter(chunks)
+    data = b""
+    pos = 0
+    while left > 0:
+        # Буфер завжди містить щонайменше найдовший код; поповнюємо по 8 байтів
+        while acc_bits < need:
+            if pos >= len(data):
+                data = next(chunks, None)
+                pos = 0
+                if data is None:
+                    # Дані закінчились: доповнюємо нулями
+                    acc <<= need - acc_bits
+                    acc_bits = need
+                    data = b""
+                continue
+            part = data[pos:pos + 8]
+            pos += len(part)
+            acc = (acc << (8 * len(part))) | int.from_bytes(part, "big")
+            acc_bits += 8 * len(part)
+
+        entry = lut[(acc >> (acc_bits - width)) & mask]
+        if entry is not None:
+            sym, length = entry
+        else:
+            sym, length = _decode_long(acc, acc_bits, long_codes)
+        if length > left:
+            raise ValueError("Пошкоджені дані: код виходить за межі потоку")
+        acc_bits -= length
+        acc &= (1 << acc_bits) - 1
+        left -= length
+        yield sym
+
+
+def _decode_long(acc, acc_bits, long_codes):
+    """Повільний шлях для кодів, довших за ширину таблиці."""
+    bits = format(acc, f"0{acc_bits}b")
+    for length in range(1, len(bits) + 1):
+        sym = long_codes.get(bits[:length])
+        if sym is not None:
+            return sym, length
+    raise ValueError("Пошкоджені дані: невідомий код")
+
+
+def decode(data, table, nbits):
+    """Декодує упаковані біти у список символів."""
+    return list(iter_decode([data], table, nbits))
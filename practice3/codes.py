@@ -0,0 +1,108 @@
+"""
+Побудова префіксних кодів: Шеннона-Фано (через префіксні суми, без копіювання зрізів)
+та канонічний код Хаффмана з тим самим інтерфейсом.
+"""
+import heapq
+import sys
+from bisect import bisect_left
+from itertools import accumulate
+
+
+# Похибка округлення одного додавання; накопичена сума k ймовірностей відхиляється
+# від точної не більше ніж на k * EPSILON * суму
+EPSILON = sys.float_info.epsilon
+
+
+def _sequential_split(probabilities, lo, hi):
+    """
+    Межа поділу діапазону [lo, hi) тими самими послідовними сумами, що й у початковій
+    рекурсивній реалізації: перший індекс, на якому накопичена сума >= половини суми.
+    Використовується лише при (майже) рівних частинах, де від округлення залежить вибір.
+    """
+    total = sum(probabilities[k] for k in range(lo, hi))
+    acc = 0
+    for k in range(lo, hi):
+        acc += probabilities[k]
+        if acc >= total / 2:
+            return k + 1
+    return hi
+
+
+def shannon_fano(symbols, probabilities):
+    """
+    Побудова кодів методом Шеннона–Фано.
+    symbols мають бути впорядковані за спаданням ймовірностей; повертає {символ: "0101"}.
+    """
+    n = len(symbols)
+    prefix = [0.0] + list(accumulate(probabilities))  # prefix[i] = сума перших i ймовірностей
+    codes = {}
+    # Стек діапазонів [lo, hi) з уже накопиченим кодом (code - число, length - його довжина)
+    stack = [(0, n, 0, 0)] if n else []
+    while stack:
+        lo, hi, code, length = stack.pop()
+        if hi - lo == 1:
+            codes[symbols[lo]] = format(code, f"0{length}b") if length else ""
+            continue
+        # Перший індекс, на якому накопичена сума досягає половини суми діапазону
+        half = prefix[lo] + (prefix[hi] - prefix[lo]) / 2
+        # Межа похибки і префіксних сум, і послідовних сум зрізу
+        tol = 2 * hi * EPSILON * abs(prefix[hi])
+        mid = bisect_left(prefix, half - tol, lo + 1, hi + 1)
+        if hi - lo > 2 and prefix[mid] - half <= tol:
+            # Різниці префіксних сум округлюються інакше, ніж суми зрізу: при рівних
+            # частинах межа вибирається так само, як у початковій реалізації
+            # (діапазон з двох символів ділиться однозначно)
+            mid = _sequential_split(probabilities, lo, hi)
+        mid = min(max(mid, lo + 1), hi - 1)  # обидві частини мають бути непорожні
+        stack.append((mid, hi, (code << 1) | 1, length + 1))
+        stack.append((lo, mid, code << 1, length + 1))
+    return {sym: codes[sym] for sym in symbols}
+
+
+def huffman_lengths(probabilities):
+    """Довжини кодів Хаффмана для списку ймовірностей."""
+    n = len(probabilities)
+    if n == 1:
+        return [1]
+    heap = [(p, i) for i, p in enumerate(probabilities)]
+    heapq.heapify(heap)
+    parent = [0] * (2 * n - 1)
+    next_node = n
+    while len(heap) > 1:
+        p1, a = heapq.heappop(heap)
+        p2, b = heapq.heappop(heap)
+        parent[a] = parent[b] = next_node
+        heapq.heappush(heap, (p1 + p2, next_node))
+        next_node += 1
+    # Глибина вузла = глибина батька + 1 (батьки мають більші номери, корінь - останній)
+    depth = [0] * (2 * n - 1)
+    for node in range(2 * n - 3, -1, -1):
+        depth[node] = depth[parent[node]] + 1
+    return depth[:n]
+
+
+def canonical_codes(symbols, lengths):
+    """Канонічні коди за довжинами: коди однієї довжини йдуть підряд у порядку символів."""
+    order = sorted(range(len(symbols)), key=lambda i: (lengths[i], i))
+    codes = {}
+    code = 0
+    prev_len = 0
+    for i in order:
+        length = lengths[i]
+        code <<= length - prev_len
+        codes[symbols[i]] = format(code, f"0{length}b") if length else ""
+        code += 1
+        prev_len = length
+    return {sym: codes[sym] for sym in symbols}
+
+
+def huffman(symbols, probabilities):
+    """Канонічний код Хаффмана; інтерфейс той самий, що й у shannon_fano."""
+    if not symbols:
+        return {}
+    return canonical_codes(symbols, huffman_lengths(probabilities))
+
+
+def average_length(codes, symbols, probabilities):
+    """Середня довжина коду (біт/символ)."""
+    return sum(p * len(codes[sym]) for sym, p in zip(symbols, probabilities))
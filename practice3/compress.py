@@ -0,0 +1,197 @@
+"""
+Стиснення текстових файлів кодом Шеннона-Фано (або Хаффмана).
+
+Формат файлу:
+    MAGIC, метод (1 байт), кількість символів алфавіту (varint),
+    для кожного символу: код Unicode (varint) та довжина коду (varint) - канонічна таблиця,
+    далі блоки: кількість символів (varint, 0 - кінець), кількість бітів (varint), упаковані біти.
+
+Запуск:
+    python compress.py c вхідний_файл стиснений_файл [--huffman]
+    python compress.py d стиснений_файл вихідний_файл [--workers N]
+    python compress.py stats вхідний_файл
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import bitcodec
+from codes import canonical_codes, huffman, shannon_fano
+
+# Потоковий підрахунок символів та ентропія - з practice1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "practice1"))
+from Middleware.streaming import count_file, iter_text_chunks, symbol_stats  # noqa: E402
+
+MAGIC = b"SFC1"
+METHODS = {0: shannon_fano, 1: huffman}
+# Кількість символів тексту в одному блоці
+BLOCK_CHARS = 1 << 20
+
+
+def write_varint(f, value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            break
+    f.write(out)
+
+
+def read_varint(f):
+    value = 0
+    shift = 0
+    while True:
+        b = f.read(1)
+        if not b:
+            raise EOFError("Несподіваний кінець файлу")
+        value |= (b[0] & 0x7F) << shift
+        if b[0] < 0x80:
+            return value
+        shift += 7
+
+
+def build_table(counter, method=0):
+    """Символи (за спаданням частоти) та довжини кодів для тексту з лічильником counter."""
+    items = sorted(counter.items(), key=lambda x: x[1], reverse=True)
+    symbols = [ch for ch, _ in items]
+    total = sum(freq for _, freq in items)
+    codes = bitcodec.prefix_table(METHODS[method](symbols, [freq / total for _, freq in items]))
+    lengths = [len(codes[sym]) for sym in symbols]
+    return symbols, lengths
+
+
+def compress(src, dst, method=0):
+    """Стискає текстовий файл src у dst за два проходи з постійним обсягом пам'яті."""
+    counter, _ = count_file(src)
+    symbols, lengths = build_table(counter, method)
+    table = canonical_codes(symbols, lengths)
+
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        fout.write(MAGIC)
+        fout.write(bytes([method]))
+        write_varint(fout, len(symbols))
+        for sym, length in zip(symbols, lengths):
+            write_varint(fout, ord(sym))
+            write_varint(fout, length)
+
+        pending = ""
+        for chunk in iter_text_chunks(fin):
+            pending += chunk
+            while len(pending) >= BLOCK_CHARS:
+                _write_block(fout, pending[:BLOCK_CHARS], table)
+                pending = pending[BLOCK_CHARS:]
+        if pending:
+            _write_block(fout, pending, table)
+        write_varint(fout, 0)
+
+
+def _write_block(f, text, table):
+    data, nbits = bitcodec.encode(text, table)
+    write_varint(f, len(text))
+    write_varint(f, nbits)
+    f.write(data)
+
+
+def read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Файл не є стиснутим файлом цього формату")
+    method = f.read(1)[0]
+    symbols, lengths = [], []
+    for _ in range(read_varint(f)):
+        symbols.append(chr(read_varint(f)))
+        lengths.append(read_varint(f))
+    return method, canonical_codes(symbols, lengths)
+
+
+def iter_blocks(f):
+    """Повертає (кількість символів, кількість бітів, дані) для кожного блоку."""
+    while True:
+        count = read_varint(f)
+        if count == 0:
+            return
+        nbits = read_varint(f)
+        yield count, nbits, f.read((nbits + 7) // 8)
+
+
+_table = None
+
+
+def _init_worker(table):
+    global _table
+    _table = table
+
+
+def _decode_block(block):
+    count, nbits, data = block
+    text = "".join(bitcodec.decode(data, _table, nbits))
+    if len(text) != count:
+        raise ValueError("Пошкоджений блок: кількість символів не збігається")
+    return text
+
+
+def decompress(src, dst, workers=None):
+    """Розпаковує файл; блоки декодуються паралельно, записуються по порядку."""
+    workers = workers or os.cpu_count() or 1
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        _, table = read_header(fin)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(table,)) as pool:
+            # Обмежуємо кількість блоків у роботі, щоб пам'ять не росла з розміром файлу
+            in_flight = deque()
+            for block in iter_blocks(fin):
+                in_flight.append(pool.submit(_decode_block, block))
+                if len(in_flight) >= 2 * workers:
+                    fout.write(in_flight.popleft().result().encode("utf-8"))
+            while in_flight:
+                fout.write(in_flight.popleft().result().encode("utf-8"))
+
+
+def stats(src, method=0):
+    """Порівнює розмір стисненого коду з ентропією H з practice1."""
+    counter, n = count_file(src)
+    _, H, _ = symbol_stats(counter, n)
+    symbols, lengths = build_table(counter, method)
+    nbits = sum(counter[sym] * length for sym, length in zip(symbols, lengths))
+    size = os.path.getsize(src)
+    print(f"Символів: {n}, алфавіт: {len(symbols)}, розмір файлу: {size} байт")
+    print(f"Ентропія H: {H:.4f} біт/символ")
+    print(f"Середня довжина коду: {nbits / max(n, 1):.4f} біт/символ "
+          f"(надлишковість {nbits / max(n, 1) - H:.4f})")
+    print(f"Стиснені дані: {(nbits + 7) // 8} байт, коефіцієнт стиснення {size / max(1, (nbits + 7) // 8):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стиснення тексту кодом Шеннона-Фано")
+    parser.add_argument("command", choices=["c", "d", "stats"])
+    parser.add_argument("src")
+    parser.add_argument("dst", nargs="?")
+    parser.add_argument("--huffman", action="store_true", help="канонічний код Хаффмана замість Шеннона-Фано")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів для розпакування")
+    args = parser.parse_args()
+    method = 1 if args.huffman else 0
+
+    if args.command == "stats":
+        stats(args.src, method)
+        return
+    if not args.dst:
+        parser.error("потрібно вказати вихідний файл")
+
+    start = time.perf_counter()
+    if args.command == "c":
+        compress(args.src, args.dst, method)
+    else:
+        decompress(args.src, args.dst, args.workers)
+    elapsed = time.perf_counter() - start
+    src_size, dst_size = os.path.getsize(args.src), os.path.getsize(args.dst)
+    print(f"{args.src} ({src_size} байт) -> {args.dst} ({dst_size} байт) за {elapsed:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Характеристики джерела повідомлень на сітках параметрів (NumPy): ентропія H,
+недовантаженість R = 1 - H / log2(N), середня тривалість символа S_t = sum(p_i * t_i)
+і швидкість передавання V = H / S_t - одразу для багатьох розмірів алфавіту N,
+родин розподілів і векторів тривалостей символів (задачі 1-3 з 1.py).
+
+Конфігурація - (N, родина з параметром, вектор тривалостей). Для родини ймовірності перших
+N - 1 символів не залежать від N (з точністю до нормування), тому H і S_t для всієї сітки
+розмірів - накопичені суми вздовж номера символа: один прохід на рядок параметрів замість
+окремого розрахунку для кожного N. Результати видаються блоками колонок і записуються
+потоково у колонковий формат (окремий бінарний файл на колонку, за замовчуванням) або у CSV.
+CSV - повільний шлях для перегляду людиною: текстове форматування займає близько 0.5 мкс
+на число, і 4 млн конфігурацій пишуться в CSV у кілька разів довше, ніж колонками.
+
+Запуск:
+    python sweep.py                                               - задачі 1-3 з 1.py
+    python sweep.py --sizes 2:5001 --q 0.001:1:0.001 -o sweep_cols
+    python sweep.py --sizes 2:2001 --q 0.01:1:0.01 --s 0.5:2:0.1 --format csv -o sweep.csv
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+
+# Максимальна кількість елементів проміжної матриці (параметри x вектори тривалостей x N)
+CHUNK_ELEMENTS = 1 << 22
+
+
+def _xlog2x(x):
+    """x * log2(x) поелементно, з 0 * log 0 = 0."""
+    return x * np.log2(x, out=np.zeros_like(x), where=x > 0)
+
+
+def _prefix(values):
+    """Накопичені суми вздовж останньої осі з нулем на початку: [..., N] - сума перших N."""
+    out = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+    np.cumsum(values, axis=-1, out=out[..., 1:])
+    return out
+
+
+def uniform(params, sizes, t):
+    """Рівноймовірні символи: p_i = 1/N (параметра немає)."""
+    H = np.log2(sizes)[None, :]
+    S_t = (_prefix(t)[:, sizes] / sizes).T[None]
+    return H, S_t
+
+
+def geometric(q, sizes, t):
+    """
+    p_i = (1 - q) * q^(i-1) для i < N, останній символ отримує залишок q^(N-1).
+    При q = 0.5 це розподіл p(i) = (1/2)^i з 1.py (останній += (1/2)^N).
+    """
+    q = q[:, None]
+    a = (1 - q) * q ** np.arange(t.shape[1])
+    tail = q ** (sizes - 1)
+    H = -_prefix(_xlog2x(a))[:, sizes - 1] - _xlog2x(tail)
+    S_t = _prefix(a[:, None, :] * t[None])[:, :, sizes - 1] + tail[:, None, :] * t[:, sizes - 1][None]
+    return H, S_t.transpose(0, 2, 1)
+
+
+def zipf(s, sizes, t):
+    """
+    Закон Ціпфа: p_i = i^(-s) / Z_N, Z_N = sum(i^(-s), i <= N);
+    H = log2(Z_N) + s / Z_N * sum(i^(-s) * log2(i), i <= N).
+    """
+    s = s[:, None]
+    i = np.arange(1, t.shape[1] + 1, dtype=np.float64)
+    w = i ** -s
+    Z = _prefix(w)[:, sizes]
+    H = np.log2(Z) + s * _prefix(w * np.log2(i))[:, sizes] / Z
+    S_t = _prefix(w[:, None, :] * t[None])[:, :, sizes] / Z[:, None, :]
+    return H, S_t.transpose(0, 2, 1)
+
+
+# Родини розподілів: назва -> функція (параметри (P,), розміри N (L,), тривалості (D x M))
+# -> H (P x L) і S_t (P x L x D). Усі величини для всіх N - накопичені суми за номером символа.
+FAMILIES = {"uniform": uniform, "geometric": geometric, "zipf": zipf}
+
+
+def linear_durations(i):
+    """t_i = i, як у задачі 3 з 1.py."""
+    return i.astype(np.float64)
+
+
+def constant_durations(i):
+    return np.ones(len(i))
+
+
+# Вектори тривалостей: назва -> функція номерів символів 1..M -> вектор (M,) або матриця (k x M).
+# Тривалість символа не залежить від N: для алфавіту з N символів беруться перші N значень.
+DURATIONS = {"linear": linear_durations, "constant": constant_durations}
+
+# Колонки результату та їх типи
+COLUMNS = (("n", "<i8"), ("family", "<u2"), ("param", "<f8"), ("durations", "<u2"), ("t_row", "<i4"),
+           ("H", "<f8"), ("R", "<f8"), ("S_t", "<f8"), ("V", "<f8"))
+# Формат кожної колонки у CSV (family і durations записуються назвами)
+CSV_FORMATS = ("%d", "%s", "%.6g", "%s", "%d", "%.10g", "%.10g", "%.10g", "%.10g")
+
+
+def entropy(p):
+    """Ентропія кожного рядка матриці ймовірностей, біт/символ (0 * log 0 = 0)."""
+    return -_xlog2x(np.atleast_2d(np.asarray(p, dtype=np.float64))).sum(axis=1)
+
+
+def source_stats(p, t):
+    """
+    Характеристики джерела для явно заданих ймовірностей p (F x N) і тривалостей t (D x N).
+    Повертає H (F,), R (F,), S_t (F x D), V (F x D).
+    """
+    p = np.atleast_2d(np.asarray(p, dtype=np.float64))
+    t = np.atleast_2d(np.asarray(t, dtype=np.float64))
+    H = entropy(p)
+    S_t = p @ t.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = 1 - H / np.log2(p.shape[1]) if p.shape[1] > 1 else np.zeros_like(H)
+        V = H[:, None] / S_t
+    return H, R, S_t, V
+
+
+def sweep(sizes, families=None, durations=None):
+    """
+    Обчислює характеристики для всіх комбінацій розмірів алфавіту sizes, родин розподілів
+    families ({назва: параметри або None}) і векторів тривалостей durations ({назва: функція}).
+    Повертає блоки результатів - словники колонок COLUMNS; family і durations -
+    номери у списках list(families) та list(durations).
+    """
+    families = families if families is not None else {"uniform": None, "geometric": [0.5]}
+    durations = durations if durations is not None else {"linear": linear_durations}
+    for name in families:
+        if name not in FAMILIES:
+            raise ValueError(f"Невідома родина розподілів: {name}")
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if len(sizes) == 0:
+        return
+    if sizes.min() < 1:
+        raise ValueError("Розмір алфавіту повинен бути >= 1")
+
+    i = np.arange(1, sizes.max() + 1)
+    tables = [np.atleast_2d(np.asarray(func(i), dtype=np.float64)) for func in durations.values()]
+    t = np.concatenate(tables)
+    dur = np.concatenate([np.full(len(table), code, dtype=np.uint16) for code, table in enumerate(tables)])
+    t_row = np.concatenate([np.arange(len(table), dtype=np.int32) for table in tables])
+    log_n = np.log2(sizes)
+    L, D = len(sizes), len(t)
+
+    for code, (name, values) in enumerate(families.items()):
+        values = np.atleast_1d(np.asarray(values if values is not None else np.nan, dtype=np.float64))
+        step = max(1, CHUNK_ELEMENTS // (D * t.shape[1]))
+        for start in range(0, len(values), step):
+            params = values[start:start + step]
+            H, S_t = FAMILIES[name](params, sizes, t)
+            P = len(H)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                R = np.where(sizes > 1, 1 - H / log_n, 0.0)
+                V = H[:, :, None] / S_t
+            yield {
+                "n": np.tile(np.repeat(sizes, D), P),
+                "family": np.full(P * L * D, code, dtype=np.uint16),
+                "param": np.repeat(params, L * D),
+                "durations": np.tile(dur, P * L),
+                "t_row": np.tile(t_row, P * L),
+                "H": np.repeat(H.ravel(), D),
+                "R": np.repeat(R.ravel(), D),
+                "S_t": S_t.ravel(),
+                "V": V.ravel(),
+            }
+
+
+def _format_column(values, fmt):
+    """
+    Текст fmt % v для кожного значення колонки. Форматується лише кожне окреме значення:
+    для цілих - кожне різне (np.unique), для дійсних - перше в кожній серії однакових
+    поспіль (param, H і R у блоках sweep() повторюються), далі текст розставляється індексами.
+    """
+    if len(values) == 0:
+        return []
+    if values.dtype.kind != "f":
+        unique, inverse = np.unique(values, return_inverse=True)
+        return np.array([fmt % v for v in unique.tolist()], dtype=object)[inverse].tolist()
+    # Порівняння бітів: nan збігається з собою, а -0.0 відрізняється від 0.0 ("-0")
+    bits = values.view(np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], bits[1:] != bits[:-1])))
+    text = [fmt % v for v in values[starts].tolist()]
+    if len(starts) == len(values):
+        return text
+    return np.repeat(np.array(text, dtype=object), np.diff(starts, append=len(values))).tolist()
+
+
+class SweepWriter:
+    """
+    Потоковий запис блоків sweep():
+    "columns" - тека з файлом <колонка>.bin (сирі значення) на кожну колонку та meta.json,
+    читається без копіювання через read_columns();
+    "csv" - текстова таблиця з назвами родин і векторів тривалостей (повільніше: кожне
+    число форматується як текст; блок записується одним рядком після форматування колонок).
+    """
+
+    def __init__(self, path, fmt="columns", families=(), durations=()):
+        if fmt not in ("csv", "columns"):
+            raise ValueError(f"Невідомий формат: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.families = list(families)
+        self.durations = list(durations)
+        self.rows = 0
+        if fmt == "csv":
+            self._file = open(path, "w", encoding="utf-8", newline="")
+            self._file.write(",".join(name for name, _ in COLUMNS) + "\n")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name, _ in COLUMNS}
+
+    def write(self, block):
+        if self.fmt == "csv":
+            columns = []
+            for (name, _), fmt in zip(COLUMNS, CSV_FORMATS):
+                if name == "family":
+                    columns.append(np.asarray(self.families, dtype=object)[block[name]].tolist())
+                elif name == "durations":
+                    columns.append(np.asarray(self.durations, dtype=object)[block[name]].tolist())
+                else:
+                    columns.append(_format_column(np.asarray(block[name]), fmt))
+            if columns[0]:
+                self._file.write("\n".join(map(",".join, zip(*columns))) + "\n")
+        else:
+            for name, dtype in COLUMNS:
+                self._files[name].write(np.ascontiguousarray(block[name], dtype=dtype).tobytes())
+        self.rows += len(block["n"])
+
+    def close(self):
+        if self.fmt == "csv":
+            self._file.close()
+            return
+        for f in self._files.values():
+            f.close()
+        meta = {"rows": self.rows, "columns": [list(column) for column in COLUMNS],
+                "families": self.families, "durations": self.durations}
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def read_columns(path):
+    """Колонки, записані у форматі "columns": (словник name -> np.memmap, meta)."""
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    columns = {}
+    for name, dtype in meta["columns"]:
+        file = os.path.join(path, f"{name}.bin")
+        if meta["rows"]:
+            columns[name] = np.memmap(file, dtype=dtype, mode="r", shape=(meta["rows"],))
+        else:
+            columns[name] = np.empty(0, dtype=dtype)
+    return columns, meta
+
+
+def run_sweep(path, sizes, families=None, durations=None, fmt="columns"):
+    """Обчислює sweep() і записує результати у файл; повертає кількість конфігурацій."""
+    families = families if families is not None else {"uniform": None, "geometric": [0.5]}
+    durations = durations if durations is not None else {"linear": linear_durations}
+    with SweepWriter(path, fmt, families, durations) as writer:
+        for block in sweep(sizes, families, durations):
+            writer.write(block)
+    return writer.rows
+
+
+def _grid(text, dtype=float):
+    """Значення через кому; кожне - число або діапазон start:stop[:step] (stop не входить)."""
+    values = []
+    for part in text.split(","):
+        if ":" in part:
+            bounds = [dtype(x) for x in part.split(":")]
+            values.extend(np.arange(*bounds).tolist())
+        else:
+            values.append(dtype(part))
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ентропія, недовантаженість і швидкість передавання на сітці параметрів")
+    parser.add_argument("--sizes", default="22,12", help="розміри алфавіту, напр. 2:1001 або 12,22")
+    parser.add_argument("--q", default="0.5", help="параметри геометричного розподілу ('' - без нього)")
+    parser.add_argument("--s", default="", help="параметри розподілу Ціпфа ('' - без нього)")
+    parser.add_argument("--no-uniform", action="store_true", help="без рівномірного розподілу")
+    parser.add_argument("--durations", default="linear", help=f"вектори тривалостей: {', '.join(DURATIONS)}")
+    parser.add_argument("--format", choices=("columns", "csv"), default="columns",
+                        help="columns - бінарні колонки (швидко), csv - текстова таблиця (повільно)")
+    parser.add_argument("-o", "--output", help="тека колонок або файл CSV (без нього - друк у консоль)")
+    args = parser.parse_args()
+
+    sizes = _grid(args.sizes, int)
+    families = {}
+    if not args.no_uniform:
+        families["uniform"] = None
+    if args.q:
+        families["geometric"] = _grid(args.q)
+    if args.s:
+        families["zipf"] = _grid(args.s)
+    durations = {}
+    for name in args.durations.split(","):
+        if name not in DURATIONS:
+            parser.error(f"невідомий вектор тривалостей '{name}'")
+        durations[name] = DURATIONS[name]
+
+    if not args.output:
+        names, dur_names = list(families), list(durations)
+        print(f"{'N':>6} | {'розподіл':<16} | {'t':<8} | {'H':>10} | {'R':>10} | {'S_t':>10} | {'V':>10}")
+        for block in sweep(sizes, families, durations):
+            for i in range(len(block["n"])):
+                family = names[block["family"][i]]
+                if not np.isnan(block["param"][i]):
+                    family += f"({block['param'][i]:g})"
+                print(f"{block['n'][i]:6} | {family:<16} | {dur_names[block['durations'][i]]:<8} | "
+                      f"{block['H'][i]:10.6f} | {block['R'][i]:10.6f} | {block['S_t'][i]:10.6f} | {block['V'][i]:10.6f}")
+        return
+
+    start = time.perf_counter()
+    rows = run_sweep(args.output, sizes, families, durations, args.format)
+    elapsed = time.perf_counter() - start
+    print(f"Конфігурацій: {rows:,}, час: {elapsed:.2f} с ({rows / max(elapsed, 1e-9):,.0f} конфігурацій/с)")
+    print(f"Результати записано: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
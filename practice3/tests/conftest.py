@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Тести імпортують модулі practice3 так само, як скрипти, запущені з цієї теки
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,37 @@
+"""Двійковий кодек префіксних кодів."""
+import random
+
+import pytest
+
+import bitcodec
+from codes import huffman, shannon_fano
+
+
+@pytest.mark.parametrize("build", [shannon_fano, huffman])
+def test_round_trip(build):
+    symbols = [f"a{i}" for i in range(1, 13)]
+    probs = [0.5 ** i for i in range(1, 13)]
+    probs[-1] += 0.5 ** 12
+    table = build(symbols, probs)
+    message = random.Random(1).choices(symbols, weights=probs, k=5000)
+    data, nbits = bitcodec.encode(message, table)
+    assert nbits == sum(len(table[sym]) for sym in message)
+    assert bitcodec.decode(data, table, nbits) == message
+
+
+def test_one_symbol_alphabet():
+    table = shannon_fano(["x"], [1.0])
+    assert table == {"x": ""}
+    data, nbits = bitcodec.encode("xxxx", table)
+    assert nbits == 4
+    assert bitcodec.decode(data, table, nbits) == list("xxxx")
+
+
+def test_empty_code_rejected():
+    with pytest.raises(ValueError):
+        bitcodec.encode("ab", {"a": "", "b": "1"})
+
+
+def test_empty_message():
+    assert bitcodec.encode("", {"x": "0", "y": "1"}) == (b"", 0)
+    assert bitcodec.decode(b"", {"x": "0", "y": "1"}, 0) == []
@@ -0,0 +1,70 @@
+"""shannon_fano через префіксні суми дає ті самі коди, що й початкова рекурсивна реалізація."""
+import random
+
+import pytest
+
+from codes import average_length, huffman, shannon_fano
+
+
+def shannon_fano_original(symbols, probabilities):
+    """Початкова реалізація з practice3/1.py (зрізи та повторне підсумовування на кожному рівні)."""
+    codes = {sym: "" for sym in symbols}
+
+    def recursive_build(symbols, probs):
+        if len(symbols) == 1:
+            return
+        total = sum(probs)
+        acc = 0
+        split_index = 0
+        for i, p in enumerate(probs):
+            acc += p
+            if acc >= total / 2:
+                split_index = i
+                break
+        left = symbols[:split_index+1]
+        right = symbols[split_index+1:]
+        for sym in left:
+            codes[sym] += "0"
+        for sym in right:
+            codes[sym] += "1"
+        recursive_build(left, probs[:split_index+1])
+        recursive_build(right, probs[split_index+1:])
+
+    recursive_build(symbols, probabilities)
+    return codes
+
+
+def tied_weights(rng):
+    """Цілі частоти з багатьма рівними значеннями (за спаданням)."""
+    n = rng.randint(2, 60)
+    return sorted((rng.randint(1, rng.choice([3, 10, 100])) for _ in range(n)), reverse=True)
+
+
+@pytest.mark.parametrize("as_probabilities", [False, True])
+def test_matches_original_on_ties(as_probabilities):
+    rng = random.Random(0)
+    for _ in range(1000):
+        weights = tied_weights(rng)
+        if as_probabilities:
+            total = sum(weights)
+            weights = [w / total for w in weights]
+        symbols = list(range(len(weights)))
+        assert shannon_fano(symbols, weights) == shannon_fano_original(symbols, weights)
+
+
+@pytest.mark.parametrize("n", [12, 22])
+def test_matches_original_geometric(n):
+    symbols = [f"a{i}" for i in range(1, n + 1)]
+    probs = [0.5 ** i for i in range(1, n + 1)]
+    probs[-1] += 0.5 ** n
+    assert shannon_fano(symbols, probs) == shannon_fano_original(symbols, probs)
+
+
+def test_matches_original_zipf():
+    weights = [1 / (i + 1) for i in range(5000)]
+    total = sum(weights)
+    probs = [w / total for w in weights]
+    symbols = list(range(len(probs)))
+    codes = shannon_fano(symbols, probs)
+    assert codes == shannon_fano_original(symbols, probs)
+    assert average_length(huffman(symbols, probs), symbols, probs) <= average_length(codes, symbols, probs)
@@ -0,0 +1,56 @@
+"""Стиснення і розпакування файлів: тотожність після розпакування та довжина коду проти ентропії."""
+import pytest
+
+import compress
+from Middleware.streaming import count_file, symbol_stats
+
+TEXTS = {
+    "empty": "",
+    "one_symbol": "a" * 1000,
+    "multibyte": "Привіт, світ! Grüße 😀 你好 ґ\n" * 50,
+    "crlf": "рядок один\r\nрядок два\r\n\r\nкінець без переводу",
+    "mixed_newlines": "a\nb\r\nc\rd\n" * 100,
+}
+METHODS = {"shannon_fano": 0, "huffman": 1}
+
+
+def round_trip(tmp_path, text, method, workers=1):
+    src, packed, out = tmp_path / "src.txt", tmp_path / "src.sfc", tmp_path / "out.txt"
+    src.write_bytes(text.encode("utf-8"))
+    compress.compress(str(src), str(packed), method)
+    compress.decompress(str(packed), str(out), workers)
+    assert out.read_bytes() == src.read_bytes()
+    return src, packed
+
+
+@pytest.mark.parametrize("method", METHODS.values(), ids=METHODS.keys())
+@pytest.mark.parametrize("name", TEXTS)
+def test_round_trip(tmp_path, name, method):
+    round_trip(tmp_path, TEXTS[name], method)
+
+
+@pytest.mark.parametrize("method", METHODS.values(), ids=METHODS.keys())
+def test_several_blocks_parallel(tmp_path, monkeypatch, method):
+    monkeypatch.setattr(compress, "BLOCK_CHARS", 97)
+    text = "".join(TEXTS.values()) * 3
+    _, packed = round_trip(tmp_path, text, method, workers=3)
+    with open(packed, "rb") as f:
+        compress.read_header(f)
+        counts = [count for count, _, _ in compress.iter_blocks(f)]
+    assert len(counts) == -(-len(text) // 97)
+    assert sum(counts) == len(text)
+
+
+@pytest.mark.parametrize("method", METHODS.values(), ids=METHODS.keys())
+@pytest.mark.parametrize("name", ["multibyte", "crlf", "mixed_newlines"])
+def test_code_length_not_below_entropy(tmp_path, name, method):
+    src, packed = round_trip(tmp_path, TEXTS[name], method)
+    counter, n = count_file(str(src))
+    _, H, _ = symbol_stats(counter, n)
+    with open(packed, "rb") as f:
+        compress.read_header(f)
+        nbits = sum(bits for _, bits, _ in compress.iter_blocks(f))
+    # Префіксний код не коротший за ентропію; Хаффман - не довший за H + 1
+    assert nbits / n >= H - 1e-9
+    if method == METHODS["huffman"]:
+        assert nbits / n < H + 1
@@ -0,0 +1,49 @@
+"""SweepWriter: CSV збігається з початковим записом через np.savetxt, колонки читаються назад без втрат."""
+import io
+
+import numpy as np
+
+from sweep import COLUMNS, DURATIONS, SweepWriter, read_columns, run_sweep, sweep
+
+FAMILIES = {"uniform": None, "geometric": [0.0, 0.25, 0.5, 1.0], "zipf": [0.5, 1.0, 2.0]}
+SIZES = list(range(1, 40)) + [100]
+
+
+def savetxt_csv(families, durations):
+    """Початковий запис CSV: таблиця об'єктів і np.savetxt."""
+    out = io.StringIO()
+    out.write(",".join(name for name, _ in COLUMNS) + "\n")
+    for block in sweep(SIZES, families, durations):
+        table = np.empty((len(block["n"]), len(COLUMNS)), dtype=object)
+        for j, (name, _) in enumerate(COLUMNS):
+            table[:, j] = block[name]
+        table[:, 1] = np.asarray(list(families), dtype=object)[block["family"]]
+        table[:, 3] = np.asarray(list(durations), dtype=object)[block["durations"]]
+        np.savetxt(out, table, fmt="%d,%s,%.6g,%s,%d,%.10g,%.10g,%.10g,%.10g")
+    return out.getvalue()
+
+
+def test_csv_matches_savetxt(tmp_path):
+    path = tmp_path / "sweep.csv"
+    rows = run_sweep(str(path), SIZES, FAMILIES, DURATIONS, fmt="csv")
+    text = path.read_text(encoding="utf-8")
+    assert text == savetxt_csv(FAMILIES, DURATIONS)
+    assert rows == text.count("\n") - 1
+
+
+def test_columns_default_round_trip(tmp_path):
+    path = tmp_path / "cols"
+    rows = run_sweep(str(path), SIZES, FAMILIES, DURATIONS)
+    columns, meta = read_columns(str(path))
+    assert meta["rows"] == rows and meta["families"] == list(FAMILIES)
+    blocks = list(sweep(SIZES, FAMILIES, DURATIONS))
+    for name, dtype in COLUMNS:
+        expected = np.concatenate([block[name] for block in blocks]).astype(dtype)
+        assert np.array_equal(columns[name], expected, equal_nan=True), name
+
+
+def test_empty_block(tmp_path):
+    path = tmp_path / "empty.csv"
+    with SweepWriter(str(path), "csv", ["uniform"], ["linear"]) as writer:
+        writer.write({name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS})
+    assert path.read_text(encoding="utf-8") == ",".join(name for name, _ in COLUMNS) + "\n"